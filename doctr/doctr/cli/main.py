@@ -1,19 +1,128 @@
 import typer
 import asyncio
+import contextlib
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import asdict
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 
-from ..core.diff_parser import DiffParser
+try:
+    import uvloop
+except ImportError:  # optional speedup, not available on Windows
+    uvloop = None
+
+from ..core.diff_parser import DiffParser, run_git
 from ..core.generator import DocumentationGenerator
 from ..core.writer import DocumentationWriter
-from ..core.doc_model import GeneratedDoc
-from ..core.ai_wiki_generator import AIWikiGenerator
-from ..integrations.llm import LLMDocumentationGenerator
-from ..utils.config import load_config, create_default_config, get_api_key
+from ..core.doc_model import CodeChange, DocumentationDraft, GeneratedDoc
+from ..core.llm_cache import (
+    SemanticIndex,
+    create_cache,
+    embed_text,
+    fingerprint_tree,
+    get_or_compute,
+    make_key,
+)
+from ..utils.config import OPENAI_MODEL_PREFIXES, load_config, create_default_config, get_api_key
 
 app = typer.Typer(help="Doctr - Automatic Documentation Generation")
 
 
+def _run(coro):
+    """Run a coroutine to completion, on uvloop when it is installed."""
+    loop_factory = uvloop.new_event_loop if uvloop and sys.platform != "win32" else None
+    with asyncio.Runner(debug=False, loop_factory=loop_factory) as runner:
+        return runner.run(coro)
+
+
+_DEFAULT_DIFF_TARGET = "HEAD~1"
+
+# Records the inputs of the last successful setup run inside the wiki
+_FINGERPRINT_FILE = ".doctr-fingerprint"
+
+# Above this many files, writes are split across a few worker threads
+_WRITE_CHUNK_THRESHOLD = 32
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _draft_vector(draft: DocumentationDraft) -> List[float]:
+    """Embed a draft's changes for the semantic cache.
+
+    embed_text works on word tokens and drops +/- markers, so each file path
+    and each removed or added word becomes its own tagged token. A change
+    and its revert, or the same edit to another file, then look different.
+    """
+    tokens = []
+    for change in draft.changes:
+        tokens.append("file_" + "_".join(_WORD_RE.findall(change.file_path)))
+        tokens.extend("del_" + word for word in _WORD_RE.findall(change.old_content or ""))
+        tokens.extend("add_" + word for word in _WORD_RE.findall(change.new_content or ""))
+    return embed_text(" ".join(tokens))
+
+
+def _make_directories(directories: Iterable[Path]) -> None:
+    """Create each directory (and its parents) if missing."""
+    for directory in directories:
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+def _dump_all_pages(
+    files: List[Tuple[Path, str]], directories: Iterable[Path] = ()
+) -> None:
+    """Create directories, then write (path, content) pairs synchronously."""
+    _make_directories(directories)
+    for path, content in files:
+        path.write_bytes(content.encode("utf-8"))
+
+
+@contextlib.contextmanager
+def _cli_errors():
+    """Report unexpected errors as a one-line message and exit with status 1.
+
+    Typer exits and usage errors propagate untouched, as do
+    KeyboardInterrupt and asyncio.CancelledError, so shutdown stays clean.
+    """
+    try:
+        yield
+    except (typer.Exit, typer.Abort, typer.BadParameter):
+        raise
+    except Exception as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+
+
+def _git_head(repo_path: Path) -> Optional[str]:
+    """Return the HEAD commit of the repository, or None outside Git."""
+    try:
+        return run_git(repo_path, "rev-parse", "HEAD").strip()
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+
+def _read_fingerprint(path: Path) -> Optional[str]:
+    """Read the fingerprint stored by the last successful wiki run."""
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+
+
+def _parse_diff(repo_path: Path, diff_target: str) -> List[CodeChange]:
+    """Parse the Git diff for a repository."""
+    return DiffParser(repo_path).parse_diff(diff_target)
+
+
+def _collect_changes(repo_path: Path, diff_target: str) -> List[CodeChange]:
+    """Parse the Git diff for a repository, raising on failure."""
+    return DiffParser(repo_path).collect_changes(diff_target)
+
+
 async def _generate_docs(
     repo_path: Optional[Path],
     output_dir: Optional[Path],
@@ -25,8 +134,23 @@ async def _generate_docs(
     if repo_path is None:
         repo_path = Path.cwd()
 
+    # Parse the diff while the configuration loads. Without a --diff target
+    # the default is parsed speculatively and silently: its result (or error)
+    # is only used if the config does not point elsewhere.
+    speculative = diff_target is None
+    diff_task = asyncio.ensure_future(
+        asyncio.to_thread(_collect_changes, repo_path, _DEFAULT_DIFF_TARGET)
+        if speculative
+        else asyncio.to_thread(_parse_diff, repo_path, diff_target)
+    )
+
     # Load configuration
-    config = load_config(repo_path)
+    try:
+        with _cli_errors():
+            config = await asyncio.to_thread(load_config, repo_path)
+    except BaseException:
+        diff_task.cancel()
+        raise
 
     # Apply CLI overrides
     if output_dir is None:
@@ -45,10 +169,26 @@ async def _generate_docs(
     if use_ai:
         typer.echo(f"Model: {model}")
 
-    try:
+    # Resolve the API key in the background while the diff is processed
+    api_key_task = (
+        asyncio.ensure_future(asyncio.to_thread(get_api_key, config, model))
+        if use_ai
+        else None
+    )
+
+    with _cli_errors():
         # Parse Git diff
-        parser = DiffParser(repo_path)
-        changes = parser.parse_diff(diff_target)
+        if not speculative:
+            changes = await diff_task
+        elif diff_target != _DEFAULT_DIFF_TARGET:
+            diff_task.cancel()
+            changes = await asyncio.to_thread(_parse_diff, repo_path, diff_target)
+        else:
+            try:
+                changes = await diff_task
+            except Exception:
+                # Parse again the reporting way for the usual error output
+                changes = await asyncio.to_thread(_parse_diff, repo_path, diff_target)
 
         if not changes:
             typer.echo("No changes detected.")
@@ -62,16 +202,16 @@ async def _generate_docs(
 
         if use_ai:
             # Check for API key
-            api_key = get_api_key(config, model)
+            api_key = await api_key_task
             if not api_key:
-                if model.startswith("claude"):
+                if model.startswith(OPENAI_MODEL_PREFIXES):
                     typer.echo(
-                        f"Warning: No API key found for model {model}. Set ANTHROPIC_API_KEY environment variable or configure in .doctr.toml",
+                        f"Warning: No API key found for model {model}. Set OPENAI_API_KEY environment variable or configure in .doctr.toml",
                         err=True,
                     )
                 else:
                     typer.echo(
-                        f"Warning: No API key found for model {model}. Set OPENAI_API_KEY environment variable or configure in .doctr.toml",
+                        f"Warning: No API key found for model {model}. Set ANTHROPIC_API_KEY environment variable or configure in .doctr.toml",
                         err=True,
                     )
                 typer.echo("Falling back to basic documentation generation...")
@@ -79,18 +219,56 @@ async def _generate_docs(
 
         if use_ai:
             # Use AI to enhance the documentation
-            typer.echo("Analyzing changes with AI...")
-            llm_generator = LLMDocumentationGenerator(model_name=model, api_key=api_key)
-            doc = await llm_generator.enhance_draft(draft)
+            from ..integrations.llm import LLMDocumentationGenerator
+
+            cache = create_cache(config.cache_backend, repo_path)
+            cache_key = make_key({"command": "generate", "model": model, "draft": asdict(draft)})
+
+            semantic_index = SemanticIndex(cache, f"generate:{model}") if cache else None
+            draft_vector = _draft_vector(draft)
+
+            async def enhance():
+                # A similar draft's doc only seeds a short patch prompt; it is
+                # never reused as-is, since it describes different changes
+                similar_doc, similarity = None, 0.0
+                if semantic_index is not None:
+                    similar_key, similarity = semantic_index.lookup(draft_vector)
+                    if similar_key and similarity >= config.semantic_patch_threshold:
+                        cached = cache.get(similar_key)
+                        similar_doc = GeneratedDoc(**cached) if cached else None
+
+                llm_generator = LLMDocumentationGenerator(model_name=model, api_key=api_key)
+                if similar_doc:
+                    typer.echo(f"Updating AI documentation from a similar draft ({similarity:.2f} similarity)...")
+                    doc = await llm_generator.patch_documentation(similar_doc, draft)
+                else:
+                    typer.echo("Analyzing changes with AI...")
+                    doc = await llm_generator.enhance_draft(draft)
+
+                if semantic_index is not None:
+                    semantic_index.add(cache_key, draft_vector)
+                return doc
+
+            doc, cache_hit = await get_or_compute(
+                cache,
+                cache_key,
+                enhance,
+                dump=asdict,
+                load=lambda data: GeneratedDoc(**data),
+                expire=config.cache_ttl,
+            )
+            if cache_hit:
+                typer.echo("Using cached AI documentation for unchanged draft.")
         else:
             # Create basic documentation without AI
-            content = f"{draft.summary}\n\n"
-            content += "## Changes\n\n"
+            parts = [draft.summary, "\n\n## Changes\n\n"]
 
             for change in draft.changes:
-                content += f"- **{change.file_path}**: {change.change_type.value}\n"
+                parts.append(f"- **{change.file_path}**: {change.change_type.value}\n")
                 if change.new_content:
-                    content += f"  ```\n  {change.new_content[:200]}...\n  ```\n"
+                    parts.append(f"  ```\n  {change.new_content[:200]}...\n  ```\n")
+
+            content = "".join(parts)
 
             doc = GeneratedDoc(
                 title=draft.title, content=content, metadata=draft.metadata
@@ -101,23 +279,21 @@ async def _generate_docs(
         output_file = writer.write_doc(doc)
         typer.echo(f"Documentation written to: {output_file}")
 
-    except Exception as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
-
 
 async def _setup_wiki(
     repo_path: Optional[Path],
     output_dir: Optional[Path],
     use_ai: Optional[bool],
     model: Optional[str],
+    force: bool = False,
 ):
     """Async implementation of wiki documentation setup."""
     if repo_path is None:
         repo_path = Path.cwd()
 
     # Load configuration
-    config = load_config(repo_path)
+    with _cli_errors():
+        config = load_config(repo_path)
 
     # Apply CLI overrides - AI is now DEFAULT
     if output_dir is None:
@@ -133,7 +309,7 @@ async def _setup_wiki(
     if use_ai:
         typer.echo(f"Model: {model}")
 
-    try:
+    with _cli_errors():
         if not use_ai:
             typer.echo("⚠️  AI disabled. Basic documentation structure will be created.")
             # Fall back to basic structure (you could implement a simple non-AI version)
@@ -142,16 +318,22 @@ async def _setup_wiki(
             )
             raise typer.Exit(1)
 
+        # Fingerprint the source tree while the API key is resolved
+        tree_task = asyncio.ensure_future(
+            asyncio.to_thread(fingerprint_tree, repo_path, [output_dir])
+        )
+
         # Check for API key FIRST before doing any AI operations
-        api_key = get_api_key(config, model)
+        api_key = await asyncio.to_thread(get_api_key, config, model)
         if not api_key:
-            if model.startswith("claude"):
+            tree_task.cancel()
+            if model.startswith(OPENAI_MODEL_PREFIXES):
                 typer.echo(
                     f"❌ No API key found for model {model}.",
                     err=True,
                 )
                 typer.echo(
-                    "   Set ANTHROPIC_API_KEY environment variable or configure in .doctr.toml"
+                    "   Set OPENAI_API_KEY environment variable or configure in .doctr.toml"
                 )
             else:
                 typer.echo(
@@ -159,7 +341,7 @@ async def _setup_wiki(
                     err=True,
                 )
                 typer.echo(
-                    "   Set OPENAI_API_KEY environment variable or configure in .doctr.toml"
+                    "   Set ANTHROPIC_API_KEY environment variable or configure in .doctr.toml"
                 )
             typer.echo(
                 "\n💡 Get your API key and try again for AI-powered documentation."
@@ -167,43 +349,136 @@ async def _setup_wiki(
             raise typer.Exit(1)
 
         # Use AI-first wiki generator
-        typer.echo("🚀 Starting AI-powered documentation generation...")
-        wiki_generator = AIWikiGenerator(model_name=model, api_key=api_key)
-
-        wiki_pages = await wiki_generator.generate_comprehensive_wiki(repo_path)
+        from ..core.ai_wiki_generator import AIWikiGenerator, WikiPage
+        from ..integrations.llm import create_http_client
+
+        cache_key = make_key(
+            {
+                "command": "setup",
+                "model": model,
+                "head": await asyncio.to_thread(_git_head, repo_path),
+                "tree": await tree_task,
+            }
+        )
 
-        # Ensure output directory exists
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # Skip all work when nothing changed since the last successful run
+        fingerprint_path = output_dir / _FINGERPRINT_FILE
+        if not force and _read_fingerprint(fingerprint_path) == cache_key:
+            typer.echo(f"✅ Wiki at {output_dir} is up to date. Use --force to regenerate.")
+            return
 
-        # Write all wiki pages
-        typer.echo(f"\n📝 Writing {len(wiki_pages)} documentation pages...")
-        for page in wiki_pages:
-            page_path = output_dir / page.filename
-            with open(page_path, "w", encoding="utf-8") as f:
-                f.write(page.content)
-            typer.echo(f"  ✅ {page.title} -> {page_path}")
+        cache = create_cache(config.cache_backend, repo_path)
+
+        async def generate_wiki():
+            typer.echo("🚀 Starting AI-powered documentation generation...")
+            # One pooled connection serves every page request
+            async with create_http_client() as http_client:
+                wiki_generator = AIWikiGenerator(
+                    model_name=model,
+                    api_key=api_key,
+                    http_client=http_client,
+                    max_concurrency=config.llm_concurrency,
+                    max_retries=config.llm_max_retries,
+                    cache=cache,
+                    cache_ttl=config.cache_ttl,
+                )
 
-        # Create a navigation index
-        nav_content = "# Documentation Index\n\n"
+                # Write each page as soon as it is generated so disk writes
+                # overlap with the LLM requests still in flight
+                await asyncio.to_thread(_make_directories, [output_dir])
+                indexed_pages = []
+                writes = []
+                try:
+                    async for position, page in wiki_generator.iter_pages(repo_path):
+                        indexed_pages.append((position, page))
+                        page_file = [(output_dir / page.filename, page.content)]
+                        writes.append(
+                            asyncio.ensure_future(
+                                asyncio.to_thread(_dump_all_pages, page_file)
+                            )
+                        )
+                finally:
+                    # Let writes already started finish before leaving, even
+                    # when generation fails part-way through
+                    results = await asyncio.gather(*writes, return_exceptions=True)
+                for result in results:
+                    if isinstance(result, BaseException):
+                        raise result
+
+                # A partial wiki must not be cached or fingerprinted, or later
+                # runs would never regenerate the missing pages
+                if wiki_generator.failed_pages:
+                    for error in wiki_generator.failed_pages:
+                        typer.echo(f"⚠️  Page failed to generate: {error}", err=True)
+                    typer.echo(
+                        f"❌ {len(wiki_generator.failed_pages)} page(s) failed to generate. "
+                        f"Pages that succeeded were written to {output_dir}; "
+                        "run setup again to retry.",
+                        err=True,
+                    )
+                    raise typer.Exit(1)
+
+                indexed_pages.sort(key=lambda item: item[0])
+                return [page for _, page in indexed_pages]
+
+        wiki_pages, cache_hit = await get_or_compute(
+            cache,
+            cache_key,
+            generate_wiki,
+            dump=lambda pages: [asdict(page) for page in pages],
+            load=lambda data: [WikiPage(**page) for page in data],
+            expire=config.cache_ttl,
+        )
+        if cache_hit:
+            typer.echo("♻️  Repository unchanged since last run, reusing cached wiki pages.")
 
-        # Group by category
-        categories = {}
+        # Group pages by category; freshly generated pages are already on
+        # disk, cached ones still need writing
+        files = []
+        categories = defaultdict(list)
         for page in wiki_pages:
-            if page.category not in categories:
-                categories[page.category] = []
+            if cache_hit:
+                files.append((output_dir / page.filename, page.content))
             categories[page.category].append(page)
 
+        # Create a navigation index
+        nav_parts = ["# Documentation Index\n\n"]
         for category, pages in categories.items():
-            nav_content += f"## {category.title()}\n\n"
+            nav_parts.append(f"## {category.title()}\n\n")
             for page in pages:
-                nav_content += f"- [{page.title}]({page.filename})\n"
-            nav_content += "\n"
+                nav_parts.append(f"- [{page.title}]({page.filename})\n")
+            nav_parts.append("\n")
 
         nav_path = output_dir / "_Navigation.md"
-        with open(nav_path, "w", encoding="utf-8") as f:
-            f.write(nav_content)
+        files.append((nav_path, "".join(nav_parts)))
+
+        # Write all wiki pages plus the index in as few thread hops as possible.
+        # NOTE: Do not switch to aiofiles - it pays executor overhead on every
+        # awaited call and benchmarks slower than asyncio.to_thread for
+        # small/medium writes like these.
+        typer.echo(f"\n📝 Writing {len(wiki_pages)} documentation pages...")
+
+        # Each distinct directory is created exactly once before any write
+        directories = {path.parent for path, _ in files}
+
+        if len(files) <= _WRITE_CHUNK_THRESHOLD:
+            await asyncio.to_thread(_dump_all_pages, files, directories)
+        else:
+            workers = min(os.cpu_count() or 1, 4)
+            await asyncio.to_thread(_make_directories, directories)
+            await asyncio.gather(
+                *[
+                    asyncio.to_thread(_dump_all_pages, files[i::workers])
+                    for i in range(workers)
+                ]
+            )
+
+        for page in wiki_pages:
+            typer.echo(f"  ✅ {page.title} -> {output_dir / page.filename}")
         typer.echo(f"  ✅ Navigation Index -> {nav_path}")
 
+        await asyncio.to_thread(fingerprint_path.write_text, cache_key, "utf-8")
+
         typer.echo(f"\n🎉 AI-powered wiki documentation created successfully!")
         typer.echo(f"📁 Documentation available at: {output_dir}")
         typer.echo(
@@ -211,10 +486,6 @@ async def _setup_wiki(
         )
         typer.echo("💡 Review and customize the generated content as needed.")
 
-    except Exception as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1)
-
 
 @app.command()
 def generate(
@@ -231,12 +502,15 @@ def generate(
     model: Optional[str] = typer.Option(None, "--model", "-m", help="LLM model to use"),
 ):
     """Generate documentation from Git changes."""
-    asyncio.run(_generate_docs(repo_path, output_dir, diff_target, use_ai, model))
+    _run(_generate_docs(repo_path, output_dir, diff_target, use_ai, model))
 
 
 @app.command()
 def init(
     repo_path: Optional[Path] = typer.Argument(None, help="Path to repository"),
+    force: bool = typer.Option(
+        False, "--force", "-f", help="Overwrite an existing configuration"
+    ),
 ):
     """Initialize doctr configuration for a repository."""
     if repo_path is None:
@@ -244,8 +518,12 @@ def init(
 
     config_file = repo_path / ".doctr.toml"
 
-    if config_file.exists():
+    if config_file.exists() and not force:
         typer.echo(f"Configuration already exists: {config_file}")
+        # Never block on a prompt when running from scripts or CI
+        if not sys.stdin.isatty():
+            typer.echo("Use --force to overwrite it.")
+            raise typer.Exit(0)
         if not typer.confirm("Overwrite existing configuration?"):
             return
 
@@ -271,6 +549,9 @@ def setup(
         help="Use AI to generate comprehensive documentation (default: enabled)",
     ),
     model: Optional[str] = typer.Option(None, "--model", "-m", help="LLM model to use"),
+    force: bool = typer.Option(
+        False, "--force", "-f", help="Regenerate even if the repository is unchanged"
+    ),
 ):
     """Set up AI-powered comprehensive wiki documentation for your project.
 
@@ -284,7 +565,7 @@ def setup(
 
     AI is enabled by default for the best experience.
     """
-    asyncio.run(_setup_wiki(repo_path, output_dir, use_ai, model))
+    _run(_setup_wiki(repo_path, output_dir, use_ai, model, force))
 
 
 if __name__ == "__main__":
@@ -1,10 +1,18 @@
+import asyncio
+import heapq
+import itertools
+import re
+from collections import Counter
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Awaitable, Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
+import httpx
+from pydantic_ai.exceptions import ModelHTTPError
 
-from .intelligent_analyzer import IntelligentCodebaseAnalyzer, ExplorationPlan, ProjectInsight
+from .intelligent_analyzer import IntelligentCodebaseAnalyzer, ExplorationPlan, ProjectInsight, ProjectFile
 from .doc_model import GeneratedDoc
-from ..integrations.llm import LLMDocumentationGenerator
+from .llm_cache import CacheBackend, get_or_compute, make_key
+from ..integrations.llm import RETRYABLE_STATUS_CODES, LLMDocumentationGenerator, retry_delay
 
 
 @dataclass
@@ -15,60 +23,211 @@ class WikiPage:
     category: str  # 'overview', 'api', 'guide', 'reference'
 
 
+# Page types always generated by dedicated methods
+_RESERVED_DOC_TYPES = frozenset({"home", "installation", "quickstart", "architecture", "api"})
+
+
+def _files_matching(
+    files: Iterable[ProjectFile], needles: Iterable[str], limit: Optional[int] = None
+) -> List[ProjectFile]:
+    """Return files whose path contains any of the needles, in one regex pass.
+    
+    With a limit, scanning stops as soon as that many files have matched.
+    """
+    needles = list(needles)
+    if not needles:
+        return []
+    pattern = re.compile("|".join(map(re.escape, needles)))
+    return list(itertools.islice((f for f in files if pattern.search(f.path_str)), limit))
+
+
 class AIWikiGenerator:
     """AI-first wiki documentation generator that follows an intelligent exploration plan."""
     
-    def __init__(self, model_name: str = "claude-3-5-haiku-20241022", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: str = "claude-3-5-haiku-20241022",
+        api_key: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+        cache: Optional[CacheBackend] = None,
+        cache_ttl: Optional[float] = None,
+    ):
         self.model_name = model_name
         self.api_key = api_key
-        self.llm_generator = LLMDocumentationGenerator(model_name=model_name, api_key=api_key)
+        self.http_client = http_client
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.llm_generator = LLMDocumentationGenerator(
+            model_name=model_name, api_key=api_key, http_client=http_client
+        )
+        # Bounds in-flight LLM requests to stay within provider rate limits
+        self._llm_semaphore = asyncio.Semaphore(max_concurrency)
+        # Identical prompts already in flight, keyed like the response cache,
+        # and how many callers are still waiting on each
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._inflight_waiters: Counter[str] = Counter()
+        # Errors from pages that failed during the last iter_pages run
+        self.failed_pages: List[Exception] = []
+
+    async def _run_prompt(self, prompt: str) -> str:
+        """Run a prompt through the content agent, respecting the concurrency limit.
+        
+        Responses are cached by model and prompt, so pages whose inputs did not
+        change are reused across runs, and identical prompts issued concurrently
+        share a single request.
+        """
+        async def run() -> str:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async with self._llm_semaphore:
+                        return await self._run_streaming(prompt)
+                except ModelHTTPError as e:
+                    if e.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                        raise
+                    # Back off outside the semaphore so other pages keep flowing
+                    delay = retry_delay(e, attempt, self.retry_base_delay)
+                    print(f"⏳ LLM returned {e.status_code}, retrying in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
+        
+        key = make_key({"command": "wiki-page", "model": self.model_name, "prompt": prompt})
+        
+        # Coalesce duplicate prompts onto the request that is already running
+        task = self._inflight.get(key)
+        coalesced = task is not None
+        if not coalesced:
+            task = asyncio.ensure_future(
+                get_or_compute(self.cache, key, run, expire=self.cache_ttl)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Every caller waits through a shield so one cancelled caller does not
+        # fail the others; the request itself is cancelled once the last
+        # waiter leaves, so abandoned pages stop spending tokens
+        self._inflight_waiters[key] += 1
+        try:
+            content, cache_hit = await asyncio.shield(task)
+        finally:
+            self._inflight_waiters[key] -= 1
+            if not self._inflight_waiters[key]:
+                del self._inflight_waiters[key]
+                task.cancel()
+        
+        if cache_hit and not coalesced:
+            print("♻️  Returning cached response.")
+        return content
+    
+    async def _run_streaming(self, prompt: str) -> str:
+        """Stream a completion from the content agent and return the full text.
+        
+        Streaming keeps the event loop servicing other page requests while
+        tokens arrive instead of idling on one long response.
+        """
+        chunks = []
+        async with self.llm_generator.content_agent.run_stream(prompt) as response:
+            async for chunk in response.stream_text(delta=True):
+                chunks.append(chunk)
+        return "".join(chunks)
     
     async def generate_comprehensive_wiki(self, project_path: Path) -> List[WikiPage]:
         """Generate comprehensive wiki following AI exploration plan."""
+        indexed_pages = [item async for item in self.iter_pages(project_path)]
+        indexed_pages.sort(key=lambda item: item[0])
+        return [page for _, page in indexed_pages]
+    
+    async def iter_pages(self, project_path: Path) -> AsyncIterator[Tuple[int, WikiPage]]:
+        """Yield wiki pages as soon as each one is generated.
+        
+        Pages arrive in completion order, each paired with its position in the
+        exploration plan so callers can restore a stable order. Pages that fail
+        to generate are skipped and their errors collected in ``failed_pages``
+        for the caller to report.
+        """
+        self.failed_pages = []
         
         # Step 1: Create intelligent analyzer
         analyzer = IntelligentCodebaseAnalyzer(
             root_path=project_path, 
             model_name=self.model_name, 
-            api_key=self.api_key
+            api_key=self.api_key,
+            http_client=self.http_client,
+            cache=self.cache,
+            cache_ttl=self.cache_ttl,
         )
         
-        # Step 2: Get AI exploration plan
+        # Steps 2-4 are independent: plan, insights and key files run concurrently
         print("🧠 Creating exploration plan...")
-        exploration_plan = await analyzer.create_exploration_plan()
-        
-        # Step 3: Get project insights  
         print("🔍 Analyzing project insights...")
-        project_insights = await analyzer.analyze_project_insights()
-        
-        # Step 4: Get important project files
         print("📁 Identifying key project files...")
-        project_files = await analyzer.get_project_files()
+        (exploration_plan, project_insights), project_files = await asyncio.gather(
+            analyzer.run_full_analysis(),
+            analyzer.get_project_files(),
+        )
         
-        # Step 5: Generate wiki pages based on exploration plan
+        # Step 3: Generate wiki pages based on exploration plan
         print("📖 Generating wiki pages...")
-        pages = []
         
-        # Generate core pages based on AI plan
-        pages.append(await self._generate_home_page(exploration_plan, project_insights))
-        pages.append(await self._generate_installation_guide(exploration_plan, project_files))
-        pages.append(await self._generate_quickstart_guide(exploration_plan, project_insights, project_files))
-        pages.append(await self._generate_architecture_guide(exploration_plan, project_insights, project_files))
+        # Formatted lists shared by several page prompts, built once
+        self._features_str = ", ".join(project_insights.key_features)
+        self._entry_points_bullets = "\n".join(f"- {ep}" for ep in exploration_plan.key_entry_points)
+        self._core_modules_bullets = "\n".join(f"- {module}" for module in exploration_plan.core_modules)
+        
+        # Index files by entry point and module once instead of rescanning per
+        # page; only the first few entry files are shown, so stop matching early
+        entry_files = _files_matching(project_files, exploration_plan.key_entry_points, limit=3)
+        core_files = _files_matching(project_files, exploration_plan.core_modules)
+        module_files = {
+            module_name: [f for f in core_files if module_name in f.path_str]
+            for module_name in exploration_plan.core_modules
+        }
+        
+        # Every page is independent, so request them all concurrently
+        tasks = [
+            self._generate_home_page(exploration_plan, project_insights),
+            self._generate_installation_guide(exploration_plan, project_files),
+            self._generate_quickstart_guide(exploration_plan, project_insights, entry_files),
+            self._generate_architecture_guide(exploration_plan, project_insights, core_files),
+        ]
         
         # Generate API documentation for core modules
-        for module_name in exploration_plan.core_modules:
-            api_page = await self._generate_module_api_docs(module_name, project_files, exploration_plan)
-            if api_page:
-                pages.append(api_page)
+        tasks.extend(
+            self._generate_module_api_docs(module_name, module_files[module_name], exploration_plan)
+            for module_name in exploration_plan.core_modules
+        )
         
         # Generate additional pages based on exploration plan
-        for doc_type in exploration_plan.documentation_structure:
-            if doc_type.lower() not in ['home', 'installation', 'quickstart', 'architecture', 'api']:
-                additional_page = await self._generate_additional_page(doc_type, exploration_plan, project_insights, project_files)
-                if additional_page:
-                    pages.append(additional_page)
+        tasks.extend(
+            self._generate_additional_page(doc_type, exploration_plan, project_insights, project_files)
+            for doc_type in exploration_plan.documentation_structure
+            if doc_type.lower() not in _RESERVED_DOC_TYPES
+        )
         
-        return pages
+        async def indexed(position: int, coro: Awaitable[Optional[WikiPage]]):
+            return position, await coro
+        
+        pending = [asyncio.ensure_future(indexed(i, coro)) for i, coro in enumerate(tasks)]
+        try:
+            for next_page in asyncio.as_completed(pending):
+                try:
+                    position, page = await next_page
+                except Exception as e:
+                    self.failed_pages.append(e)
+                    continue
+                if page is not None:
+                    yield position, page
+        finally:
+            # Stop outstanding requests if the consumer stops early
+            for task in pending:
+                task.cancel()
+    
+    # Page prompts are plain f-strings on purpose: they compile to bytecode once
+    # at import and only substitute values per call, so a template engine would
+    # add a dependency and a slower render step without saving any parsing.
     
     async def _generate_home_page(self, plan: ExplorationPlan, insights: ProjectInsight) -> WikiPage:
         """Generate AI-powered home page."""
@@ -83,11 +242,11 @@ class AIWikiGenerator:
         - Purpose: {insights.project_purpose}
         - Main Functionality: {insights.main_functionality}
         - Target Audience: {insights.target_audience}
-        - Key Features: {', '.join(insights.key_features)}
+        - Key Features: {self._features_str}
         - Architecture: {insights.architecture_style}
         
         KEY ENTRY POINTS:
-        {chr(10).join([f'- {ep}' for ep in plan.key_entry_points])}
+        {self._entry_points_bullets}
         
         Create a compelling home page that includes:
         1. Clear project description and value proposition
@@ -100,21 +259,24 @@ class AIWikiGenerator:
         Make it welcoming and informative for new users.
         """
         
-        result = await self.llm_generator.content_agent.run(prompt)
+        content = await self._run_prompt(prompt)
         
         return WikiPage(
             title="Home",
             filename="Home.md",
-            content=result.output,
+            content=content,
             category="overview"
         )
     
     async def _generate_installation_guide(self, plan: ExplorationPlan, files: List) -> WikiPage:
         """Generate AI-powered installation guide."""
         
-        # Find configuration files
-        config_files = [f for f in files if f.file_type in ['.toml', '.txt', '.json'] or 'setup' in f.path.name]
-        config_context = "\n".join([f"{f.path.name}: {f.content_preview[:200]}" for f in config_files[:3]])
+        # Find the first few configuration files (files arrive sorted by importance)
+        config_files = itertools.islice(
+            (f for f in files if f.file_type in ['.toml', '.txt', '.json'] or 'setup' in f.path.name),
+            3,
+        )
+        config_context = "\n".join(f"{f.path.name}: {f.content_preview[:200]}" for f in config_files)
         
         prompt = f"""
         Generate a comprehensive installation guide for this project:
@@ -126,7 +288,7 @@ class AIWikiGenerator:
         {config_context}
         
         KEY ENTRY POINTS:
-        {chr(10).join([f'- {ep}' for ep in plan.key_entry_points])}
+        {self._entry_points_bullets}
         
         Create a detailed installation guide that includes:
         1. System requirements and prerequisites
@@ -140,31 +302,29 @@ class AIWikiGenerator:
         Be thorough but clear and easy to follow.
         """
         
-        result = await self.llm_generator.content_agent.run(prompt)
+        content = await self._run_prompt(prompt)
         
         return WikiPage(
             title="Installation Guide",
             filename="Installation.md",
-            content=result.output,
+            content=content,
             category="guide"
         )
     
-    async def _generate_quickstart_guide(self, plan: ExplorationPlan, insights: ProjectInsight, files: List) -> WikiPage:
-        """Generate AI-powered quickstart guide."""
+    async def _generate_quickstart_guide(self, plan: ExplorationPlan, insights: ProjectInsight, entry_files: List) -> WikiPage:
+        """Generate AI-powered quickstart guide from the files matching entry points."""
         
-        # Find main/entry files
-        entry_files = [f for f in files if any(ep in str(f.path) for ep in plan.key_entry_points)]
-        entry_context = "\n".join([f"{f.path.name}: {f.content_preview[:300]}" for f in entry_files[:3]])
+        entry_context = "\n".join(f"{f.path.name}: {f.content_preview[:300]}" for f in entry_files[:3])
         
         prompt = f"""
         Generate an engaging quickstart guide for this project:
         
         PROJECT PURPOSE: {insights.project_purpose}
         MAIN FUNCTIONALITY: {insights.main_functionality}
-        KEY FEATURES: {', '.join(insights.key_features)}
+        KEY FEATURES: {self._features_str}
         
         ENTRY POINTS:
-        {chr(10).join([f'- {ep}' for ep in plan.key_entry_points])}
+        {self._entry_points_bullets}
         
         ENTRY FILE EXAMPLES:
         {entry_context}
@@ -180,21 +340,19 @@ class AIWikiGenerator:
         Make the examples realistic and immediately useful.
         """
         
-        result = await self.llm_generator.content_agent.run(prompt)
+        content = await self._run_prompt(prompt)
         
         return WikiPage(
             title="Quick Start",
             filename="Quick-Start.md",
-            content=result.output,
+            content=content,
             category="guide"
         )
     
-    async def _generate_architecture_guide(self, plan: ExplorationPlan, insights: ProjectInsight, files: List) -> WikiPage:
-        """Generate AI-powered architecture guide."""
+    async def _generate_architecture_guide(self, plan: ExplorationPlan, insights: ProjectInsight, core_files: List) -> WikiPage:
+        """Generate AI-powered architecture guide from the files in core modules."""
         
-        # Get core module files
-        core_files = [f for f in files if any(module in str(f.path) for module in plan.core_modules)]
-        core_context = "\n".join([f"{f.path}: {f.content_preview[:200]}" for f in core_files[:5]])
+        core_context = "\n".join(f"{f.path_str}: {f.content_preview[:200]}" for f in core_files[:5])
         
         prompt = f"""
         Generate a comprehensive architecture guide for this project:
@@ -203,7 +361,7 @@ class AIWikiGenerator:
         PROJECT PURPOSE: {insights.project_purpose}
         
         CORE MODULES:
-        {chr(10).join([f'- {module}' for module in plan.core_modules])}
+        {self._core_modules_bullets}
         
         CORE FILES ANALYSIS:
         {core_context}
@@ -221,29 +379,26 @@ class AIWikiGenerator:
         how to work with and extend the codebase.
         """
         
-        result = await self.llm_generator.content_agent.run(prompt)
+        content = await self._run_prompt(prompt)
         
         return WikiPage(
             title="Architecture",
             filename="Architecture.md",
-            content=result.output,
+            content=content,
             category="reference"
         )
     
-    async def _generate_module_api_docs(self, module_name: str, files: List, plan: ExplorationPlan) -> Optional[WikiPage]:
-        """Generate API documentation for a specific module."""
-        
-        # Find files related to this module
-        module_files = [f for f in files if module_name in str(f.path)]
+    async def _generate_module_api_docs(self, module_name: str, module_files: List, plan: ExplorationPlan) -> Optional[WikiPage]:
+        """Generate API documentation for a specific module from its files."""
         
         if not module_files:
             return None
         
         # Get top files by importance
-        module_files = sorted(module_files, key=lambda x: x.importance_score, reverse=True)[:5]
+        module_files = heapq.nlargest(5, module_files, key=lambda x: x.importance_score)
         
         files_context = "\n\n".join([
-            f"FILE: {f.path}\n{f.content_preview}" 
+            f"FILE: {f.path_str}\n{f.content_preview}" 
             for f in module_files
         ])
         
@@ -269,12 +424,12 @@ class AIWikiGenerator:
         Make it easy for developers to understand and use the API.
         """
         
-        result = await self.llm_generator.content_agent.run(prompt)
+        content = await self._run_prompt(prompt)
         
         return WikiPage(
             title=f"{module_name} API",
             filename=f"{module_name.replace('/', '-')}-API.md",
-            content=result.output,
+            content=content,
             category="api"
         )
     
@@ -286,7 +441,7 @@ class AIWikiGenerator:
         
         PROJECT OVERVIEW: {plan.project_overview}
         PROJECT PURPOSE: {insights.project_purpose}
-        KEY FEATURES: {', '.join(insights.key_features)}
+        KEY FEATURES: {self._features_str}
         
         Create a comprehensive '{doc_type}' page that provides:
         - Relevant information for this documentation type
@@ -297,11 +452,11 @@ class AIWikiGenerator:
         Tailor the content specifically to what users would expect in a '{doc_type}' page.
         """
         
-        result = await self.llm_generator.content_agent.run(prompt)
+        content = await self._run_prompt(prompt)
         
         return WikiPage(
             title=doc_type,
             filename=f"{doc_type.replace(' ', '-')}.md",
-            content=result.output,
+            content=content,
             category="guide"
         )
\ No newline at end of file
@@ -1,8 +1,13 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Set, Tuple
 import ast
 import os
-from dataclasses import dataclass
+import re
+import sys
+import tomllib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
 
 from ..languages.python.analyzer import PythonAnalyzer
@@ -17,7 +22,7 @@ class ProjectType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class FileInfo:
     path: Path
     language: str
@@ -26,9 +31,11 @@ class FileInfo:
     classes: List[str]
     imports: List[str]
     docstring: Optional[str] = None
+    is_entry: bool = False  # has a top-level `if __name__ == "__main__":`
+    public_api: Optional[List[str]] = None  # top-level `__all__`, parsed for __init__.py only
 
 
-@dataclass
+@dataclass(slots=True)
 class ModuleInfo:
     name: str
     path: Path
@@ -37,7 +44,7 @@ class ModuleInfo:
     dependencies: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectStructure:
     root_path: Path
     project_type: ProjectType
@@ -50,6 +57,200 @@ class ProjectStructure:
     dependencies: Dict[str, Any]
 
 
+# Directories never worth descending into
+_SKIP_DIR_NAMES = frozenset({
+    '.venv', 'venv', 'env',
+    'site-packages', 'dist-packages',
+    '__pycache__', '.git', '.pytest_cache',
+    'node_modules', '.tox', '.mypy_cache',
+    'build', 'dist', '.coverage',
+    '.env', '.vscode', '.idea'
+})
+
+_LANGUAGE_EXTENSIONS = frozenset({'.py', '.go', '.js', '.ts', '.java', '.cpp', '.c', '.rs'})
+
+_STDLIB_MODULES = frozenset(sys.stdlib_module_names)
+
+# Python files above this size are summarized without parsing
+_MAX_PARSE_BYTES = 1_000_000
+
+# Below this many files a process pool costs more to start than it saves
+_PARALLEL_PARSE_THRESHOLD = 32
+
+_ENTRY_POINT_NAMES = frozenset({'main.py', 'app.py', '__main__.py', 'main.go', 'cmd', 'cli'})
+
+
+# Statement types collected by the Python file pass
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+_COMPOUND_NODES = (ast.If, ast.Try, ast.TryStar, ast.With)
+_COMPOUND_BODIES = ('body', 'orelse', 'finalbody')
+
+
+# Go declarations: `func Name(`, `import "path"` / `import alias "path"`,
+# and `import ( ... )` blocks whose quoted paths are extracted separately
+_GO_DECL_RE = re.compile(
+    rb'^[ \t]*(?:func[ \t]+([A-Za-z_]\w*)'
+    rb'|import[ \t]+(?:[\w.]+[ \t]+)?"([^"\n]+)"'
+    rb'|import[ \t]*\(([^)]*)\))',
+    re.MULTILINE,
+)
+_GO_IMPORT_PATH_RE = re.compile(rb'"([^"\n]+)"')
+
+# Non-blank lines of a manifest, with surrounding whitespace trimmed and
+# comment or directive lines skipped
+_GO_MOD_LINE_RE = re.compile(rb'^[ \t]*(?!module|go |//)(\S.*?)[ \t\r]*$', re.MULTILINE)
+_REQUIREMENT_LINE_RE = re.compile(rb'^[ \t]*([^\s#].*?)[ \t\r]*$', re.MULTILINE)
+
+
+# Configuration and documentation file names, matched with plain string
+# checks instead of globs
+_CONFIG_EXACT = frozenset({
+    'Dockerfile', 'requirements.txt', 'setup.py',
+    'pyproject.toml', 'go.mod', 'package.json', 'Cargo.toml'
+})
+_CONFIG_SUFFIXES = ('.toml', '.yaml', '.yml', '.json', '.ini', '.cfg')
+_CONFIG_PREFIXES = ('docker-compose',)
+
+_DOC_PREFIXES = ('README', 'CHANGELOG', 'LICENSE', 'CONTRIBUTING')
+_DOC_SUFFIXES = ('.md',)
+
+
+@dataclass
+class _ProjectScan:
+    """Everything the analyzer needs from one walk of the project tree."""
+    extension_counts: Dict[str, int] = field(default_factory=dict)
+    python_files: List[Path] = field(default_factory=list)
+    go_files: List[Path] = field(default_factory=list)
+    init_files: List[Path] = field(default_factory=list)
+    entry_candidates: Set[Path] = field(default_factory=set)
+    config_files: List[Path] = field(default_factory=list)
+    test_directories: Set[Path] = field(default_factory=set)
+    documentation_files: List[Path] = field(default_factory=list)
+
+
+def _is_main_guard(test: ast.expr) -> bool:
+    """Check for the `__name__ == "__main__"` comparison."""
+    return (
+        isinstance(test, ast.Compare)
+        and isinstance(test.left, ast.Name)
+        and test.left.id == '__name__'
+        and len(test.ops) == 1
+        and isinstance(test.ops[0], ast.Eq)
+        and isinstance(test.comparators[0], ast.Constant)
+        and test.comparators[0].value == '__main__'
+    )
+
+
+def _string_elements(node: ast.expr) -> List[str]:
+    """String constants of a list or tuple literal, or [] for anything else."""
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        return []
+    return [elt.value for elt in node.elts if isinstance(elt, ast.Constant) and isinstance(elt.value, str)]
+
+
+def _extract_dunder_all(tree: ast.Module) -> List[str]:
+    """Names listed in a module's top-level `__all__`.
+    
+    Follows plain assignment plus the `__all__ += [...]` and
+    `__all__.extend([...])` idioms, in statement order.
+    """
+    public_api: List[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            if any(isinstance(target, ast.Name) and target.id == '__all__' for target in node.targets):
+                public_api = _string_elements(node.value)
+        elif isinstance(node, ast.AugAssign):
+            if isinstance(node.target, ast.Name) and node.target.id == '__all__' and isinstance(node.op, ast.Add):
+                public_api.extend(_string_elements(node.value))
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+            func = node.value.func
+            if (isinstance(func, ast.Attribute) and func.attr == 'extend'
+                    and isinstance(func.value, ast.Name) and func.value.id == '__all__'
+                    and len(node.value.args) == 1):
+                public_api.extend(_string_elements(node.value.args[0]))
+    return public_api
+
+
+def _basic_python_file_info(file_path: Path, size: int) -> FileInfo:
+    """FileInfo for a Python file that was not parsed."""
+    return FileInfo(
+        path=file_path,
+        language='python',
+        size=size,
+        functions=[],
+        classes=[],
+        imports=[]
+    )
+
+
+def _analyze_python_file_worker(file_path: Path) -> FileInfo:
+    """Analyze a single Python file.
+    
+    Module-level so it can be pickled into a process pool. Parsing happens in
+    C inside ast.parse and only top-level statements are visited afterwards,
+    so this stays plain Python rather than a compiled extension.
+    """
+    try:
+        data = file_path.read_bytes()
+    except OSError:
+        return _basic_python_file_info(file_path, 0)
+    
+    # Generated or vendored files are too large to be worth parsing
+    if len(data) > _MAX_PARSE_BYTES:
+        return _basic_python_file_info(file_path, len(data))
+    
+    try:
+        # ast.parse decodes bytes itself, honoring PEP 263 encoding cookies
+        tree = ast.parse(data, filename=os.fspath(file_path))
+        
+        functions = []
+        classes = []
+        imports = []
+        
+        # Visit module- and class-level statements only (breadth-first, like
+        # ast.walk), without descending into function bodies
+        blocks = deque([tree.body])
+        while blocks:
+            for node in blocks.popleft():
+                if isinstance(node, _FUNCTION_NODES):
+                    functions.append(node.name)
+                elif isinstance(node, ast.ClassDef):
+                    classes.append(node.name)
+                    blocks.append(node.body)
+                elif isinstance(node, ast.Import):
+                    imports.extend(alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom):
+                    if node.module:
+                        imports.append(node.module)
+                elif isinstance(node, _COMPOUND_NODES):
+                    # Conditional imports and definitions, e.g. try/except ImportError
+                    blocks.extend(getattr(node, attr) for attr in _COMPOUND_BODIES if hasattr(node, attr))
+                    blocks.extend(handler.body for handler in getattr(node, 'handlers', ()))
+        
+        # Get module docstring
+        docstring = ast.get_docstring(tree, clean=False)
+        is_entry = any(isinstance(node, ast.If) and _is_main_guard(node.test) for node in tree.body)
+        # Package exports are read here so the AST never has to be parsed
+        # again, or pickled back from a worker process
+        public_api = _extract_dunder_all(tree) if file_path.name == '__init__.py' else None
+        
+        return FileInfo(
+            path=file_path,
+            language='python',
+            size=len(data),
+            functions=functions,
+            classes=classes,
+            imports=imports,
+            docstring=docstring,
+            is_entry=is_entry,
+            public_api=public_api
+        )
+    
+    except Exception:
+        # If we can't parse the file, return basic info
+        return _basic_python_file_info(file_path, len(data))
+
+
 class CodebaseAnalyzer:
     """Analyzes entire codebase to understand structure and generate comprehensive documentation."""
     
@@ -57,13 +258,88 @@ class CodebaseAnalyzer:
         self.root_path = root_path
         self.python_analyzer = PythonAnalyzer()
         self.go_analyzer = GoAnalyzer()
+        self._scan_result: Optional[_ProjectScan] = None
+        self._main_language: Optional[str] = None
+        # Every Python file parsed so far, reused by later analysis steps
+        self._file_infos: Dict[Path, FileInfo] = {}
+    
+    def _walk(self) -> Iterator[Tuple[os.DirEntry, int]]:
+        """Yield (entry, depth) for every file and directory under the root.
+        
+        Skipped directories are pruned before descent, and entries reuse the
+        metadata from the directory listing instead of stat-ing again.
+        """
+        stack = [(os.fspath(self.root_path), 0)]
+        while stack:
+            directory, depth = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir and entry.name in _SKIP_DIR_NAMES:
+                    continue
+                yield entry, depth
+                if is_dir:
+                    subdirs.append((entry.path, depth + 1))
+            stack.extend(reversed(subdirs))
+    
+    def _scan(self) -> _ProjectScan:
+        """Walk the tree once and collect every file list the analysis uses."""
+        if self._scan_result is not None:
+            return self._scan_result
+        
+        scan = _ProjectScan()
+        counts = scan.extension_counts
+        for entry, depth in self._walk():
+            name = entry.name
+            
+            # Paths stay strings until an entry is actually collected
+            if entry.is_dir(follow_symlinks=False):
+                if name.startswith('test'):
+                    scan.test_directories.add(Path(entry.path))
+                if name in _ENTRY_POINT_NAMES:
+                    scan.entry_candidates.add(Path(entry.path))
+                continue
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            
+            ext = os.path.splitext(name)[1].lower()
+            if ext in _LANGUAGE_EXTENSIONS:
+                counts[ext] = counts.get(ext, 0) + 1
+            
+            parent = os.path.dirname(entry.path)
+            if name.endswith('.py'):
+                scan.python_files.append(Path(entry.path))
+                if name == '__init__.py':
+                    scan.init_files.append(Path(entry.path))
+                elif name.startswith('test_'):
+                    scan.test_directories.add(Path(parent))
+            elif name.endswith('.go'):
+                scan.go_files.append(Path(entry.path))
+                if name.endswith('_test.go'):
+                    scan.test_directories.add(Path(parent))
+            
+            if name in _ENTRY_POINT_NAMES:
+                scan.entry_candidates.add(Path(entry.path))
+            if name in _CONFIG_EXACT or name.endswith(_CONFIG_SUFFIXES) or name.startswith(_CONFIG_PREFIXES):
+                scan.config_files.append(Path(entry.path))
+            if name.startswith(_DOC_PREFIXES) or name.endswith(_DOC_SUFFIXES) or os.path.basename(parent) == 'docs':
+                scan.documentation_files.append(Path(entry.path))
+        
+        self._scan_result = scan
+        return scan
     
     def analyze_project(self) -> ProjectStructure:
         """Analyze the entire project structure."""
         project_type = self._detect_project_type()
         main_language = self._detect_main_language()
         
-        modules = self._analyze_modules()
+        modules = self._analyze_modules(main_language)
         entry_points = self._find_entry_points()
         config_files = self._find_config_files()
         test_directories = self._find_test_directories()
@@ -84,9 +360,10 @@ class CodebaseAnalyzer:
     
     def _detect_project_type(self) -> ProjectType:
         """Detect the primary project type based on files present."""
-        has_python = any(self.root_path.rglob("*.py"))
-        has_go = any(self.root_path.rglob("*.go"))
-        has_js = any(self.root_path.rglob("*.js")) or any(self.root_path.rglob("*.ts"))
+        counts = self._scan().extension_counts
+        has_python = '.py' in counts
+        has_go = '.go' in counts
+        has_js = '.js' in counts or '.ts' in counts
         
         type_count = sum([has_python, has_go, has_js])
         
@@ -102,14 +379,13 @@ class CodebaseAnalyzer:
             return ProjectType.UNKNOWN
     
     def _detect_main_language(self) -> str:
-        """Detect the main programming language."""
-        language_counts = {}
-        
-        for file_path in self.root_path.rglob("*"):
-            if file_path.is_file() and file_path.suffix:
-                ext = file_path.suffix.lower()
-                if ext in ['.py', '.go', '.js', '.ts', '.java', '.cpp', '.c', '.rs']:
-                    language_counts[ext] = language_counts.get(ext, 0) + 1
+        """Detect the main programming language (computed once per analyzer)."""
+        if self._main_language is None:
+            self._main_language = self._compute_main_language()
+        return self._main_language
+    
+    def _compute_main_language(self) -> str:
+        language_counts = self._scan().extension_counts
         
         if not language_counts:
             return "unknown"
@@ -128,13 +404,16 @@ class CodebaseAnalyzer:
         
         return ext_to_lang.get(main_ext, 'unknown')
     
-    def _analyze_modules(self) -> List[ModuleInfo]:
+    def _analyze_modules(self, main_language: Optional[str] = None) -> List[ModuleInfo]:
         """Analyze modules/packages in the project."""
         modules = []
         
-        if self._detect_main_language() == 'python':
+        if main_language is None:
+            main_language = self._detect_main_language()
+        
+        if main_language == 'python':
             modules.extend(self._analyze_python_modules())
-        elif self._detect_main_language() == 'go':
+        elif main_language == 'go':
             modules.extend(self._analyze_go_modules())
         
         return modules
@@ -142,38 +421,45 @@ class CodebaseAnalyzer:
     def _analyze_python_modules(self) -> List[ModuleInfo]:
         """Analyze Python modules and packages."""
         modules = []
+        scan = self._scan()
+        
+        # Find Python packages (directories with __init__.py), skipping the
+        # root directory, virtual environments and installed packages
+        packages = {
+            init_file.parent: init_file
+            for init_file in scan.init_files
+            if init_file.parent != self.root_path
+            and not self._should_skip_directory(init_file.parent)
+        }
         
-        # Find Python packages (directories with __init__.py)
-        for init_file in self.root_path.rglob("__init__.py"):
-            package_dir = init_file.parent
-            
-            # Skip if this is the root directory
-            if package_dir == self.root_path:
-                continue
-            
-            # Skip virtual environments and installed packages
-            if self._should_skip_directory(package_dir):
+        # Assign every Python file to each package that contains it
+        package_files: Dict[Path, List[Path]] = {package_dir: [] for package_dir in packages}
+        for py_file in scan.python_files:
+            if py_file.name.startswith('.') or self._should_skip_directory(py_file.parent):
                 continue
-                
+            for parent in py_file.parents:
+                if parent in package_files:
+                    package_files[parent].append(py_file)
+                if parent == self.root_path:
+                    break
+        
+        # Parse each file once, even when nested packages share it
+        unique_files = list(dict.fromkeys(
+            py_file for files in package_files.values() for py_file in files
+        ))
+        file_infos = self._analyze_python_files(unique_files)
+        
+        for package_dir, init_file in packages.items():
             module_name = package_dir.name
-            files = []
-            
-            # Analyze all Python files in this package
-            for py_file in package_dir.rglob("*.py"):
-                if py_file.name.startswith('.'):
-                    continue
-                    
-                # Skip if the file is in a directory we should skip
-                if self._should_skip_directory(py_file.parent):
-                    continue
-                    
-                file_info = self._analyze_python_file(py_file)
-                if file_info:
-                    files.append(file_info)
+            files = [file_infos[py_file] for py_file in package_files[package_dir]]
             
             if files:
-                # Extract public API from __init__.py
-                public_api = self._extract_public_api(init_file)
+                # Extract public API from __init__.py, reusing the parse above
+                init_info = file_infos.get(init_file)
+                if init_info is not None and init_info.public_api is not None:
+                    public_api = init_info.public_api
+                else:
+                    public_api = self._extract_public_api(init_file)
                 dependencies = self._extract_dependencies(files)
                 
                 modules.append(ModuleInfo(
@@ -188,30 +474,16 @@ class CodebaseAnalyzer:
     
     def _should_skip_directory(self, directory: Path) -> bool:
         """Check if a directory should be skipped during analysis."""
-        # Convert to string for easier checking
-        dir_str = str(directory)
-        
-        # Skip common virtual environment and package directories
-        skip_patterns = [
-            '.venv', 'venv', 'env',
-            'site-packages', 'dist-packages',
-            '__pycache__', '.git', '.pytest_cache',
-            'node_modules', '.tox', '.mypy_cache',
-            'build', 'dist', '.coverage',
-            '.env', '.vscode', '.idea'
-        ]
-        
-        # Check if any part of the path contains skip patterns
-        for pattern in skip_patterns:
-            if pattern in dir_str:
-                return True
-        
         # Only analyze directories that are within the project structure
         # Skip if the path goes too deep into dependency directories
         try:
             relative_path = directory.relative_to(self.root_path)
             path_parts = relative_path.parts
             
+            # Match whole path components, so "envoy/" or "builder/" survive
+            if not _SKIP_DIR_NAMES.isdisjoint(path_parts):
+                return True
+            
             # If the path contains more than 4 levels deep, it's likely a dependency
             if len(path_parts) > 4:
                 return True
@@ -231,11 +503,11 @@ class CodebaseAnalyzer:
         modules = []
         
         # Find Go packages (directories with .go files)
-        go_dirs = set()
-        for go_file in self.root_path.rglob("*.go"):
-            go_dirs.add(go_file.parent)
+        go_dirs: Dict[Path, List[Path]] = {}
+        for go_file in self._scan().go_files:
+            go_dirs.setdefault(go_file.parent, []).append(go_file)
         
-        for go_dir in go_dirs:
+        for go_dir, go_files in go_dirs.items():
             if go_dir.name.startswith('.'):
                 continue
                 
@@ -243,7 +515,7 @@ class CodebaseAnalyzer:
             files = []
             
             # Analyze all Go files in this directory
-            for go_file in go_dir.glob("*.go"):
+            for go_file in go_files:
                 file_info = self._analyze_go_file(go_file)
                 if file_info:
                     files.append(file_info)
@@ -264,84 +536,41 @@ class CodebaseAnalyzer:
     
     def _analyze_python_file(self, file_path: Path) -> Optional[FileInfo]:
         """Analyze a single Python file."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
-            
-            functions = []
-            classes = []
-            imports = []
-            docstring = None
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    functions.append(node.name)
-                elif isinstance(node, ast.ClassDef):
-                    classes.append(node.name)
-                elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            imports.append(alias.name)
-                    else:
-                        if node.module:
-                            imports.append(node.module)
-            
-            # Get module docstring
-            if (tree.body and isinstance(tree.body[0], ast.Expr) and 
-                isinstance(tree.body[0].value, ast.Constant) and 
-                isinstance(tree.body[0].value.value, str)):
-                docstring = tree.body[0].value.value
-            
-            return FileInfo(
-                path=file_path,
-                language='python',
-                size=len(content),
-                functions=functions,
-                classes=classes,
-                imports=imports,
-                docstring=docstring
-            )
-        
-        except Exception:
-            # If we can't parse the file, return basic info
-            return FileInfo(
-                path=file_path,
-                language='python',
-                size=file_path.stat().st_size if file_path.exists() else 0,
-                functions=[],
-                classes=[],
-                imports=[]
-            )
+        return _analyze_python_file_worker(file_path)
+    
+    def _analyze_python_files(self, paths: List[Path]) -> Dict[Path, FileInfo]:
+        """Analyze many Python files, in parallel processes for larger projects."""
+        if len(paths) < _PARALLEL_PARSE_THRESHOLD:
+            results = map(_analyze_python_file_worker, paths)
+        else:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                results = list(executor.map(_analyze_python_file_worker, paths, chunksize=16))
+        file_infos = dict(zip(paths, results))
+        self._file_infos.update(file_infos)
+        return file_infos
     
     def _analyze_go_file(self, file_path: Path) -> Optional[FileInfo]:
         """Analyze a single Go file (basic implementation)."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            data = file_path.read_bytes()
             
             functions = []
             imports = []
             
-            # Simple regex-based parsing for Go (could be improved with proper parser)
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith('func ') and not line.startswith('func ('):
-                    # Extract function name
-                    func_name = line.split('(')[0].replace('func ', '').strip()
-                    functions.append(func_name)
-                elif line.startswith('import '):
-                    # Extract import
-                    import_part = line.replace('import ', '').strip().strip('"')
-                    if import_part:
-                        imports.append(import_part)
+            # One C-level regex scan over the raw bytes finds functions (not
+            # methods) and both single and grouped imports
+            for func_name, import_path, import_block in _GO_DECL_RE.findall(data):
+                if func_name:
+                    functions.append(func_name.decode())
+                elif import_path:
+                    imports.append(import_path.decode())
+                else:
+                    imports.extend(p.decode() for p in _GO_IMPORT_PATH_RE.findall(import_block))
             
             return FileInfo(
                 path=file_path,
                 language='go',
-                size=len(content),
+                size=len(data),
                 functions=functions,
                 classes=[],  # Go doesn't have classes
                 imports=imports
@@ -364,20 +593,9 @@ class CodebaseAnalyzer:
                 content = f.read()
             
             tree = ast.parse(content)
-            public_api = []
             
-            # Look for __all__ definition
-            for node in ast.walk(tree):
-                if (isinstance(node, ast.Assign) and 
-                    len(node.targets) == 1 and 
-                    isinstance(node.targets[0], ast.Name) and 
-                    node.targets[0].id == '__all__'):
-                    if isinstance(node.value, ast.List):
-                        for elt in node.value.elts:
-                            if isinstance(elt, ast.Constant) and isinstance(elt.value, str):
-                                public_api.append(elt.value)
-            
-            return public_api
+            # Look for the module-level __all__ definition
+            return _extract_dunder_all(tree)
         
         except Exception:
             return []
@@ -394,85 +612,53 @@ class CodebaseAnalyzer:
         return public_api
     
     def _extract_dependencies(self, files: List[FileInfo]) -> List[str]:
-        """Extract unique dependencies from files."""
-        all_imports = []
-        for file_info in files:
-            all_imports.extend(file_info.imports)
+        """Extract unique dependencies from files, in first-seen order."""
+        all_imports = dict.fromkeys(imp for file_info in files for imp in file_info.imports)
         
         # Filter out standard library and relative imports
-        external_deps = []
-        for imp in set(all_imports):
-            if not imp.startswith('.') and '/' in imp or imp not in ['os', 'sys', 'json', 'time']:
-                external_deps.append(imp)
-        
-        return list(set(external_deps))
+        return [
+            imp for imp in all_imports
+            if imp and not imp.startswith('.') and imp.split('.', 1)[0] not in _STDLIB_MODULES
+        ]
     
     def _find_entry_points(self) -> List[Path]:
         """Find potential entry points (main files, scripts, etc.)."""
-        entry_points = []
-        
-        # Look for common entry point files
-        common_entries = ['main.py', 'app.py', '__main__.py', 'main.go', 'cmd', 'cli']
-        
-        for pattern in common_entries:
-            matches = list(self.root_path.rglob(pattern))
-            entry_points.extend(matches)
-        
-        # Also check for executable Python files
-        for py_file in self.root_path.rglob("*.py"):
+        scan = self._scan()
+        
+        # Common entry point files and directories
+        entry_points = set(scan.entry_candidates)
+        
+        # Also check for executable Python files, reusing parsed results
+        for py_file in scan.python_files:
+            if py_file in entry_points:
+                continue  # matched by name, no need to look inside
+            file_info = self._file_infos.get(py_file)
+            if file_info is not None:
+                if file_info.is_entry:
+                    entry_points.add(py_file)
+                continue
             try:
                 with open(py_file, 'r', encoding='utf-8') as f:
                     first_lines = f.read(200)
                     if 'if __name__ == "__main__"' in first_lines:
-                        entry_points.append(py_file)
+                        entry_points.add(py_file)
             except Exception:
                 continue
         
-        return list(set(entry_points))
+        # Sorted so the generated docs and prompts don't vary between runs
+        return sorted(entry_points)
     
     def _find_config_files(self) -> List[Path]:
         """Find configuration files."""
-        config_patterns = [
-            '*.toml', '*.yaml', '*.yml', '*.json', '*.ini', '*.cfg',
-            'Dockerfile', 'docker-compose*', 'requirements.txt', 'setup.py',
-            'pyproject.toml', 'go.mod', 'package.json', 'Cargo.toml'
-        ]
-        
-        config_files = []
-        for pattern in config_patterns:
-            matches = list(self.root_path.rglob(pattern))
-            config_files.extend(matches)
-        
-        return config_files
+        return list(self._scan().config_files)
     
     def _find_test_directories(self) -> List[Path]:
         """Find test directories and files."""
-        test_dirs = set()
-        
-        # Look for test directories
-        for test_dir in self.root_path.rglob("test*"):
-            if test_dir.is_dir():
-                test_dirs.add(test_dir)
-        
-        # Look for test files
-        for test_file in self.root_path.rglob("test_*.py"):
-            test_dirs.add(test_file.parent)
-        
-        for test_file in self.root_path.rglob("*_test.go"):
-            test_dirs.add(test_file.parent)
-        
-        return list(test_dirs)
+        return list(self._scan().test_directories)
     
     def _find_documentation_files(self) -> List[Path]:
         """Find existing documentation files."""
-        doc_patterns = ['README*', 'CHANGELOG*', 'LICENSE*', 'CONTRIBUTING*', 'docs/*', '*.md']
-        
-        doc_files = []
-        for pattern in doc_patterns:
-            matches = list(self.root_path.rglob(pattern))
-            doc_files.extend([f for f in matches if f.is_file()])
-        
-        return doc_files
+        return list(self._scan().documentation_files)
     
     def _analyze_dependencies(self) -> Dict[str, Any]:
         """Analyze project dependencies from various sources."""
@@ -482,17 +668,18 @@ class CodebaseAnalyzer:
         requirements_file = self.root_path / "requirements.txt"
         if requirements_file.exists():
             try:
-                with open(requirements_file, 'r') as f:
-                    dependencies['python'] = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+                data = requirements_file.read_bytes()
+                dependencies['python'] = [
+                    match.group(1).decode() for match in _REQUIREMENT_LINE_RE.finditer(data)
+                ]
             except Exception:
                 pass
         
         pyproject_file = self.root_path / "pyproject.toml"
         if pyproject_file.exists():
             try:
-                import toml
-                with open(pyproject_file, 'r') as f:
-                    pyproject_data = toml.load(f)
+                with open(pyproject_file, 'rb') as f:
+                    pyproject_data = tomllib.load(f)
                     if 'project' in pyproject_data and 'dependencies' in pyproject_data['project']:
                         dependencies['python'] = pyproject_data['project']['dependencies']
             except Exception:
@@ -502,13 +689,10 @@ class CodebaseAnalyzer:
         go_mod_file = self.root_path / "go.mod"
         if go_mod_file.exists():
             try:
-                with open(go_mod_file, 'r') as f:
-                    go_deps = []
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('module') and not line.startswith('go ') and not line.startswith('//'):
-                            go_deps.append(line)
-                    dependencies['go'] = go_deps
+                data = go_mod_file.read_bytes()
+                dependencies['go'] = [
+                    match.group(1).decode() for match in _GO_MOD_LINE_RE.finditer(data)
+                ]
             except Exception:
                 pass
         
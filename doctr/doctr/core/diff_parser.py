@@ -1,67 +1,116 @@
+import re
+import subprocess
 from pathlib import Path
 from typing import List, Optional
-import git
-from git import Repo, Diff
 
 from ..core.doc_model import CodeChange, ChangeType
 
 
+# Per-file header of a combined diff; the backreference keeps unrenamed
+# paths containing " b/" or spaces intact, renames fall back to the new path
+_DIFF_HEADER_RE = re.compile(r'^diff --git a/(?:(.+) b/\1|.+? b/(.+))$', re.M)
+
+# Hunk header capturing the first line number in the new file
+_HUNK_HEADER_RE = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)', re.M)
+
+_CHANGED_LINE_RE = re.compile(r'^([-+])(.*)$', re.M)
+
+# Pin the output format against user git config (diff.noprefix,
+# diff.mnemonicPrefix, external diff drivers, textconv filters) so the
+# headers always match _DIFF_HEADER_RE
+_DIFF_FORMAT_ARGS = (
+    "--no-color", "--no-ext-diff", "--no-textconv", "--src-prefix=a/", "--dst-prefix=b/",
+)
+
+
+def run_git(repo_path: Path, *args: str) -> str:
+    """Run a git command in the repository and return its decoded stdout.
+    
+    Raises subprocess.CalledProcessError when git exits non-zero and
+    FileNotFoundError when git is not installed.
+    """
+    result = subprocess.run(
+        ["git", "-C", str(repo_path), *args],
+        capture_output=True,
+        check=True,
+    )
+    return result.stdout.decode("utf-8", errors="replace")
+
+
 class DiffParser:
     """Parses Git diffs to extract code changes."""
     
     def __init__(self, repo_path: Path):
-        self.repo = Repo(repo_path)
+        """Raises ValueError when repo_path is not inside a Git repository."""
+        try:
+            run_git(repo_path, "rev-parse", "--git-dir")
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"Not a Git repository: {repo_path}") from e
+        self.repo_path = repo_path
+    
+    def _git(self, *args: str) -> str:
+        """Run a git command against this repository."""
+        return run_git(self.repo_path, *args)
     
     def parse_diff(self, target: str = "HEAD~1") -> List[CodeChange]:
         """Parse Git diff and extract code changes."""
         try:
-            # Get diff between target and current HEAD
-            diffs = self.repo.git.diff(target, name_only=True).split('\n')
-            changes = []
-            
-            for file_path in diffs:
-                if not file_path.strip():
-                    continue
-                    
-                # Get detailed diff for this file
-                file_diff = self.repo.git.diff(target, file_path)
-                change = self._parse_file_diff(file_path, file_diff)
-                if change:
-                    changes.append(change)
-            
-            return changes
-            
+            return self.collect_changes(target)
         except Exception as e:
             print(f"Error parsing diff: {e}")
             return []
     
+    def collect_changes(self, target: str = "HEAD~1") -> List[CodeChange]:
+        """Like parse_diff, but raise on failure instead of reporting it."""
+        # Get diff between target and current HEAD in one git process,
+        # then split it per file in Python
+        full_diff = self._git("diff", *_DIFF_FORMAT_ARGS, target)
+        headers = list(_DIFF_HEADER_RE.finditer(full_diff))
+        changes = []
+        
+        for header, next_header in zip(headers, headers[1:] + [None]):
+            file_path = header.group(1) or header.group(2)
+            end = next_header.start() if next_header else len(full_diff)
+            change = self._parse_file_diff(file_path, full_diff[header.start():end])
+            if change:
+                changes.append(change)
+        
+        return changes
+    
     def _parse_file_diff(self, file_path: str, diff_content: str) -> Optional[CodeChange]:
         """Parse individual file diff."""
         if not diff_content.strip():
             return None
         
-        # Basic parsing - extract added/removed lines
-        lines = diff_content.split('\n')
+        # Basic parsing - extract added/removed lines hunk by hunk, letting
+        # the regex engine find changed lines and count the context between
         added_lines = []
         removed_lines = []
-        line_num = 0
+        start_line = end_line = 0
+        hunks = list(_HUNK_HEADER_RE.finditer(diff_content))
         
-        for line in lines:
-            if line.startswith('@@'):
-                # Extract line number from hunk header
-                parts = line.split()
-                if len(parts) >= 2:
-                    try:
-                        line_num = int(parts[2].split(',')[0].lstrip('+'))
-                    except (ValueError, IndexError):
-                        line_num = 0
-            elif line.startswith('+') and not line.startswith('+++'):
-                added_lines.append((line_num, line[1:]))
-                line_num += 1
-            elif line.startswith('-') and not line.startswith('---'):
-                removed_lines.append((line_num, line[1:]))
-            elif not line.startswith('-'):
-                line_num += 1
+        for hunk, next_hunk in zip(hunks, hunks[1:] + [None]):
+            line_num = int(hunk.group(1))
+            pos = diff_content.find('\n', hunk.end()) + 1
+            if not pos:
+                continue
+            end = next_hunk.start() if next_hunk else len(diff_content)
+            
+            for match in _CHANGED_LINE_RE.finditer(diff_content, pos, end):
+                # Every line passed since the last change is a context line
+                line_num += diff_content.count('\n', pos, match.start())
+                # Hunks are ordered and line_num never decreases, so the
+                # first change is the start and the latest one the end
+                if not added_lines and not removed_lines:
+                    start_line = line_num
+                end_line = line_num
+                if match.group(1) == '+':
+                    added_lines.append((line_num, match.group(2)))
+                    pos = match.end()
+                else:
+                    # Removed lines don't exist in the new file, so skip their newline
+                    removed_lines.append((line_num, match.group(2)))
+                    pos = match.end() + 1
         
         # Determine change type
         if added_lines and not removed_lines:
@@ -72,9 +121,6 @@ class DiffParser:
             change_type = ChangeType.MODIFIED
         
         # Create CodeChange object
-        start_line = min([ln for ln, _ in added_lines + removed_lines]) if added_lines or removed_lines else 0
-        end_line = max([ln for ln, _ in added_lines + removed_lines]) if added_lines or removed_lines else 0
-        
         return CodeChange(
             file_path=file_path,
             change_type=change_type,
@@ -10,7 +10,7 @@ class ChangeType(Enum):
     RENAMED = "renamed"
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeChange:
     """Represents a semantic code change."""
     file_path: str
@@ -24,7 +24,7 @@ class CodeChange:
     symbol_type: Optional[str] = None  # function, class, variable, etc.
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentationDraft:
     """Structured documentation draft before LLM expansion."""
     title: str
@@ -35,7 +35,7 @@ class DocumentationDraft:
     metadata: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratedDoc:
     """Final generated documentation."""
     title: str
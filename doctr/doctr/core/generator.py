@@ -1,7 +1,12 @@
+from collections import Counter
 from typing import List
 from pathlib import Path
 
-from ..core.doc_model import CodeChange, DocumentationDraft, GeneratedDoc
+from ..core.doc_model import ChangeType, CodeChange, DocumentationDraft, GeneratedDoc
+
+
+# Change types that introduce or alter behaviour worth a "New Features" section
+_ADDED_OR_MODIFIED = frozenset({ChangeType.ADDED, ChangeType.MODIFIED})
 
 
 class DocumentationGenerator:
@@ -20,7 +25,7 @@ class DocumentationGenerator:
             )
         
         # Analyze changes to create draft
-        affected_files = list(set(change.file_path for change in changes))
+        affected_files = {change.file_path for change in changes}
         affected_symbols = []
         
         # Extract symbols from changes
@@ -32,12 +37,13 @@ class DocumentationGenerator:
         
         # Generate title and summary
         if len(affected_files) == 1:
-            title = f"Changes to {Path(affected_files[0]).name}"
+            title = f"Changes to {Path(next(iter(affected_files))).name}"
         else:
             title = f"Changes across {len(affected_files)} files"
         
-        summary = self._generate_summary(changes)
-        suggested_sections = self._suggest_sections(changes)
+        change_counts = Counter(change.change_type for change in changes)
+        summary = self._generate_summary(change_counts)
+        suggested_sections = self._suggest_sections(changes, change_counts)
         
         return DocumentationDraft(
             title=title,
@@ -52,30 +58,23 @@ class DocumentationGenerator:
             }
         )
     
-    def _generate_summary(self, changes: List[CodeChange]) -> str:
-        """Generate a summary of the changes."""
-        change_counts = {}
-        for change in changes:
-            change_type = change.change_type.value
-            change_counts[change_type] = change_counts.get(change_type, 0) + 1
-        
-        summary_parts = []
-        for change_type, count in change_counts.items():
-            if count == 1:
-                summary_parts.append(f"1 {change_type} change")
-            else:
-                summary_parts.append(f"{count} {change_type} changes")
+    def _generate_summary(self, change_counts: Counter[ChangeType]) -> str:
+        """Generate a summary from the number of changes of each type."""
+        summary_parts = [
+            f"{count} {change_type.value} change{'' if count == 1 else 's'}"
+            for change_type, count in change_counts.items()
+        ]
         
         return "This update includes " + ", ".join(summary_parts) + "."
     
-    def _suggest_sections(self, changes: List[CodeChange]) -> List[str]:
+    def _suggest_sections(
+        self, changes: List[CodeChange], change_counts: Counter[ChangeType]
+    ) -> List[str]:
         """Suggest documentation sections based on changes."""
         sections = ["Overview"]
         
         # Add sections based on change types
-        change_types = set(change.change_type for change in changes)
-        
-        if any(ct.value in ["added", "modified"] for ct in change_types):
+        if not _ADDED_OR_MODIFIED.isdisjoint(change_counts):
             sections.append("New Features")
         
         if any(change.function_name for change in changes):
@@ -1,9 +1,18 @@
+import asyncio
+import functools
+import heapq
+import operator
+import os
+import re
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Type
 from dataclasses import dataclass
+import httpx
 from pydantic import BaseModel
 
 from ..integrations.llm import LLMDocumentationGenerator
+from .llm_cache import CacheBackend, get_or_compute, make_key
 
 
 class ExplorationPlan(BaseModel):
@@ -33,34 +42,199 @@ class ProjectFile:
     file_type: str
     importance_score: int  # 1-10
 
+    @functools.cached_property
+    def path_str(self) -> str:
+        """String form of path, computed once for repeated matching."""
+        return os.fspath(self.path)
+
+
+# Directories that never contain project code
+_SKIP_DIRS = frozenset({
+    ".venv",
+    "venv",
+    "env",
+    "__pycache__",
+    ".git",
+    ".pytest_cache",
+    "node_modules",
+    ".tox",
+    ".mypy_cache",
+    "build",
+    "dist",
+    ".coverage",
+    ".env",
+    ".vscode",
+    ".idea",
+    ".DS_Store",
+    "site-packages",
+    "dist-packages",
+})
+
+# Deepest directory (relative to the root) any of the file lookups inspect
+_MAX_WALK_DEPTH = 4
+
+# Indentation per structure level, directories go at most 3 deep and their
+# files one level further
+_INDENTS = tuple("  " * level for level in range(5))
+
+# Number of top-scored files handed to the wiki generator
+_MAX_PROJECT_FILES = 50
+
+# Common entry point files
+_ENTRY_POINT_NAMES = frozenset({
+    "main.py",
+    "app.py",
+    "__main__.py",
+    "cli.py",
+    "server.py",
+    "run.py",
+    "start.py",
+})
+
+_MAIN_GUARD = b'if __name__ == "__main__"'
+
+# Version-like directory names (e.g. "requests-2.31.0") mark installed
+# packages: a digit plus "-" or ".", unless the name mentions test/src/lib
+_LOOKS_INSTALLED = re.compile(r"(?!.*(?:test|src|lib))(?=.*\d).*[-.]", re.I | re.S).match
+
+_README_NAMES = ("README.md", "README.rst", "README.txt", "README")
+_README_PREVIEW_CHARS = 2000
+
+# Characters of joined documentation previews kept in the project context
+_DOCS_PREVIEW_CHARS = 1000
+
+# Upper bound on the whole project context sent with each prompt
+_MAX_CONTEXT_CHARS = 12000
+
+# Important files, matched against the lowercased file name
+_IMPORTANT_NAMES = frozenset({
+    # Python files
+    "main.py",
+    "__main__.py",
+    "__init__.py",
+    "cli.py",
+    "app.py",
+    # Configuration
+    "setup.py",
+    "pyproject.toml",
+    "requirements.txt",
+    "pipfile",
+    "package.json",
+    "go.mod",
+    "cargo.toml",
+    # Other important files
+    ".gitignore",
+})
+
+# Documentation and build files often carry a suffix (README.md, LICENSE-MIT)
+_IMPORTANT_PREFIXES = (
+    "readme",
+    "changelog",
+    "license",
+    "contributing",
+    "dockerfile",
+    "makefile",
+)
+
+_IMPORTANT_EXTENSIONS = frozenset({
+    ".py",
+    ".go",
+    ".js",
+    ".ts",
+    ".rs",
+    ".java",
+    ".cpp",
+    ".c",
+})
+
+# Importance bonus for well-known file names
+_NAME_SCORES = {
+    "main.py": 3,
+    "__main__.py": 3,
+    "app.py": 3,
+    "cli.py": 3,
+    "__init__.py": 2,
+    "setup.py": 2,
+    "pyproject.toml": 2,
+}
+
+_CONFIG_FILES = (
+    "pyproject.toml",
+    "setup.py",
+    "requirements.txt",
+    "package.json",
+    "go.mod",
+    "Cargo.toml",
+    ".doctr.toml",
+)
+
 
 class IntelligentCodebaseAnalyzer:
     """AI-powered codebase analyzer that focuses on project code, not dependencies."""
 
+    # Agent pairs keyed by (model name, API key). Agents are built without a
+    # model, which is passed per run, so per-run HTTP clients never end up in
+    # the key or stay alive in the cache.
+    _agent_cache: Dict[Tuple[Any, ...], Tuple[Any, Any]] = {}
+
     def __init__(
         self,
         root_path: Path,
         model_name: str = "claude-3-5-haiku-20241022",
         api_key: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[CacheBackend] = None,
+        cache_ttl: Optional[float] = None,
     ):
         self.root_path = root_path
-        self.llm_generator = LLMDocumentationGenerator(
-            model_name=model_name, api_key=api_key
+        self.model_name = model_name
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self._tree: Optional[Dict[Path, Tuple[List[str], List[str]]]] = None
+        self._tree_lock = threading.Lock()
+        self._project_context: Optional[str] = None
+        self._context_task: Optional[asyncio.Future] = None
+        self._api_key = api_key
+        self._http_client = http_client
+
+    # The model and agents are only needed once an LLM call is made, so
+    # file-only uses (structure, entry points, project files) never build them
+
+    @functools.cached_property
+    def llm_generator(self) -> LLMDocumentationGenerator:
+        """LLM wrapper whose model both agents share."""
+        return LLMDocumentationGenerator(
+            model_name=self.model_name, api_key=self._api_key, http_client=self._http_client
         )
 
-        # Agent specifically for exploration planning
-        from pydantic_ai import Agent
-        from pydantic_ai.models.anthropic import AnthropicModel
+    @functools.cached_property
+    def exploration_agent(self):
+        """Agent specifically for exploration planning."""
+        return self._agents[0]
 
-        if model_name.startswith("gpt"):
-            from pydantic_ai.models.openai import OpenAIModel
+    @functools.cached_property
+    def insight_agent(self):
+        """Agent for project purpose and architecture insights."""
+        return self._agents[1]
 
-            model = OpenAIModel(model_name)
-        else:
-            model = AnthropicModel(model_name)
+    @functools.cached_property
+    def _agents(self) -> Tuple[Any, Any]:
+        """Exploration and insight agents, shared by analyzers with the same model.
 
-        self.exploration_agent = Agent(
-            model=model,
+        Building an agent derives the JSON schema of its output model, so
+        analyzing many projects in one process builds each pair only once.
+        """
+        key = (self.model_name, self._api_key)
+        agents = self._agent_cache.get(key)
+        if agents is None:
+            agents = self._agent_cache.setdefault(key, self._build_agents())
+        return agents
+
+    def _build_agents(self) -> Tuple[Any, Any]:
+        """Build the exploration and insight agents; the model is given per run."""
+        from pydantic_ai import Agent
+
+        exploration_agent = Agent(
             output_type=ExplorationPlan,
             instructions="""
             You are an expert code archaeologist. Your job is to intelligently explore a codebase 
@@ -76,9 +250,7 @@ class IntelligentCodebaseAnalyzer:
             Focus on the actual project code that implements the main functionality.
             """,
         )
-
-        self.insight_agent = Agent(
-            model=model,
+        insight_agent = Agent(
             output_type=ProjectInsight,
             instructions="""
             You are a technical writer analyzing a software project. Provide insights about:
@@ -90,6 +262,15 @@ class IntelligentCodebaseAnalyzer:
             Be concise but comprehensive in your analysis.
             """,
         )
+        return exploration_agent, insight_agent
+
+    async def run_full_analysis(self) -> Tuple[ExplorationPlan, ProjectInsight]:
+        """Run the exploration and insight agents concurrently on one context read."""
+        await self._gather_project_context()
+        plan, insights = await asyncio.gather(
+            self.create_exploration_plan(), self.analyze_project_insights()
+        )
+        return plan, insights
 
     async def create_exploration_plan(self) -> ExplorationPlan:
         """Create an AI-powered exploration plan for the codebase."""
@@ -111,8 +292,9 @@ class IntelligentCodebaseAnalyzer:
         5. Exploration priorities (what to analyze first)
         """
 
-        result = await self.exploration_agent.run(prompt)
-        return result.output
+        return await self._run_agent(
+            self.exploration_agent, ExplorationPlan, "exploration-plan", prompt
+        )
 
     async def analyze_project_insights(self) -> ProjectInsight:
         """Get AI insights about the project's purpose and architecture."""
@@ -131,162 +313,218 @@ class IntelligentCodebaseAnalyzer:
         - How is it architected?
         """
 
-        result = await self.insight_agent.run(prompt)
-        return result.output
+        return await self._run_agent(
+            self.insight_agent, ProjectInsight, "project-insights", prompt
+        )
+
+    async def _run_agent(
+        self, agent, output_type: Type[BaseModel], command: str, prompt: str
+    ) -> BaseModel:
+        """Run an agent, reusing its cached output for an identical prompt.
+
+        The prompt embeds the whole project context, so any change to the
+        files it summarizes produces a new key.
+        """
+        key = make_key({"command": command, "model": self.model_name, "prompt": prompt})
+
+        async def run():
+            result = await agent.run(prompt, model=self.llm_generator.model)
+            return result.output
+
+        output, cache_hit = await get_or_compute(
+            self.cache,
+            key,
+            run,
+            dump=lambda output: output.model_dump(mode="json"),
+            load=output_type.model_validate,
+            expire=self.cache_ttl,
+        )
+        if cache_hit:
+            print(f"♻️  Reusing cached {command.replace('-', ' ')}.")
+        return output
 
     async def _gather_project_context(self) -> str:
-        """Gather key information about the project for AI analysis."""
+        """Gather key information about the project for AI analysis.
+
+        Both agents need the same context, often at the same time, so one
+        read is shared by concurrent callers and kept for later calls.
+        """
+        if self._project_context is not None:
+            return self._project_context
+
+        if self._context_task is None:
+            self._context_task = asyncio.ensure_future(self._read_project_context())
+        task = self._context_task
+        try:
+            # A cancelled caller must not cancel the read other callers await
+            self._project_context = await asyncio.shield(task)
+        finally:
+            if task.done():
+                # Failed reads are retried by the next caller
+                self._context_task = None
+        return self._project_context
+
+    async def _read_project_context(self) -> str:
+        """Read README, docs, structure, entry points and config."""
+        # File reads block, so each source runs in its own worker thread and
+        # the reads overlap instead of queuing behind one another
+        (
+            readme_content,
+            docs_content,
+            structure,
+            entry_points,
+            config_info,
+        ) = await asyncio.gather(
+            asyncio.to_thread(self._read_readme),
+            asyncio.to_thread(self._read_existing_docs),
+            asyncio.to_thread(self._analyze_directory_structure),
+            asyncio.to_thread(self._find_entry_points),
+            asyncio.to_thread(self._analyze_config_files),
+        )
         context_parts = []
 
         # Check for README files
-        readme_content = self._read_readme()
         if readme_content:
-            context_parts.append(f"README Content:\n{readme_content[:2000]}...")
+            context_parts.append(f"README Content:\n{readme_content.strip()}")
 
         # Check for existing documentation
-        docs_content = self._read_existing_docs()
         if docs_content:
-            context_parts.append(f"Existing Documentation:\n{docs_content[:1000]}...")
+            context_parts.append(
+                f"Existing Documentation:\n{docs_content[:_DOCS_PREVIEW_CHARS].strip()}"
+            )
 
         # Analyze directory structure
-        structure = self._analyze_directory_structure()
         context_parts.append(f"Directory Structure:\n{structure}")
 
         # Check for entry points
-        entry_points = self._find_entry_points()
         if entry_points:
-            context_parts.append(
-                f"Entry Points:\n{chr(10).join([str(ep) for ep in entry_points])}"
+            # Relative and sorted, so the prompt doesn't depend on where the
+            # checkout lives and repeated runs can share cached responses
+            entry_point_lines = "\n".join(
+                sorted(os.path.relpath(path, self.root_path) for path in entry_points)
             )
+            context_parts.append(f"Entry Points:\n{entry_point_lines}")
 
         # Check configuration files
-        config_info = self._analyze_config_files()
         if config_info:
-            context_parts.append(f"Configuration:\n{config_info}")
+            context_parts.append(f"Configuration:\n{config_info.strip()}")
 
-        return "\n\n".join(context_parts)
+        return "\n\n".join(context_parts)[:_MAX_CONTEXT_CHARS]
 
     def _read_readme(self) -> Optional[str]:
-        """Read README file if it exists."""
-        readme_patterns = ["README.md", "README.rst", "README.txt", "README"]
-
-        for pattern in readme_patterns:
+        """Read the start of the README file if it exists."""
+        for pattern in _README_NAMES:
             readme_path = self.root_path / pattern
-            if readme_path.exists():
-                try:
-                    with open(readme_path, "r", encoding="utf-8") as f:
-                        return f.read()
-                except Exception:
-                    continue
+            # Most names are missing; check without raising for each one
+            if not os.access(readme_path, os.R_OK):
+                continue
+            try:
+                with open(readme_path, "r", encoding="utf-8", errors="replace") as f:
+                    # Only this much ends up in the prompt context
+                    return f.read(_README_PREVIEW_CHARS)
+            except OSError:
+                continue
         return None
 
     def _read_existing_docs(self) -> Optional[str]:
         """Read existing documentation files."""
         docs_content = []
 
-        # Look for docs directory
-        docs_dir = self.root_path / "docs"
-        if docs_dir.exists():
-            for doc_file in docs_dir.rglob("*.md"):
-                try:
-                    with open(doc_file, "r", encoding="utf-8") as f:
-                        content = f.read()[:500]  # First 500 chars
-                        docs_content.append(f"{doc_file.name}: {content}")
-                except Exception:
-                    continue
-
-        # Look for other documentation files
-        for doc_file in self.root_path.glob("*.md"):
-            if doc_file.name.upper().startswith("README"):
-                continue  # Already handled
+        # The context keeps only the start of the joined previews, so stop
+        # reading once that much text is collected; the join's newlines count
+        joined_length = -1
+        for doc_file, preview_chars in self._iter_doc_files():
+            if joined_length >= _DOCS_PREVIEW_CHARS:
+                break
             try:
-                with open(doc_file, "r", encoding="utf-8") as f:
-                    content = f.read()[:300]
-                    docs_content.append(f"{doc_file.name}: {content}")
-            except Exception:
+                with open(doc_file, "r", encoding="utf-8", errors="replace") as f:
+                    content = f.read(preview_chars)
+            except OSError:
                 continue
+            entry = f"{doc_file.name}: {content}"
+            docs_content.append(entry)
+            joined_length += len(entry) + 1
 
         return "\n".join(docs_content) if docs_content else None
 
+    def _iter_doc_files(self) -> Iterator[Tuple[Path, int]]:
+        """Yield markdown docs with how many characters of each to preview."""
+        tree = self._walk_project()
+
+        # Look for docs directory, listed by the cached walk
+        docs_dir = self.root_path / "docs"
+        for directory, (_, file_names) in tree.items():
+            if directory != docs_dir and docs_dir not in directory.parents:
+                continue
+            for name in file_names:
+                if name.endswith(".md"):
+                    yield directory / name, 500  # First 500 chars
+
+        # Look for other documentation files
+        _, root_files = tree.get(self.root_path, ([], []))
+        for name in root_files:
+            if not name.endswith(".md") or name.upper().startswith("README"):
+                continue  # README is already handled
+            yield self.root_path / name, 300
+
+    def _walk_project(self) -> Dict[Path, Tuple[List[str], List[str]]]:
+        """Map each project directory to its sorted subdirectory and file names.
+
+        The tree is walked once with os.walk, pruning skipped directories
+        before descending into them, and cached for every later lookup.
+        """
+        # Structure and entry point lookups may ask from two threads at once
+        with self._tree_lock:
+            if self._tree is None:
+                self._tree = self._build_tree()
+            return self._tree
+
+    def _build_tree(self) -> Dict[Path, Tuple[List[str], List[str]]]:
+        """Run the pruned os.walk behind _walk_project."""
+        tree = {}
+        root = os.fspath(self.root_path)
+        root_depth = root.rstrip(os.sep).count(os.sep)
+        for dirpath, dirnames, filenames in os.walk(root):
+            subdirs = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+            tree[Path(dirpath)] = (subdirs, sorted(filenames))
+
+            # Record the deepest level's children, but don't descend further
+            depth = 0 if dirpath == root else dirpath.count(os.sep) - root_depth
+            dirnames[:] = subdirs if depth < _MAX_WALK_DEPTH else []
+
+        return tree
+
     def _analyze_directory_structure(self) -> str:
         """Analyze the project directory structure, focusing on project files."""
         structure_lines = []
 
-        def is_project_directory(path: Path) -> bool:
-            """Check if a directory contains project code."""
-            path_str = str(path)
-
-            # Skip common non-project directories
-            skip_dirs = {
-                ".venv",
-                "venv",
-                "env",
-                "__pycache__",
-                ".git",
-                ".pytest_cache",
-                "node_modules",
-                ".tox",
-                ".mypy_cache",
-                "build",
-                "dist",
-                ".coverage",
-                ".env",
-                ".vscode",
-                ".idea",
-                ".DS_Store",
-                "site-packages",
-                "dist-packages",
-            }
-
-            # Check if any part of the path is a skip directory
-            for part in path.parts:
-                if part in skip_dirs:
-                    return False
-
-            # Skip paths that look like installed packages
-            try:
-                relative_path = path.relative_to(self.root_path)
-                if len(relative_path.parts) > 3:  # Too deep, likely dependencies
-                    return False
-
-                # Skip if path contains version numbers (likely installed packages)
-                for part in relative_path.parts:
-                    if any(char.isdigit() for char in part) and (
-                        "-" in part or "." in part
-                    ):
-                        if not any(
-                            keyword in part.lower()
-                            for keyword in ["test", "src", "lib"]
-                        ):
-                            return False
-            except ValueError:
-                return False
-
-            return True
+        tree = self._walk_project()
 
         def add_directory(path: Path, level: int = 0):
             if level > 3:  # Limit depth
                 return
 
-            if not is_project_directory(path):
+            # Skipped directories were pruned from the walk. Ancestors were
+            # already checked on the way down, so only this name is tested
+            if path not in tree or (level and _LOOKS_INSTALLED(path.name)):
                 return
 
-            indent = "  " * level
+            indent = _INDENTS[level]
             structure_lines.append(f"{indent}{path.name}/")
 
             # Add important files in this directory
-            important_files = []
-            for file_path in path.iterdir():
-                if file_path.is_file():
-                    if self._is_important_file(file_path):
-                        important_files.append(file_path.name)
+            subdirs, file_names = tree[path]
+            important_files = [
+                name for name in file_names if self._is_important_file(path / name)
+            ]
 
-            for file_name in sorted(important_files)[:5]:  # Max 5 files per directory
-                structure_lines.append(f"{indent}  {file_name}")
+            file_indent = _INDENTS[level + 1]
+            for file_name in important_files[:5]:  # Max 5 files per directory
+                structure_lines.append(file_indent + file_name)
 
             # Recurse into subdirectories
-            for subdir in sorted([d for d in path.iterdir() if d.is_dir()]):
-                add_directory(subdir, level + 1)
+            for subdir in subdirs:
+                add_directory(path / subdir, level + 1)
 
         add_directory(self.root_path)
         return "\n".join(structure_lines)
@@ -295,50 +533,12 @@ class IntelligentCodebaseAnalyzer:
         """Check if a file is important for understanding the project."""
         name = file_path.name.lower()
 
-        # Important file patterns
-        important_patterns = [
-            # Python files
-            "main.py",
-            "__main__.py",
-            "__init__.py",
-            "cli.py",
-            "app.py",
-            # Configuration
-            "setup.py",
-            "pyproject.toml",
-            "requirements.txt",
-            "Pipfile",
-            "package.json",
-            "go.mod",
-            "Cargo.toml",
-            # Documentation
-            "readme",
-            "changelog",
-            "license",
-            "contributing",
-            # Other important files
-            "dockerfile",
-            "makefile",
-            ".gitignore",
-        ]
-
         # Check exact matches or startswith
-        for pattern in important_patterns:
-            if name == pattern or name.startswith(pattern):
-                return True
+        if name in _IMPORTANT_NAMES or name.startswith(_IMPORTANT_PREFIXES):
+            return True
 
         # Check extensions
-        important_extensions = {
-            ".py",
-            ".go",
-            ".js",
-            ".ts",
-            ".rs",
-            ".java",
-            ".cpp",
-            ".c",
-        }
-        if file_path.suffix.lower() in important_extensions:
+        if file_path.suffix.lower() in _IMPORTANT_EXTENSIONS:
             # Only include if it's likely project code (not in deep nested dirs)
             try:
                 relative_path = file_path.relative_to(self.root_path)
@@ -352,145 +552,90 @@ class IntelligentCodebaseAnalyzer:
         """Find potential entry points to the application."""
         entry_points = []
 
-        # Common entry point files
-        entry_patterns = [
-            "main.py",
-            "app.py",
-            "__main__.py",
-            "cli.py",
-            "server.py",
-            "run.py",
-            "start.py",
-        ]
-
-        for pattern in entry_patterns:
-            for match in self.root_path.rglob(pattern):
-                # Only include if it's in a reasonable location (not too deep)
-                try:
-                    relative_path = match.relative_to(self.root_path)
-                    if len(relative_path.parts) <= 3:
-                        entry_points.append(match)
-                except ValueError:
-                    continue
+        for directory, (_, file_names) in self._walk_project().items():
+            # Only include files in a reasonable location (not too deep)
+            if len(directory.relative_to(self.root_path).parts) > 2:
+                continue
 
-        # Look for files with if __name__ == "__main__"
-        for py_file in self.root_path.rglob("*.py"):
-            try:
-                relative_path = py_file.relative_to(self.root_path)
-                if len(relative_path.parts) > 3:
+            for name in file_names:
+                if name in _ENTRY_POINT_NAMES:
+                    entry_points.append(directory / name)
+                    continue
+                if not name.endswith(".py"):
                     continue
 
-                with open(py_file, "r", encoding="utf-8") as f:
-                    content = f.read(1000)  # First 1000 chars
-                    if 'if __name__ == "__main__"' in content:
-                        entry_points.append(py_file)
-            except Exception:
-                continue
+                # Look for files with if __name__ == "__main__"; a raw byte
+                # search skips decoding, and the walk never yields a path twice.
+                # Unbuffered, the read is one syscall into an exact-size bytes
+                # object instead of filling an 8 KiB buffer first
+                try:
+                    with open(directory / name, "rb", buffering=0) as f:
+                        if _MAIN_GUARD in f.read(1000):  # First 1000 bytes
+                            entry_points.append(directory / name)
+                except OSError:
+                    continue
 
-        return list(set(entry_points))  # Remove duplicates
+        return entry_points
 
     def _analyze_config_files(self) -> Optional[str]:
         """Analyze configuration files to understand the project."""
         config_info = []
 
-        config_files = [
-            "pyproject.toml",
-            "setup.py",
-            "requirements.txt",
-            "package.json",
-            "go.mod",
-            "Cargo.toml",
-            ".doctr.toml",
-        ]
-
-        for config_file in config_files:
+        for config_file in _CONFIG_FILES:
             config_path = self.root_path / config_file
-            if config_path.exists():
+            if os.access(config_path, os.R_OK):
                 try:
-                    with open(config_path, "r", encoding="utf-8") as f:
+                    with open(config_path, "r", encoding="utf-8", errors="replace") as f:
                         content = f.read(500)  # First 500 chars
                         config_info.append(f"{config_file}:\n{content}")
-                except Exception:
+                except OSError:
                     continue
 
         return "\n\n".join(config_info) if config_info else None
 
     async def get_project_files(self) -> List[ProjectFile]:
         """Get a curated list of important project files with AI scoring."""
-        files = []
-
-        for file_path in self.root_path.rglob("*"):
-            if not file_path.is_file():
-                continue
+        return await asyncio.to_thread(self._collect_project_files)
+
+    def _collect_project_files(self) -> List[ProjectFile]:
+        """Walk the tree and score important files synchronously."""
+        # Keep the top files in a bounded heap rather than sorting every
+        # candidate, so only that many previews stay alive at once
+        return heapq.nlargest(
+            _MAX_PROJECT_FILES,
+            self._iter_scored_files(),
+            key=operator.attrgetter("importance_score"),
+        )
 
+    def _iter_scored_files(self) -> Iterator[ProjectFile]:
+        """Yield each important project file with its preview and score."""
+        for file_path in self._iter_project_files():
             if not self._is_important_file(file_path):
                 continue
 
-            # Skip files in directories we should ignore
-            if not self._is_project_directory_for_file(file_path):
-                continue
-
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
+                # A stray non-UTF-8 byte shouldn't drop the file from the list
+                with open(file_path, "r", encoding="utf-8", errors="replace") as f:
                     content_preview = f.read(500)
 
                 # AI would score importance here, for now use simple heuristic
                 importance = self._score_file_importance(file_path, content_preview)
 
-                files.append(
-                    ProjectFile(
-                        path=file_path,
-                        content_preview=content_preview,
-                        file_type=file_path.suffix,
-                        importance_score=importance,
-                    )
-                )
-
-            except Exception:
+            except OSError:
                 continue
 
-        # Sort by importance and return top files
-        return sorted(files, key=lambda x: x.importance_score, reverse=True)[:50]
-
-    def _is_project_directory_for_file(self, file_path: Path) -> bool:
-        """Check if file is in a project directory."""
-        try:
-            relative_path = file_path.relative_to(self.root_path)
-            path_parts = relative_path.parts[:-1]  # Exclude filename
-
-            # Check each directory component
-            for part in path_parts:
-                skip_dirs = {
-                    ".venv",
-                    "venv",
-                    "env",
-                    "__pycache__",
-                    ".git",
-                    ".pytest_cache",
-                    "node_modules",
-                    ".tox",
-                    ".mypy_cache",
-                    "build",
-                    "dist",
-                    ".coverage",
-                    ".env",
-                    ".vscode",
-                    ".idea",
-                    "site-packages",
-                    "dist-packages",
-                }
-
-                if part in skip_dirs:
-                    return False
-
-            # Don't go too deep
-            if len(path_parts) > 4:
-                return False
-
-            return True
+            yield ProjectFile(
+                path=file_path,
+                content_preview=content_preview,
+                file_type=file_path.suffix,
+                importance_score=importance,
+            )
 
-        except ValueError:
-            return False
+    def _iter_project_files(self) -> Iterator[Path]:
+        """Yield every file outside skipped directories, at most 4 levels down."""
+        for directory, (_, file_names) in self._walk_project().items():
+            for name in file_names:
+                yield directory / name
 
     def _score_file_importance(self, file_path: Path, content_preview: str) -> int:
         """Score file importance (1-10)."""
@@ -499,10 +644,9 @@ class IntelligentCodebaseAnalyzer:
         name = file_path.name.lower()
 
         # High importance files
-        if name in ["main.py", "__main__.py", "app.py", "cli.py"]:
-            score += 3
-        elif name in ["__init__.py", "setup.py", "pyproject.toml"]:
-            score += 2
+        name_score = _NAME_SCORES.get(name)
+        if name_score is not None:
+            score += name_score
         elif "readme" in name or "license" in name:
             score += 2
 
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import time
+import zlib
+from dataclasses import asdict, is_dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+CACHE_DIR_NAME = ".doctr-cache"
+CACHE_VERSION = 1
+
+EMBEDDING_DIM = 512
+SEMANTIC_INDEX_SIZE = 64
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Directories that never influence generated documentation
+_FINGERPRINT_SKIP_DIRS = {
+    ".git",
+    CACHE_DIR_NAME,
+    "__pycache__",
+    ".venv",
+    "venv",
+    "node_modules",
+    ".pytest_cache",
+    ".mypy_cache",
+    ".tox",
+}
+
+
+class CacheBackend(Protocol):
+    """Storage interface for cached LLM responses."""
+
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> None: ...
+
+
+class MemoryCache:
+    """Process-local cache backend."""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.time():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        expires_at = time.time() + expire if expire else None
+        self._entries[key] = (value, expires_at)
+
+
+class DiskCache:
+    """SQLite-backed cache backend persisted under the repository.
+
+    The directory ignores itself for Git, like .pytest_cache, so the
+    database never shows up as an untracked file in the user's repository.
+    """
+
+    def __init__(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        gitignore = directory / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("# Created by doctr\n*\n")
+        self.path = directory / "llm.sqlite3"
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn.execute(
+            "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        return _loads(value)
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        expires_at = time.time() + expire if expire else None
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, _dumps(value), expires_at),
+        )
+        self._conn.commit()
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the non-JSON types found in doc models."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, Path):
+        return str(obj)
+    return str(obj)
+
+
+def _dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Encode obj as compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        return orjson.dumps(obj, default=_json_default, option=option)
+    return json.dumps(
+        obj,
+        sort_keys=sort_keys,
+        default=_json_default,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def _loads(data: Any) -> Any:
+    """Decode JSON produced by _dumps (or older str entries)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def make_key(payload: Any) -> str:
+    """Build a stable cache key from a JSON-serializable payload."""
+    data = {"v": CACHE_VERSION, "payload": payload}
+    return hashlib.sha256(_dumps(data, sort_keys=True)).hexdigest()
+
+
+def fingerprint_tree(root: Path, exclude: Iterable[Path] = ()) -> str:
+    """Hash the paths, sizes and mtimes of every file under root."""
+    excluded = {os.path.abspath(p) for p in exclude}
+    digest = hashlib.sha256()
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d
+            for d in dirnames
+            if d not in _FINGERPRINT_SKIP_DIRS
+            and os.path.abspath(os.path.join(dirpath, d)) not in excluded
+        )
+        for filename in sorted(filenames):
+            file_path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            rel_path = os.path.relpath(file_path, root)
+            digest.update(f"{rel_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+
+    return digest.hexdigest()
+
+
+def embed_text(text: str) -> List[float]:
+    """Embed text as an L2-normalized hashed bag-of-words vector."""
+    vector = [0.0] * EMBEDDING_DIM
+    for token in _TOKEN_RE.findall(text.lower()):
+        vector[zlib.crc32(token.encode("utf-8")) % EMBEDDING_DIM] += 1.0
+
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm:
+        vector = [v / norm for v in vector]
+    return vector
+
+
+class SemanticIndex:
+    """Nearest-neighbour lookup over recently cached inputs.
+
+    The index is stored as a single entry in the cache backend so it works
+    with any backend; it keeps the most recent SEMANTIC_INDEX_SIZE items.
+    """
+
+    def __init__(self, cache: CacheBackend, namespace: str):
+        self.cache = cache
+        self.index_key = f"semantic-index:{namespace}"
+
+    def _entries(self) -> List[Dict[str, Any]]:
+        return self.cache.get(self.index_key) or []
+
+    def lookup(self, vector: List[float]) -> Tuple[Optional[str], float]:
+        """Return the key of the most similar entry and its cosine similarity."""
+        best_key, best_score = None, 0.0
+        for entry in self._entries():
+            score = sum(a * b for a, b in zip(vector, entry["vector"]))
+            if score > best_score:
+                best_key, best_score = entry["key"], score
+        return best_key, best_score
+
+    def add(self, key: str, vector: List[float]) -> None:
+        entries = [e for e in self._entries() if e["key"] != key]
+        entries.append({"key": key, "vector": vector})
+        self.cache.set(self.index_key, entries[-SEMANTIC_INDEX_SIZE:])
+
+
+def create_cache(backend: str, repo_path: Path) -> Optional[CacheBackend]:
+    """Create the cache backend named in the configuration."""
+    if backend == "disk":
+        return DiskCache(repo_path / CACHE_DIR_NAME)
+    if backend == "memory":
+        return MemoryCache()
+    return None
+
+
+async def get_or_compute(
+    cache: Optional[CacheBackend],
+    key: str,
+    coro_factory: Callable[[], Awaitable[Any]],
+    dump: Callable[[Any], Any] = lambda value: value,
+    load: Callable[[Any], Any] = lambda value: value,
+    expire: Optional[float] = None,
+) -> Tuple[Any, bool]:
+    """Return the cached value for key, computing and storing it on a miss.
+
+    Returns a ``(value, hit)`` tuple so callers can report cache usage.
+    """
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return load(cached), True
+
+    value = await coro_factory()
+
+    if cache is not None:
+        cache.set(key, dump(value), expire=expire)
+
+    return value, False
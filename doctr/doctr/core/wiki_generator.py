@@ -1,10 +1,29 @@
+import asyncio
+import contextlib
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass
+import httpx
+from pydantic_ai.exceptions import ModelHTTPError
 
 from .analyzer import ProjectStructure, ModuleInfo, FileInfo
 from .doc_model import GeneratedDoc
-from ..integrations.llm import LLMDocumentationGenerator
+from .llm_cache import CacheBackend, get_or_compute, make_key
+from ..integrations.llm import (
+    RETRYABLE_STATUS_CODES,
+    LLMDocumentationGenerator,
+    RateLimiter,
+    create_http_client,
+    retry_delay,
+)
+
+
+def _relative_path(path: Path, root: Path) -> Path:
+    """Path relative to the project root, so prompts don't depend on the checkout location."""
+    try:
+        return path.relative_to(root)
+    except ValueError:
+        return path
 
 
 @dataclass
@@ -15,134 +34,209 @@ class WikiPage:
     category: str  # 'overview', 'api', 'guide', 'reference'
 
 
+@dataclass(frozen=True)
+class _PageSpec:
+    """A project-level page: its identity, LLM instructions and basic fallback."""
+    title: str
+    filename: str
+    category: str
+    instructions: str
+    basic: str  # Name of the method rendering the page without AI
+
+
+# Project-level pages, keyed by content type
+_PAGE_SPECS: Dict[str, _PageSpec] = {
+    "home_page": _PageSpec(
+        title="Home",
+        filename="Home.md",
+        category="overview",
+        instructions="""Generate a comprehensive README/Home page for this project. Include:
+                - Project overview and purpose
+                - Key features and capabilities
+                - Quick installation/setup instructions
+                - Basic usage examples
+                - Links to detailed documentation sections
+                - Contributing guidelines
+                """,
+        basic="_generate_basic_home_page",
+    ),
+    "installation": _PageSpec(
+        title="Installation Guide",
+        filename="Installation.md",
+        category="guide",
+        instructions="""Generate a detailed installation guide including:
+                - System requirements
+                - Step-by-step installation instructions
+                - Development environment setup
+                - Troubleshooting common installation issues
+                - Dependencies and prerequisites
+                """,
+        basic="_generate_basic_installation_guide",
+    ),
+    "quickstart": _PageSpec(
+        title="Quick Start",
+        filename="Quick-Start.md",
+        category="guide",
+        instructions="""Generate a quickstart guide with:
+                - Basic usage examples
+                - Common use cases
+                - Step-by-step tutorials for main features
+                - Code examples and snippets
+                - Expected outputs
+                """,
+        basic="_generate_basic_quickstart_guide",
+    ),
+    "architecture": _PageSpec(
+        title="Architecture",
+        filename="Architecture.md",
+        category="reference",
+        instructions="""Generate an architecture overview including:
+                - Project structure and organization
+                - Key components and their relationships
+                - Design patterns and principles used
+                - Data flow and system interactions
+                - Extension points and customization options
+                """,
+        basic="_generate_basic_architecture_page",
+    ),
+    "development": _PageSpec(
+        title="Development Guide",
+        filename="Development.md",
+        category="guide",
+        instructions="""Generate a development guide including:
+                - Development environment setup
+                - Code organization and standards
+                - Building and testing procedures
+                - Contributing guidelines
+                - Release process
+                """,
+        basic="_generate_basic_development_guide",
+    ),
+}
+
+
 class WikiDocumentationGenerator:
-    """Generates comprehensive wiki-style documentation for entire projects."""
+    """Generates comprehensive wiki-style documentation for entire projects.
+
+    Without an ``http_client``, AI generation opens its own keep-alive client
+    for all page requests; use the generator as an async context manager, or
+    call ``aclose``, to release it.
+    """
 
     def __init__(
         self,
         use_ai: bool = True,
         model_name: str = "claude-3-5-haiku-20241022",
         api_key: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = 8,
+        rate_limit_per_min: Optional[float] = None,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+        use_batch_api: bool = False,
+        batch_poll_interval: float = 30.0,
+        cache: Optional[CacheBackend] = None,
+        cache_ttl: Optional[float] = None,
     ):
         self.use_ai = use_ai
+        self.model_name = model_name
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.use_batch_api = use_batch_api
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.batch_poll_interval = batch_poll_interval
+        # Only a client created here is ours to close
+        self._owned_http_client: Optional[httpx.AsyncClient] = None
         if use_ai:
+            if http_client is None:
+                http_client = self._owned_http_client = create_http_client()
             self.llm_generator = LLMDocumentationGenerator(
-                model_name=model_name, api_key=api_key
+                model_name=model_name, api_key=api_key, http_client=http_client
             )
+        # Bounds in-flight LLM requests to stay within provider rate limits
+        self._llm_semaphore = asyncio.Semaphore(max_concurrency)
+        # Keeps the request rate under the provider's per-minute limit
+        self._rate_limiter = (
+            RateLimiter(rate_limit_per_min) if rate_limit_per_min else contextlib.nullcontext()
+        )
+        # Prompts waiting to go out in the next provider batch
+        self._batch_queue: List[Tuple[str, asyncio.Future]] = []
+        self._batch_tasks: Set[asyncio.Task] = set()
+        # Shared project context for the structure it was last built from
+        self._base_context: Optional[Tuple[ProjectStructure, str]] = None
+        # File names of that structure's modules, keyed by module identity
+        self._module_file_names: Dict[int, List[str]] = {}
 
-    async def generate_wiki(
-        self, project_structure: ProjectStructure
-    ) -> List[WikiPage]:
-        """Generate a complete wiki documentation for the project."""
-        pages = []
+    async def __aenter__(self) -> "WikiDocumentationGenerator":
+        return self
 
-        # Generate overview pages
-        pages.append(await self._generate_home_page(project_structure))
-        pages.append(await self._generate_installation_guide(project_structure))
-        pages.append(await self._generate_quickstart_guide(project_structure))
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
-        # Generate API documentation
-        for module in project_structure.modules:
-            api_page = await self._generate_api_reference(module, project_structure)
-            pages.append(api_page)
+    async def aclose(self) -> None:
+        """Close the HTTP client this generator opened, if any."""
+        if self._owned_http_client is not None:
+            await self._owned_http_client.aclose()
 
-        # Generate architecture overview
-        pages.append(await self._generate_architecture_page(project_structure))
-
-        # Generate development guide
-        pages.append(await self._generate_development_guide(project_structure))
+    async def generate_wiki(
+        self, project_structure: ProjectStructure
+    ) -> List[WikiPage]:
+        """Generate a complete wiki documentation for the project.
+
+        Pages are independent, so they are generated concurrently and
+        returned in the usual wiki order.
+        """
+        page_coros = [
+            # Generate overview pages
+            self._generate_page("home_page", project_structure),
+            self._generate_page("installation", project_structure),
+            self._generate_page("quickstart", project_structure),
+            # Generate API documentation
+            *(
+                self._generate_api_reference(module, project_structure)
+                for module in project_structure.modules
+            ),
+            # Generate architecture overview
+            self._generate_page("architecture", project_structure),
+            # Generate development guide
+            self._generate_page("development", project_structure),
+        ]
 
         # Generate configuration guide
         if project_structure.config_files:
-            pages.append(await self._generate_configuration_guide(project_structure))
+            page_coros.append(self._generate_configuration_guide(project_structure))
 
         # Generate testing guide
         if project_structure.test_directories:
-            pages.append(await self._generate_testing_guide(project_structure))
-
-        return pages
+            page_coros.append(self._generate_testing_guide(project_structure))
 
-    async def _generate_home_page(
-        self, project_structure: ProjectStructure
-    ) -> WikiPage:
-        """Generate the main README/Home page."""
-        if self.use_ai:
-            content = await self._generate_ai_content(
-                "home_page",
-                project_structure,
-                """Generate a comprehensive README/Home page for this project. Include:
-                - Project overview and purpose
-                - Key features and capabilities
-                - Quick installation/setup instructions
-                - Basic usage examples
-                - Links to detailed documentation sections
-                - Contributing guidelines
-                """,
-            )
-        else:
-            content = self._generate_basic_home_page(project_structure)
-
-        return WikiPage(
-            title="Home", filename="Home.md", content=content, category="overview"
-        )
+        return list(await asyncio.gather(*page_coros))
 
-    async def _generate_installation_guide(
-        self, project_structure: ProjectStructure
+    async def _generate_page(
+        self, content_type: str, project_structure: ProjectStructure
     ) -> WikiPage:
-        """Generate detailed installation and setup guide."""
-        if self.use_ai:
+        """Generate one of the project-level pages described in _PAGE_SPECS."""
+        spec = _PAGE_SPECS[content_type]
+        if self.use_ai and self._should_render_with_llm(project_structure):
             content = await self._generate_ai_content(
-                "installation",
-                project_structure,
-                """Generate a detailed installation guide including:
-                - System requirements
-                - Step-by-step installation instructions
-                - Development environment setup
-                - Troubleshooting common installation issues
-                - Dependencies and prerequisites
-                """,
+                content_type, project_structure, spec.instructions
             )
         else:
-            content = self._generate_basic_installation_guide(project_structure)
+            content = getattr(self, spec.basic)(project_structure)
 
         return WikiPage(
-            title="Installation Guide",
-            filename="Installation.md",
+            title=spec.title,
+            filename=spec.filename,
             content=content,
-            category="guide",
-        )
-
-    async def _generate_quickstart_guide(
-        self, project_structure: ProjectStructure
-    ) -> WikiPage:
-        """Generate a quickstart/getting started guide."""
-        if self.use_ai:
-            content = await self._generate_ai_content(
-                "quickstart",
-                project_structure,
-                """Generate a quickstart guide with:
-                - Basic usage examples
-                - Common use cases
-                - Step-by-step tutorials for main features
-                - Code examples and snippets
-                - Expected outputs
-                """,
-            )
-        else:
-            content = self._generate_basic_quickstart_guide(project_structure)
-
-        return WikiPage(
-            title="Quick Start",
-            filename="Quick-Start.md",
-            content=content,
-            category="guide",
+            category=spec.category,
         )
 
     async def _generate_api_reference(
         self, module: ModuleInfo, project_structure: ProjectStructure
     ) -> WikiPage:
         """Generate API reference for a specific module."""
-        if self.use_ai:
+        if self.use_ai and self._should_render_with_llm(project_structure, module):
             content = await self._generate_ai_content(
                 "api_reference",
                 project_structure,
@@ -154,9 +248,9 @@ class WikiDocumentationGenerator:
                 - Error handling information
                 
                 Module details:
-                - Path: {module.path}
+                - Path: {_relative_path(module.path, project_structure.root_path)}
                 - Public API: {module.public_api}
-                - Files: {[f.path.name for f in module.files]}
+                - Files: {self._file_names(module, project_structure)}
                 """,
                 module,
             )
@@ -170,85 +264,50 @@ class WikiDocumentationGenerator:
             category="api",
         )
 
-    async def _generate_architecture_page(
-        self, project_structure: ProjectStructure
-    ) -> WikiPage:
-        """Generate architecture and design overview."""
-        if self.use_ai:
-            content = await self._generate_ai_content(
-                "architecture",
-                project_structure,
-                """Generate an architecture overview including:
-                - Project structure and organization
-                - Key components and their relationships
-                - Design patterns and principles used
-                - Data flow and system interactions
-                - Extension points and customization options
-                """,
-            )
-        else:
-            content = self._generate_basic_architecture_page(project_structure)
-
-        return WikiPage(
-            title="Architecture",
-            filename="Architecture.md",
-            content=content,
-            category="reference",
-        )
-
-    async def _generate_development_guide(
-        self, project_structure: ProjectStructure
-    ) -> WikiPage:
-        """Generate development and contributing guide."""
-        if self.use_ai:
-            content = await self._generate_ai_content(
-                "development",
-                project_structure,
-                """Generate a development guide including:
-                - Development environment setup
-                - Code organization and standards
-                - Building and testing procedures
-                - Contributing guidelines
-                - Release process
-                """,
+    def _should_render_with_llm(
+        self, project_structure: ProjectStructure, module: Optional[ModuleInfo] = None
+    ) -> bool:
+        """Whether a page has enough material to be worth an LLM call.
+
+        A project without modules or entry points, or a module that defines
+        nothing, gets the basic page directly instead of a costly description
+        of nothing.
+        """
+        if not (project_structure.modules or project_structure.entry_points):
+            return False
+        if module is not None:
+            return bool(module.public_api) or any(
+                file_info.functions or file_info.classes for file_info in module.files
             )
-        else:
-            content = self._generate_basic_development_guide(project_structure)
-
-        return WikiPage(
-            title="Development Guide",
-            filename="Development.md",
-            content=content,
-            category="guide",
-        )
+        return True
 
     async def _generate_configuration_guide(
         self, project_structure: ProjectStructure
     ) -> WikiPage:
         """Generate configuration reference."""
-        content = f"""# Configuration Guide
+        parts = [f"""# Configuration Guide
 
 This project uses several configuration files:
 
 ## Configuration Files
 
-"""
+"""]
 
         for config_file in project_structure.config_files:
-            content += f"### {config_file.name}\n"
-            content += f"Location: `{config_file}`\n\n"
+            parts.append(f"### {config_file.name}\n")
+            parts.append(f"Location: `{config_file}`\n\n")
 
             if config_file.name.endswith(".toml"):
-                content += "TOML configuration file.\n\n"
+                parts.append("TOML configuration file.\n\n")
             elif config_file.name.endswith((".yaml", ".yml")):
-                content += "YAML configuration file.\n\n"
+                parts.append("YAML configuration file.\n\n")
             elif config_file.name == "requirements.txt":
-                content += "Python dependencies.\n\n"
+                parts.append("Python dependencies.\n\n")
 
         return WikiPage(
             title="Configuration",
             filename="Configuration.md",
-            content=content,
+            content="".join(parts),
             category="reference",
         )
 
@@ -256,25 +315,25 @@ This project uses several configuration files:
         self, project_structure: ProjectStructure
     ) -> WikiPage:
         """Generate testing guide."""
-        content = f"""# Testing Guide
+        parts = [f"""# Testing Guide
 
 ## Test Structure
 
 This project includes tests in the following locations:
 
-"""
+"""]
 
         for test_dir in project_structure.test_directories:
-            content += f"- `{test_dir}`\n"
+            parts.append(f"- `{test_dir}`\n")
 
-        content += """
+        parts.append("""
 
 ## Running Tests
 
-"""
+""")
 
         if project_structure.main_language == "python":
-            content += """
+            parts.append("""
 ### Python Tests
 
 ```bash
@@ -287,9 +346,9 @@ pytest
 # Run specific test file
 python -m unittest tests.test_module
 ```
-"""
+""")
         elif project_structure.main_language == "go":
-            content += """
+            parts.append("""
 ### Go Tests
 
 ```bash
@@ -302,12 +361,12 @@ go test -cover ./...
 # Run specific package tests
 go test ./pkg/module
 ```
-"""
+""")
 
         return WikiPage(
             title="Testing Guide",
             filename="Testing.md",
-            content=content,
+            content="".join(parts),
             category="guide",
         )
 
@@ -321,7 +380,39 @@ go test ./pkg/module
         """Generate AI-enhanced content for documentation."""
         try:
             # Prepare context about the project
-            context = f"""
+            context_parts = [self._project_context(project_structure)]
+
+            if module:
+                context_parts.append("\n\nFocus Module Details:\n")
+                for file_info in module.files:
+                    context_parts.append(f"\n- File: {file_info.path.name}")
+                    context_parts.append(f"\n  Functions: {file_info.functions}")
+                    context_parts.append(f"\n  Classes: {file_info.classes}")
+                    if file_info.docstring:
+                        context_parts.append(f"\n  Docstring: {file_info.docstring[:200]}...")
+
+            context = "".join(context_parts)
+
+            # The project context is the same for every page, so it leads the
+            # prompt where provider prefix caches can reuse it across pages
+            prompt = f"{context}\n\n{instructions}"
+
+            return await self._cached_run(prompt)
+
+        except Exception as e:
+            # Fallback to basic content if AI fails
+            return f"# {content_type.title().replace('_', ' ')}\n\nContent generation failed: {e}\n\nPlease update this documentation manually."
+
+    def _project_context(self, project_structure: ProjectStructure) -> str:
+        """Describe the project as a whole for page prompts.
+
+        Every page of a wiki shares this block, so it is built once per
+        project structure rather than once per page.
+        """
+        if self._base_context is not None and self._base_context[0] is project_structure:
+            return self._base_context[1]
+
+        context_parts = [f"""
 Project Analysis:
 - Type: {project_structure.project_type.value}
 - Main Language: {project_structure.main_language}
@@ -332,34 +423,97 @@ Project Analysis:
 - Dependencies: {project_structure.dependencies}
 
 Project Structure:
-"""
-
-            for module_info in project_structure.modules:
-                context += f"\n- Module: {module_info.name}"
-                context += f"\n  Files: {[f.path.name for f in module_info.files]}"
-                context += f"\n  Public API: {module_info.public_api}"
-
-            if module:
-                context += f"\n\nFocus Module Details:\n"
-                for file_info in module.files:
-                    context += f"\n- File: {file_info.path.name}"
-                    context += f"\n  Functions: {file_info.functions}"
-                    context += f"\n  Classes: {file_info.classes}"
-                    if file_info.docstring:
-                        context += f"\n  Docstring: {file_info.docstring[:200]}..."
-
-            prompt = f"{instructions}\n\n{context}"
-
-            result = await self.llm_generator.content_agent.run(prompt)
-            return result.output
+"""]
+
+        # The structure's modules stay alive while it is cached, so their ids
+        # can't be reused by other modules
+        self._module_file_names = {
+            id(module_info): [f.path.name for f in module_info.files]
+            for module_info in project_structure.modules
+        }
+        for module_info in project_structure.modules:
+            context_parts.append(f"\n- Module: {module_info.name}")
+            context_parts.append(f"\n  Files: {self._module_file_names[id(module_info)]}")
+            context_parts.append(f"\n  Public API: {module_info.public_api}")
+
+        context = "".join(context_parts)
+        self._base_context = (project_structure, context)
+        return context
+
+    def _file_names(self, module: ModuleInfo, project_structure: ProjectStructure) -> List[str]:
+        """File names of a module, listed once per project structure."""
+        self._project_context(project_structure)
+        names = self._module_file_names.get(id(module))
+        if names is None:
+            names = [f.path.name for f in module.files]
+        return names
+
+    async def _cached_run(self, prompt: str) -> str:
+        """Run a page prompt, reusing the response only for an identical prompt.
+
+        Any source edit changes the prompt and regenerates the page, so the
+        wiki never serves a page that lists stale APIs.
+        """
+        key = make_key({"command": "wiki-page", "model": self.model_name, "prompt": prompt})
+        content, _ = await get_or_compute(
+            self.cache, key, lambda: self._run_content_prompt(prompt), expire=self.cache_ttl
+        )
+        return content
 
-        except Exception as e:
-            # Fallback to basic content if AI fails
-            return f"# {content_type.title().replace('_', ' ')}\n\nContent generation failed: {e}\n\nPlease update this documentation manually."
+    async def _run_content_prompt(self, prompt: str) -> str:
+        """Run a prompt through the content agent or the next provider batch."""
+        if not self.use_batch_api:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async with self._llm_semaphore, self._rate_limiter:
+                        result = await self.llm_generator.content_agent.run(prompt)
+                    return result.output
+                except ModelHTTPError as e:
+                    if e.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                        raise
+                    # Back off outside the semaphore so other pages keep flowing
+                    await asyncio.sleep(retry_delay(e, attempt, self.retry_base_delay))
+
+        loop = asyncio.get_running_loop()
+        if not self._batch_queue:
+            # Every page coroutine started by the same gather queues its
+            # prompt before this callback runs, so they share one batch
+            loop.call_soon(self._flush_batch)
+        future = loop.create_future()
+        self._batch_queue.append((prompt, future))
+
+        output = await future
+        if output is None:
+            raise RuntimeError("the provider returned no result for this batch request")
+        return output
+
+    def _flush_batch(self) -> None:
+        """Send queued prompts as one batch and resolve their futures."""
+        queued, self._batch_queue = self._batch_queue, []
+        task = asyncio.ensure_future(
+            self.llm_generator.generate_many(
+                [prompt for prompt, _ in queued], self.batch_poll_interval
+            )
+        )
+        self._batch_tasks.add(task)
+
+        def deliver(task: asyncio.Task) -> None:
+            self._batch_tasks.discard(task)
+            for index, (_, future) in enumerate(queued):
+                if future.done():
+                    continue
+                if task.cancelled():
+                    future.cancel()
+                elif task.exception() is not None:
+                    future.set_exception(task.exception())
+                else:
+                    future.set_result(task.result()[index])
+
+        task.add_done_callback(deliver)
 
     def _generate_basic_home_page(self, project_structure: ProjectStructure) -> str:
         """Generate basic home page without AI."""
-        content = f"""# {project_structure.root_path.name}
+        parts = [f"""# {project_structure.root_path.name}
 
 ## Overview
 
@@ -367,12 +521,12 @@ This is a {project_structure.main_language} project with {len(project_structure.
 
 ## Project Structure
 
-"""
+"""]
 
         for module in project_structure.modules:
-            content += f"- **{module.name}**: {len(module.files)} files\n"
+            parts.append(f"- **{module.name}**: {len(module.files)} files\n")
 
-        content += """
+        parts.append("""
 ## Quick Start
 
 [Installation instructions and basic usage examples would go here]
@@ -383,9 +537,9 @@ This is a {project_structure.main_language} project with {len(project_structure.
 - [Quick Start Guide](Quick-Start.md)
 - [API Reference](API-Reference.md)
 - [Development Guide](Development.md)
-"""
+""")
 
-        return content
+        return "".join(parts)
 
     def _generate_basic_installation_guide(
         self, project_structure: ProjectStructure
@@ -447,37 +601,37 @@ go build ./...
 
     def _generate_basic_api_reference(self, module: ModuleInfo) -> str:
         """Generate basic API reference."""
-        content = f"# {module.name} API Reference\n\n"
+        parts = [f"# {module.name} API Reference\n\n"]
 
-        content += f"## Overview\n\nModule location: `{module.path}`\n\n"
+        parts.append(f"## Overview\n\nModule location: `{module.path}`\n\n")
 
         if module.public_api:
-            content += "## Public API\n\n"
+            parts.append("## Public API\n\n")
             for api_item in module.public_api:
-                content += f"### {api_item}\n\n[Documentation for {api_item}]\n\n"
+                parts.append(f"### {api_item}\n\n[Documentation for {api_item}]\n\n")
 
-        content += "## Files\n\n"
+        parts.append("## Files\n\n")
         for file_info in module.files:
-            content += f"### {file_info.path.name}\n\n"
+            parts.append(f"### {file_info.path.name}\n\n")
             if file_info.functions:
-                content += "**Functions:**\n"
+                parts.append("**Functions:**\n")
                 for func in file_info.functions:
-                    content += f"- `{func}()`\n"
-                content += "\n"
+                    parts.append(f"- `{func}()`\n")
+                parts.append("\n")
 
             if file_info.classes:
-                content += "**Classes:**\n"
+                parts.append("**Classes:**\n")
                 for cls in file_info.classes:
-                    content += f"- `{cls}`\n"
-                content += "\n"
+                    parts.append(f"- `{cls}`\n")
+                parts.append("\n")
 
-        return content
+        return "".join(parts)
 
     def _generate_basic_architecture_page(
         self, project_structure: ProjectStructure
     ) -> str:
         """Generate basic architecture overview."""
-        content = f"""# Architecture
+        parts = [f"""# Architecture
 
 ## Project Overview
 
@@ -487,23 +641,23 @@ go build ./...
 
 ## Module Structure
 
-"""
+"""]
 
         for module in project_structure.modules:
-            content += f"### {module.name}\n"
-            content += f"Location: `{module.path}`\n"
-            content += f"Files: {len(module.files)}\n\n"
+            parts.append(f"### {module.name}\n")
+            parts.append(f"Location: `{module.path}`\n")
+            parts.append(f"Files: {len(module.files)}\n\n")
 
-        return content
+        return "".join(parts)
 
     def _generate_basic_development_guide(
         self, project_structure: ProjectStructure
     ) -> str:
         """Generate basic development guide."""
-        content = "# Development Guide\n\n## Setup\n\n"
+        parts = ["# Development Guide\n\n## Setup\n\n"]
 
         if project_structure.main_language == "python":
-            content += """```bash
+            parts.append("""```bash
 # Create virtual environment
 python -m venv venv
 source venv/bin/activate  # On Windows: venv\\Scripts\\activate
@@ -514,10 +668,10 @@ pip install -r requirements.txt
 # Install in development mode
 pip install -e .
 ```
-"""
+""")
 
-        content += "\n## Project Structure\n\n"
+        parts.append("\n## Project Structure\n\n")
         for module in project_structure.modules:
-            content += f"- `{module.name}/`: {len(module.files)} files\n"
+            parts.append(f"- `{module.name}/`: {len(module.files)} files\n")
 
-        return content
+        return "".join(parts)
@@ -1,9 +1,17 @@
+import os
+import re
+import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional
 
 from ..core.doc_model import GeneratedDoc
 
 
+# Title characters dropped from filenames: anything but letters, digits,
+# spaces, '-' and '_' (\w matches exactly str.isalnum() plus '_')
+_UNSAFE_TITLE_CHARS_RE = re.compile(r"[^\w \-]")
+
+
 class DocumentationWriter:
     """Writes generated documentation to files."""
     
@@ -14,35 +22,130 @@ class DocumentationWriter:
     def write_doc(self, doc: GeneratedDoc, filename: Optional[str] = None) -> Path:
         """Write documentation to a file."""
         if filename is None:
-            # Generate filename from title
-            safe_title = "".join(c for c in doc.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            safe_title = safe_title.replace(' ', '_').lower()
-            filename = f"{safe_title}.md"
+            filename = self._default_filename(doc.title)
+        
+        file_path = self.output_dir / filename
+        
+        _write_buffers(file_path, [
+            f"# {doc.title}\n\n".encode('utf-8'),
+            doc.content.encode('utf-8'),
+            self._render_metadata(doc.metadata).encode('utf-8'),
+        ])
+        
+        return file_path
+    
+    def write_docs(self, docs: Iterable[GeneratedDoc]) -> List[Path]:
+        """Write several documents, each named after its title."""
+        return [self.write_doc(doc) for doc in docs]
+    
+    @staticmethod
+    def _default_filename(title: str) -> str:
+        """Generate filename from title."""
+        safe_title = _UNSAFE_TITLE_CHARS_RE.sub("", title).rstrip()
+        safe_title = safe_title.replace(' ', '_').lower()
+        return f"{safe_title}.md"
+    
+    async def write_stream(
+        self,
+        title: str,
+        chunks: AsyncIterable[str],
+        filename: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Path:
+        """Write documentation whose content arrives in pieces, e.g. from an LLM stream.
+        
+        Each piece goes to the file as it arrives rather than after the whole
+        content has been generated.
+        """
+        if filename is None:
+            filename = self._default_filename(title)
         
         file_path = self.output_dir / filename
         
-        # Write content
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(f"# {doc.title}\n\n")
-            f.write(doc.content)
-            
-            # Add metadata as comments if present
-            if doc.metadata:
-                f.write("\n\n<!-- Metadata:\n")
-                for key, value in doc.metadata.items():
-                    f.write(f"{key}: {value}\n")
-                f.write("-->\n")
+            f.write(f"# {title}\n\n")
+            async for chunk in chunks:
+                f.write(chunk)
+            f.write(self._render_metadata(metadata))
         
         return file_path
     
+    @staticmethod
+    def _render_metadata(metadata: Optional[Dict[str, Any]]) -> str:
+        """Render metadata as a trailing comment, or nothing if there is none."""
+        if not metadata:
+            return ""
+        
+        parts = ["\n\n<!-- Metadata:\n"]
+        for key, value in metadata.items():
+            parts.append(f"{key}: {value}\n")
+        parts.append("-->\n")
+        return "".join(parts)
+    
     def write_changelog(self, content: str, filename: str = "CHANGELOG.md") -> Path:
-        """Write or append to changelog."""
+        """Write or prepend to changelog.
+        
+        The new entry is written to a temporary file, the existing changelog is
+        copied after it without being decoded or held in memory, and the result
+        replaces the old file in one rename.
+        """
         file_path = self.output_dir / filename
+        tmp_path = file_path.with_name(file_path.name + ".tmp")
         
-        if file_path.exists():
-            # Prepend to existing changelog
-            existing_content = file_path.read_text(encoding='utf-8')
-            content = content + "\n\n" + existing_content
+        try:
+            with open(tmp_path, 'wb') as tmp:
+                tmp.write(content.encode('utf-8'))
+                try:
+                    existing = open(file_path, 'rb')
+                except FileNotFoundError:
+                    existing = None
+                if existing is not None:
+                    with existing:
+                        # Prepend to existing changelog
+                        tmp.write(b"\n\n")
+                        tmp.flush()
+                        _copy_file_contents(existing, tmp)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
         
-        file_path.write_text(content, encoding='utf-8')
-        return file_path
\ No newline at end of file
+        return file_path
+
+
+def _write_buffers(path: Path, buffers: List[bytes]) -> None:
+    """Replace a file's contents with buffers, gathered into one writev call where supported."""
+    if not hasattr(os, "writev"):
+        path.write_bytes(b"".join(buffers))
+        return
+    
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        remaining = [memoryview(buffer) for buffer in buffers if buffer]
+        while remaining:
+            written = os.writev(fd, remaining)
+            # Resume after a short write from the first unwritten byte
+            while remaining and written >= len(remaining[0]):
+                written -= len(remaining.pop(0))
+            if remaining:
+                remaining[0] = remaining[0][written:]
+    finally:
+        os.close(fd)
+
+
+def _copy_file_contents(src, dst) -> None:
+    """Append the rest of src to dst, in the kernel where sendfile is available."""
+    if hasattr(os, "sendfile"):
+        size = os.fstat(src.fileno()).st_size
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return
+        except OSError:
+            if offset:
+                raise
+    shutil.copyfileobj(src, dst, 64 * 1024)
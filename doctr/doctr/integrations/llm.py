@@ -1,10 +1,44 @@
-from typing import List, Optional
+import asyncio
+import importlib.util
+import io
+import json
+import random
+from typing import AsyncIterator, Dict, List, Optional
+import httpx
 from pydantic import BaseModel
 from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
 from pydantic_ai.models.openai import OpenAIModel
 from pydantic_ai.models.anthropic import AnthropicModel
+from pydantic_ai.providers.openai import OpenAIProvider
+from pydantic_ai.providers.anthropic import AnthropicProvider
 
 from ..core.doc_model import CodeChange, DocumentationDraft, GeneratedDoc
+from ..utils.config import OPENAI_MODEL_PREFIXES
+
+
+_CONTENT_INSTRUCTIONS = """
+            You are an expert technical writer. Generate clear, comprehensive documentation 
+            based on the code changes and analysis provided.
+            
+            Write documentation that:
+            - Explains the "why" behind changes, not just the "what"
+            - Includes practical usage examples when relevant
+            - Follows markdown best practices
+            - Is accessible to developers at different skill levels
+            - Focuses on user impact and practical implications
+            
+            Structure the documentation with clear headings and sections.
+            """
+
+# Provider responses worth retrying: timeouts, rate limits and server overload
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504, 529})
+
+# Response length cap for batched requests, which must state one up front
+_BATCH_MAX_TOKENS = 4096
+
+# OpenAI batch statuses after which no more results will arrive
+_OPENAI_BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
 
 
 class DocumentationAnalysis(BaseModel):
@@ -20,29 +54,80 @@ class DocumentationAnalysis(BaseModel):
     migration_guide_needed: bool
 
 
+def create_http_client() -> httpx.AsyncClient:
+    """Create a keep-alive HTTP client to share across many LLM requests.
+    
+    HTTP/2 is enabled when the optional ``h2`` package is installed.
+    """
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        timeout=httpx.Timeout(60.0),
+    )
+
+
+def retry_delay(error: ModelHTTPError, attempt: int, base_delay: float) -> float:
+    """Seconds to wait before retrying a request that failed with ``error``.
+    
+    Uses the provider's Retry-After header when the response carried one,
+    and exponential backoff with jitter otherwise.
+    """
+    response = getattr(error.__cause__, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass  # An HTTP date rather than seconds
+    return base_delay * 2 ** attempt * random.uniform(0.5, 1.5)
+
+
+class RateLimiter:
+    """Spaces requests out to at most ``rate_per_minute`` per minute.
+    
+    Enter it around each request with ``async with``; waiting requests are
+    let through one interval apart, in arrival order.
+    """
+    
+    def __init__(self, rate_per_minute: float):
+        self.interval = 60.0 / rate_per_minute
+        self._next_slot = 0.0
+    
+    async def __aenter__(self) -> None:
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
 class LLMDocumentationGenerator:
     """Uses LLM to analyze code changes and generate meaningful documentation."""
     
-    def __init__(self, model_name: str = "claude-3-5-haiku-20241022", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: str = "claude-3-5-haiku-20241022",
+        api_key: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.is_openai = model_name.startswith(OPENAI_MODEL_PREFIXES)
+        
         # Set environment variable if api_key is provided
         if api_key:
             import os
-            if model_name.startswith("gpt") or model_name.startswith("o1"):
-                os.environ["OPENAI_API_KEY"] = api_key
-            elif model_name.startswith("claude"):
-                os.environ["ANTHROPIC_API_KEY"] = api_key
-            else:
-                # Default to Anthropic
-                os.environ["ANTHROPIC_API_KEY"] = api_key
+            os.environ["OPENAI_API_KEY" if self.is_openai else "ANTHROPIC_API_KEY"] = api_key
         
         # Choose the appropriate model based on the model name
-        if model_name.startswith("gpt") or model_name.startswith("o1"):
-            self.model = OpenAIModel(model_name)
-        elif model_name.startswith("claude"):
-            self.model = AnthropicModel(model_name)
+        if self.is_openai:
+            provider = OpenAIProvider(http_client=http_client) if http_client else "openai"
+            self.model = OpenAIModel(model_name, provider=provider)
         else:
-            # Default to Anthropic
-            self.model = AnthropicModel(model_name)
+            # Anthropic, also the default for unknown models
+            provider = AnthropicProvider(http_client=http_client) if http_client else "anthropic"
+            self.model = AnthropicModel(model_name, provider=provider)
         
         # Agent for analyzing code changes
         self.analysis_agent = Agent(
@@ -66,31 +151,32 @@ class LLMDocumentationGenerator:
         self.content_agent = Agent(
             model=self.model,
             output_type=str,
-            instructions="""
-            You are an expert technical writer. Generate clear, comprehensive documentation 
-            based on the code changes and analysis provided.
-            
-            Write documentation that:
-            - Explains the "why" behind changes, not just the "what"
-            - Includes practical usage examples when relevant
-            - Follows markdown best practices
-            - Is accessible to developers at different skill levels
-            - Focuses on user impact and practical implications
-            
-            Structure the documentation with clear headings and sections.
-            """
+            instructions=_CONTENT_INSTRUCTIONS,
         )
     
+    def _model_settings(self, template: str) -> Optional[dict]:
+        """Model settings that route requests for one prompt template together.
+        
+        OpenAI routes requests with the same ``prompt_cache_key`` to the same
+        prompt cache, so every request built from a template shares its
+        instruction prefix. Anthropic only caches prompts marked with explicit
+        ``cache_control`` breakpoints of at least 1024 tokens, which these
+        short prompts do not reach, so no settings are sent for it.
+        """
+        if self.is_openai:
+            key = f"doctr:{self.model.model_name}:{template}"
+            return {"extra_body": {"prompt_cache_key": key}}
+        return None
+    
     async def analyze_changes(self, changes: List[CodeChange]) -> DocumentationAnalysis:
         """Analyze code changes using LLM to understand their impact."""
         
         # Prepare context for the LLM
         context = self._prepare_changes_context(changes)
         
+        # Stable instructions come first so repeated runs share a cacheable prefix
         prompt = f"""
-        Analyze these code changes and provide a structured analysis:
-        
-        {context}
+        Analyze the code changes below and provide a structured analysis.
         
         Consider:
         1. What is the overall purpose of these changes?
@@ -99,32 +185,44 @@ class LLMDocumentationGenerator:
         4. What new features or capabilities are introduced?
         5. What bugs or issues are being fixed?
         6. What documentation sections should be created/updated?
+        
+        {context}
         """
         
-        result = await self.analysis_agent.run(prompt)
+        result = await self.analysis_agent.run(
+            prompt, model_settings=self._model_settings("analyze-changes")
+        )
         return result.output
     
     async def generate_documentation(
         self, 
         analysis: DocumentationAnalysis, 
         changes: List[CodeChange],
-        existing_content: Optional[str] = None
+        existing_content: Optional[str] = None,
     ) -> str:
         """Generate comprehensive documentation content based on analysis."""
+        chunks = [
+            chunk
+            async for chunk in self.stream_documentation(analysis, changes, existing_content)
+        ]
+        return "".join(chunks)
+    
+    async def stream_documentation(
+        self, 
+        analysis: DocumentationAnalysis, 
+        changes: List[CodeChange],
+        existing_content: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Generate documentation content, yielding text as the model produces it.
+        
+        Callers can write each piece out while the rest is still generating.
+        """
         
         changes_context = self._prepare_changes_context(changes)
         
+        # Stable instructions come first so repeated runs share a cacheable prefix
         prompt = f"""
-        Generate comprehensive documentation based on this analysis and code changes:
-        
-        ## Analysis:
-        {analysis.model_dump_json(indent=2)}
-        
-        ## Code Changes:
-        {changes_context}
-        
-        ## Existing Documentation:
-        {existing_content or "No existing documentation"}
+        Generate comprehensive documentation based on the analysis and code changes below.
         
         Generate documentation that includes:
         1. Clear overview of what changed and why
@@ -134,36 +232,172 @@ class LLMDocumentationGenerator:
         5. Technical details where relevant
         
         Use proper markdown formatting with clear sections and headings.
+        
+        ## Code Changes:
+        {changes_context}
+        
+        ## Existing Documentation:
+        {existing_content or "No existing documentation"}
+        
+        ## Analysis:
+        {analysis.model_dump_json(indent=2)}
         """
         
-        result = await self.content_agent.run(prompt)
-        return result.output
+        async with self.content_agent.run_stream(
+            prompt, model_settings=self._model_settings("generate-documentation")
+        ) as response:
+            async for chunk in response.stream_text(delta=True):
+                yield chunk
+    
+    async def generate_many(
+        self, prompts: List[str], poll_interval: float = 30.0
+    ) -> List[Optional[str]]:
+        """Generate content for many prompts through the provider's batch API.
+        
+        Batched requests cost about half as much as individual ones but can
+        take minutes to hours to finish, so this suits large offline runs.
+        Outputs are returned in prompt order; prompts the provider failed to
+        answer get ``None``.
+        """
+        if not prompts:
+            return []
+        if self.is_openai:
+            outputs = await self._run_openai_batch(prompts, poll_interval)
+        else:
+            outputs = await self._run_anthropic_batch(prompts, poll_interval)
+        return [outputs.get(str(index)) for index in range(len(prompts))]
+    
+    async def _run_anthropic_batch(
+        self, prompts: List[str], poll_interval: float
+    ) -> Dict[str, str]:
+        """Submit prompts as an Anthropic message batch and collect the replies."""
+        batches = self.model.client.messages.batches
+        batch = await batches.create(requests=[
+            {
+                "custom_id": str(index),
+                "params": {
+                    "model": self.model.model_name,
+                    "max_tokens": _BATCH_MAX_TOKENS,
+                    "system": _CONTENT_INSTRUCTIONS,
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            }
+            for index, prompt in enumerate(prompts)
+        ])
+        while batch.processing_status != "ended":
+            await asyncio.sleep(poll_interval)
+            batch = await batches.retrieve(batch.id)
+        
+        outputs = {}
+        async for response in await batches.results(batch.id):
+            if response.result.type == "succeeded":
+                outputs[response.custom_id] = "".join(
+                    block.text for block in response.result.message.content
+                    if block.type == "text"
+                )
+        return outputs
+    
+    async def _run_openai_batch(
+        self, prompts: List[str], poll_interval: float
+    ) -> Dict[str, str]:
+        """Upload prompts as an OpenAI batch file and collect the replies."""
+        client = self.model.client
+        requests = "".join(
+            json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model.model_name,
+                    "max_tokens": _BATCH_MAX_TOKENS,
+                    "messages": [
+                        {"role": "system", "content": _CONTENT_INSTRUCTIONS},
+                        {"role": "user", "content": prompt},
+                    ],
+                },
+            }) + "\n"
+            for index, prompt in enumerate(prompts)
+        )
+        input_file = await client.files.create(
+            file=("batch.jsonl", requests.encode("utf-8")), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        while batch.status not in _OPENAI_BATCH_FINAL_STATUSES:
+            await asyncio.sleep(poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+        
+        outputs = {}
+        if batch.output_file_id:
+            results = await client.files.content(batch.output_file_id)
+            for line in results.text.splitlines():
+                result = json.loads(line)
+                response = result.get("response")
+                if response and response["status_code"] == 200:
+                    outputs[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        return outputs
     
     def _prepare_changes_context(self, changes: List[CodeChange]) -> str:
         """Prepare a readable context of code changes for the LLM."""
-        context_parts = []
+        buffer = io.StringIO()
+        write = buffer.write
         
         for i, change in enumerate(changes, 1):
-            context_parts.append(f"## Change {i}: {change.file_path}")
-            context_parts.append(f"Type: {change.change_type.value}")
-            context_parts.append(f"Lines: {change.line_start}-{change.line_end}")
+            write(f"## Change {i}: {change.file_path}\n")
+            write(f"Type: {change.change_type.value}\n")
+            write(f"Lines: {change.line_start}-{change.line_end}\n")
             
             if change.function_name:
-                context_parts.append(f"Function: {change.function_name}")
+                write(f"Function: {change.function_name}\n")
             if change.class_name:
-                context_parts.append(f"Class: {change.class_name}")
+                write(f"Class: {change.class_name}\n")
             
             if change.old_content:
-                context_parts.append("### Old Content:")
-                context_parts.append(f"```\n{change.old_content}\n```")
+                write("### Old Content:\n")
+                write(f"```\n{change.old_content}\n```\n")
             
             if change.new_content:
-                context_parts.append("### New Content:")
-                context_parts.append(f"```\n{change.new_content}\n```")
+                write("### New Content:\n")
+                write(f"```\n{change.new_content}\n```\n")
             
-            context_parts.append("")  # Empty line between changes
+            write("\n")  # Empty line between changes
+        
+        # Every line ends in a newline except the last one
+        return buffer.getvalue()[:-1]
+    
+    async def patch_documentation(
+        self, previous: GeneratedDoc, draft: DocumentationDraft
+    ) -> GeneratedDoc:
+        """Update previously generated documentation for a near-identical draft."""
+        
+        changes_context = self._prepare_changes_context(draft.changes)
+        
+        prompt = f"""
+        The documentation below was generated for an earlier, very similar set of
+        code changes. Update it so it accurately describes the new changes.
+        Keep the existing structure and wording wherever it is still correct.
+        
+        ## Previous Documentation:
+        {previous.content}
+        
+        ## New Code Changes:
+        {changes_context}
+        """
+        
+        result = await self.content_agent.run(prompt)
         
-        return "\n".join(context_parts)
+        return GeneratedDoc(
+            title=draft.title,
+            content=result.output,
+            metadata={
+                **draft.metadata,
+                "enhanced": True,
+                "patched_from_cache": True
+            }
+        )
     
     async def enhance_draft(self, draft: DocumentationDraft) -> GeneratedDoc:
         """Enhance a basic documentation draft with LLM analysis."""
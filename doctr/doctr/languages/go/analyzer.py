@@ -23,25 +23,18 @@ class GoAnalyzer:
 
     def extract_package_comment(self, file_path: Path) -> Optional[str]:
         """Extract package-level comment from a Go file."""
+        comment_lines = []
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Basic package comment extraction
-            lines = content.strip().split("\n")
-            comment_lines = []
-
-            for line in lines:
-                line = line.strip()
-                if line.startswith("//"):
-                    comment_lines.append(line[2:].strip())
-                elif line.startswith("package"):
-                    break
-                elif line and not line.startswith("//"):
-                    break
-
-            return "\n".join(comment_lines).strip() if comment_lines else None
-        except Exception:
-            pass
-
-        return None
+            # The comment sits above the package clause, so read line by line
+            # and stop at the first line of code instead of loading the file
+            with open(file_path, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith(b"//"):
+                        comment_lines.append(line[2:].strip().decode("utf-8", errors="replace"))
+                    elif line:
+                        break
+        except OSError:
+            return None
+
+        return "\n".join(comment_lines).strip() if comment_lines else None
@@ -1,7 +1,66 @@
+import ast
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 
+# Below this many files a process pool costs more to start than it saves
+_PARALLEL_ANALYSIS_THRESHOLD = 32
+
+
+@functools.lru_cache(maxsize=256)
+def _parse(path: str, mtime_ns: int) -> Optional[ast.Module]:
+    """Parse a Python file; cached until the file's modification time changes."""
+    try:
+        with open(path, "rb") as f:
+            # ast.parse decodes bytes itself, honoring PEP 263 encoding cookies
+            return ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+def _parse_file(file_path: Path) -> Optional[ast.Module]:
+    """Return the cached syntax tree of a Python file, or None if unreadable."""
+    try:
+        mtime_ns = os.stat(file_path).st_mtime_ns
+    except OSError:
+        return None
+    return _parse(os.fspath(file_path), mtime_ns)
+
+
+def _analyze_file(file_path: Path) -> Dict[str, Any]:
+    """Collect functions, classes, imports and the docstring of a Python file.
+
+    Module-level so it can be pickled into a process pool.
+    """
+    functions: List[str] = []
+    classes: List[str] = []
+    imports: List[str] = []
+
+    tree = _parse_file(file_path)
+    if tree is None:
+        return {"functions": functions, "classes": classes, "imports": imports, "docstring": None}
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(node.name)
+        elif isinstance(node, ast.ClassDef):
+            classes.append(node.name)
+        elif isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            imports.append(node.module)
+
+    return {
+        "functions": functions,
+        "classes": classes,
+        "imports": imports,
+        "docstring": ast.get_docstring(tree),
+    }
+
+
 class PythonAnalyzer:
     """Analyzer for Python code structure and patterns."""
 
@@ -10,7 +69,17 @@ class PythonAnalyzer:
 
     def analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """Analyze a single Python file."""
-        return {"functions": [], "classes": [], "imports": [], "docstring": None}
+        return _analyze_file(file_path)
+
+    def analyze_files(self, paths: List[Path]) -> List[Dict[str, Any]]:
+        """Analyze many Python files, in parallel processes for larger batches.
+
+        Results are returned in the order of ``paths``.
+        """
+        if len(paths) < _PARALLEL_ANALYSIS_THRESHOLD:
+            return [_analyze_file(path) for path in paths]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(_analyze_file, paths, chunksize=32))
 
     def analyze_module(self, module_path: Path) -> Dict[str, Any]:
         """Analyze a Python module/package."""
@@ -23,26 +92,5 @@ class PythonAnalyzer:
 
     def extract_docstring(self, file_path: Path) -> Optional[str]:
         """Extract module-level docstring from a Python file."""
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Basic docstring extraction
-            lines = content.strip().split("\n")
-            if len(lines) > 0 and (
-                lines[0].startswith('"""') or lines[0].startswith("'''")
-            ):
-                quote_type = lines[0][:3]
-                docstring_lines = []
-                in_docstring = True
-
-                for line in lines[1:]:
-                    if quote_type in line:
-                        break
-                    docstring_lines.append(line)
-
-                return "\n".join(docstring_lines).strip()
-        except Exception:
-            pass
-
-        return None
+        tree = _parse_file(file_path)
+        return ast.get_docstring(tree) if tree is not None else None
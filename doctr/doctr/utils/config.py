@@ -1,12 +1,27 @@
+import fnmatch
+import functools
 import os
+import re
+import tomllib
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Optional, Dict, Any
-import toml
-from pydantic import BaseModel
 
 
-class DoctrConfig(BaseModel):
-    """Configuration for Doctr."""
+# Shared by every default DoctrConfig; a tuple, so no per-instance copy
+_DEFAULT_IGNORE_PATTERNS: tuple[str, ...] = (
+    "*.pyc", "*.pyo", "__pycache__/*", ".git/*",
+    "node_modules/*", "*.log", "*.tmp"
+)
+
+
+@dataclass(slots=True, frozen=True)
+class DoctrConfig:
+    """Configuration for Doctr.
+    
+    Frozen because load_config hands the same memoized instance to every
+    caller.
+    """
     
     # LLM settings
     openai_api_key: Optional[str] = None
@@ -19,72 +34,188 @@ class DoctrConfig(BaseModel):
     use_ai: bool = True
     
     # File patterns
-    ignore_patterns: list[str] = [
-        "*.pyc", "*.pyo", "__pycache__/*", ".git/*", 
-        "node_modules/*", "*.log", "*.tmp"
-    ]
+    ignore_patterns: tuple[str, ...] = _DEFAULT_IGNORE_PATTERNS
     
     # Documentation templates
     include_usage_examples: bool = True
     include_migration_guide: bool = True
     include_changelog: bool = True
+    
+    # LLM response cache ("disk", "memory" or "none")
+    cache_backend: str = "disk"
+    cache_ttl: int = 7 * 24 * 3600
+    
+    # Similarity above which a cached doc for a different draft is patched
+    # with a short prompt instead of regenerated
+    semantic_patch_threshold: float = 0.85
+    
+    # Concurrent LLM requests for wiki generation, and retries for
+    # rate-limit or server errors
+    llm_concurrency: int = 8
+    llm_max_retries: int = 3
+    
+    def __post_init__(self):
+        # TOML arrays arrive as lists
+        if not isinstance(self.ignore_patterns, tuple):
+            object.__setattr__(self, "ignore_patterns", tuple(self.ignore_patterns))
+        # A zero-sized request semaphore would block every LLM call forever
+        if not isinstance(self.llm_concurrency, int) or self.llm_concurrency < 1:
+            raise ValueError(
+                f"llm_concurrency must be a positive integer, got {self.llm_concurrency!r}"
+            )
+    
+    def is_ignored(self, path: str) -> bool:
+        """Return True if the relative path matches any ignore pattern."""
+        return _compile_ignore_patterns(self.ignore_patterns).match(path) is not None
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_ignore_patterns(patterns: tuple[str, ...]) -> re.Pattern:
+    """Fold glob patterns into one regex, so a path is matched in one pass."""
+    if not patterns:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+
+
+_CONFIG_FIELDS = frozenset(field.name for field in fields(DoctrConfig))
+
+# Models served by OpenAI; everything else goes to Anthropic
+OPENAI_MODEL_PREFIXES = ("gpt", "o1")
+
+
+def _file_stamp(path: Path) -> Optional[tuple[int, int]]:
+    """Return the file's (mtime_ns, size), or None if it does not exist.
+    
+    The size catches rewrites that land within the filesystem's timestamp
+    granularity and would otherwise leave the mtime unchanged.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@functools.lru_cache(maxsize=None)
+def _global_config_path(home: Optional[str], user_profile: Optional[str]) -> Path:
+    """Return the global config path for the given home directory variables.
+    
+    Keyed on the variables Path.home() consults, so the path is only rebuilt
+    when the home directory changes.
+    """
+    return Path.home() / ".doctr" / "config.toml"
+
+
+def _parse_concurrency(value: str) -> int:
+    """Parse DOCTR_LLM_CONCURRENCY, which must be a positive integer."""
+    try:
+        concurrency = int(value)
+    except ValueError:
+        concurrency = 0
+    if concurrency < 1:
+        raise ValueError(f"DOCTR_LLM_CONCURRENCY must be a positive integer, got {value!r}")
+    return concurrency
+
+
+def _read_toml(path: Path) -> Dict[str, Any]:
+    """Parse a TOML file with the stdlib parser in a single read.
+    
+    A file removed since it was stamped reads as empty rather than failing.
+    """
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
+        return {}
 
 
 def load_config(repo_path: Path) -> DoctrConfig:
-    """Load configuration from various sources."""
+    """Load configuration from various sources.
+    
+    Results are memoized per repository and invalidated whenever either
+    config file or a supported environment variable changes, so a repeat
+    call costs two stat calls and no file reads.
+    """
+    global_config_path = _global_config_path(os.getenv("HOME"), os.getenv("USERPROFILE"))
+    project_config_path = repo_path / ".doctr.toml"
+    
+    # abspath is purely lexical, unlike resolve() which stats every path
+    # component; a symlinked alias merely gets its own cache entry
+    return _load_config_cached(
+        Path(os.path.abspath(repo_path)),
+        global_config_path,
+        _file_stamp(global_config_path),
+        _file_stamp(project_config_path),
+        os.getenv("ANTHROPIC_API_KEY"),
+        os.getenv("OPENAI_API_KEY"),
+        os.getenv("DOCTR_LLM_CONCURRENCY"),
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(
+    repo_path: Path,
+    global_config_path: Path,
+    global_stamp: Optional[tuple[int, int]],
+    project_stamp: Optional[tuple[int, int]],
+    anthropic_api_key: Optional[str],
+    openai_api_key: Optional[str],
+    llm_concurrency: Optional[str],
+) -> DoctrConfig:
     config_data = {}
     
     # 1. Load from environment variables
-    if api_key := os.getenv("ANTHROPIC_API_KEY"):
-        config_data["anthropic_api_key"] = api_key
-    if api_key := os.getenv("OPENAI_API_KEY"):
-        config_data["openai_api_key"] = api_key
+    if anthropic_api_key:
+        config_data["anthropic_api_key"] = anthropic_api_key
+    if openai_api_key:
+        config_data["openai_api_key"] = openai_api_key
+    if llm_concurrency:
+        config_data["llm_concurrency"] = _parse_concurrency(llm_concurrency)
     
     # 2. Load from global config file
-    global_config_path = Path.home() / ".doctr" / "config.toml"
-    if global_config_path.exists():
-        global_config = toml.load(global_config_path)
-        config_data.update(global_config)
+    if global_stamp is not None:
+        config_data.update(_read_toml(global_config_path))
     
     # 3. Load from project-specific config
-    project_config_path = repo_path / ".doctr.toml"
-    if project_config_path.exists():
-        project_config = toml.load(project_config_path)
-        config_data.update(project_config)
+    if project_stamp is not None:
+        config_data.update(_read_toml(repo_path / ".doctr.toml"))
     
-    return DoctrConfig(**config_data)
+    # Unknown keys are ignored so older versions still read newer configs
+    return DoctrConfig(**{
+        key: value for key, value in config_data.items() if key in _CONFIG_FIELDS
+    })
+
+
+# User-facing settings written by `doctr init`. Tuning knobs such as
+# llm_concurrency stay out, since a project file value would override the
+# environment variables for them.
+_TEMPLATE_FIELDS = (
+    "default_model", "output_dir", "default_diff_target", "use_ai",
+    "include_usage_examples", "include_migration_guide", "include_changelog",
+    "ignore_patterns",
+)
+
+
+@functools.cache
+def _default_config_text() -> str:
+    """Render DoctrConfig's defaults for the template settings as TOML."""
+    # Only `doctr init` writes TOML, so the encoder is not imported up front
+    import toml
+    
+    defaults = DoctrConfig()
+    return toml.dumps({name: getattr(defaults, name) for name in _TEMPLATE_FIELDS})
 
 
 def create_default_config(repo_path: Path) -> Path:
     """Create a default .doctr.toml configuration file."""
     config_path = repo_path / ".doctr.toml"
-    
-    default_config = {
-        "default_model": "claude-3-5-haiku-20241022",
-        "output_dir": "docs",
-        "default_diff_target": "HEAD~1",
-        "use_ai": True,
-        "include_usage_examples": True,
-        "include_migration_guide": True,
-        "include_changelog": True,
-        "ignore_patterns": [
-            "*.pyc", "*.pyo", "__pycache__/*", ".git/*",
-            "node_modules/*", "*.log", "*.tmp"
-        ]
-    }
-    
-    with open(config_path, 'w') as f:
-        toml.dump(default_config, f)
-    
+    config_path.write_text(_default_config_text())
     return config_path
 
 
 def get_api_key(config: DoctrConfig, model_name: str) -> Optional[str]:
     """Get the appropriate API key for the given model."""
-    if model_name.startswith("gpt") or model_name.startswith("o1"):
+    if model_name.startswith(OPENAI_MODEL_PREFIXES):
         return config.openai_api_key
-    elif model_name.startswith("claude"):
-        return config.anthropic_api_key
-    else:
-        # Default to Anthropic for unknown models
-        return config.anthropic_api_key
\ No newline at end of file
+    # Claude and unknown models use the Anthropic key
+    return config.anthropic_api_key
\ No newline at end of file
@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+from pathlib import Path
+from doctr.doctr.languages.go.analyzer import GoAnalyzer
+
+
+class TestGoAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "doc.go"
+        self.analyzer = GoAnalyzer()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_extract_package_comment(self):
+        self.path.write_bytes(
+            b"// Package server runs the API.\r\n\n//  It is safe \xff to embed.\npackage server\n// not this\n"
+        )
+
+        self.assertEqual(
+            self.analyzer.extract_package_comment(self.path),
+            "Package server runs the API.\nIt is safe \ufffd to embed.",
+        )
+
+    def test_no_package_comment(self):
+        self.path.write_text("package server\n\n// Serve starts the server.\nfunc Serve() {}\n")
+
+        self.assertIsNone(self.analyzer.extract_package_comment(self.path))
+        self.assertIsNone(self.analyzer.extract_package_comment(Path(self.tmp.name) / "missing.go"))
+
+
+if __name__ == '__main__':
+    unittest.main()
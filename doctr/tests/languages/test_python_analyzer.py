@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from doctr.doctr.languages.python.analyzer import PythonAnalyzer, _parse
+
+
+class TestPythonAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "module.py"
+        self.path.write_text(
+            '#!/usr/bin/env python\n'
+            '"""Summary line.\n\n    Details here.\n    """\n'
+            'import os, sys\n'
+            'from typing import List\n\n'
+            'class Engine:\n'
+            '    async def start(self):\n'
+            '        pass\n\n'
+            'def run():\n'
+            '    pass\n'
+        )
+        self.analyzer = PythonAnalyzer()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_analyze_file(self):
+        info = self.analyzer.analyze_file(self.path)
+
+        self.assertEqual(sorted(info["functions"]), ["run", "start"])
+        self.assertEqual(info["classes"], ["Engine"])
+        self.assertEqual(info["imports"], ["os", "sys", "typing"])
+        self.assertEqual(info["docstring"], "Summary line.\n\nDetails here.")
+
+    def test_extract_docstring_reuses_parse(self):
+        _parse.cache_clear()
+        self.analyzer.analyze_file(self.path)
+        docstring = self.analyzer.extract_docstring(self.path)
+
+        self.assertEqual(docstring, "Summary line.\n\nDetails here.")
+        self.assertEqual(_parse.cache_info().misses, 1)
+
+    def test_changed_file_is_parsed_again(self):
+        self.analyzer.extract_docstring(self.path)
+        self.path.write_text('"""New."""\n')
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(self.analyzer.extract_docstring(self.path), "New.")
+
+    @patch("doctr.doctr.languages.python.analyzer._PARALLEL_ANALYSIS_THRESHOLD", 2)
+    def test_analyze_files_in_parallel_keeps_order(self):
+        other = Path(self.tmp.name) / "other.py"
+        other.write_text("def helper():\n    pass\n")
+
+        results = self.analyzer.analyze_files([other, self.path, other])
+
+        self.assertEqual([result["functions"][0] for result in results], ["helper", "run", "helper"])
+        self.assertEqual(self.analyzer.analyze_files([other]), [results[0]])
+
+    def test_unparsable_file(self):
+        self.path.write_text("def broken(:\n")
+
+        self.assertIsNone(self.analyzer.extract_docstring(self.path))
+        self.assertEqual(self.analyzer.analyze_file(self.path)["functions"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,231 @@
+import asyncio
+import contextlib
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from pydantic_ai.exceptions import ModelHTTPError
+from doctr.doctr.core.ai_wiki_generator import AIWikiGenerator
+from doctr.doctr.core.intelligent_analyzer import ExplorationPlan, ProjectFile, ProjectInsight
+from doctr.doctr.core.llm_cache import MemoryCache
+
+
+def make_plan(**overrides):
+    fields = dict(
+        project_overview="A test project",
+        key_entry_points=["main.py"],
+        core_modules=["core", "cli"],
+        documentation_structure=["Home", "FAQ"],
+        exploration_priorities=[],
+    )
+    fields.update(overrides)
+    return ExplorationPlan(**fields)
+
+
+def make_insights():
+    return ProjectInsight(
+        project_purpose="Testing",
+        main_functionality="Tests things",
+        target_audience="Developers",
+        key_features=["fast"],
+        architecture_style="modular",
+    )
+
+
+def make_file(path):
+    return ProjectFile(
+        path=Path(path),
+        content_preview="def main(): pass",
+        file_type=".py",
+        importance_score=5,
+    )
+
+
+class TestAIWikiGenerator(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+
+        analyzer = MagicMock()
+        analyzer.run_full_analysis = AsyncMock(return_value=(make_plan(), make_insights()))
+        analyzer.get_project_files = AsyncMock(
+            return_value=[make_file("src/core/app.py"), make_file("src/cli/main.py")]
+        )
+        analyzer_patch = patch(
+            "doctr.doctr.core.ai_wiki_generator.IntelligentCodebaseAnalyzer",
+            return_value=analyzer,
+        )
+        analyzer_patch.start()
+        self.addCleanup(analyzer_patch.stop)
+
+    def make_generator(self, run, max_concurrency=8, cache=None):
+        generator = AIWikiGenerator(
+            api_key="test-key",
+            max_concurrency=max_concurrency,
+            retry_base_delay=0,
+            cache=cache,
+        )
+
+        @contextlib.asynccontextmanager
+        async def run_stream(prompt):
+            result = await run(prompt)
+
+            async def stream_text(delta=False):
+                yield result.output
+
+            response = MagicMock()
+            response.stream_text = stream_text
+            yield response
+
+        generator.llm_generator.content_agent = MagicMock()
+        generator.llm_generator.content_agent.run_stream = run_stream
+        return generator
+
+    async def test_pages_generated_concurrently_in_order(self):
+        active = 0
+        peak = 0
+
+        async def run(prompt):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return MagicMock(output="content")
+
+        generator = self.make_generator(run, max_concurrency=3)
+        pages = await generator.generate_comprehensive_wiki(Path("."))
+
+        self.assertEqual(
+            [page.title for page in pages],
+            ["Home", "Installation Guide", "Quick Start", "Architecture", "core API", "cli API", "FAQ"],
+        )
+        self.assertEqual(peak, 3)
+
+    async def test_iter_pages_yields_as_completed(self):
+        async def run(prompt):
+            # Home finishes last, so it must not be yielded first
+            await asyncio.sleep(0.05 if "Home page" in prompt else 0)
+            return MagicMock(output="content")
+
+        generator = self.make_generator(run)
+        items = [item async for item in generator.iter_pages(Path("."))]
+
+        self.assertEqual(items[-1][1].title, "Home")
+        self.assertEqual(items[-1][0], 0)
+        self.assertEqual(sorted(position for position, _ in items), list(range(len(items))))
+
+    async def test_failed_page_is_skipped_and_recorded(self):
+        async def run(prompt):
+            if "installation guide" in prompt:
+                raise RuntimeError("rate limited")
+            return MagicMock(output="content")
+
+        generator = self.make_generator(run)
+        pages = await generator.generate_comprehensive_wiki(Path("."))
+
+        titles = [page.title for page in pages]
+        self.assertNotIn("Installation Guide", titles)
+        self.assertIn("Home", titles)
+        self.assertEqual([str(error) for error in generator.failed_pages], ["rate limited"])
+
+    async def test_cached_responses_skip_llm(self):
+        calls = []
+
+        async def run(prompt):
+            calls.append(prompt)
+            return MagicMock(output="content")
+
+        cache = MemoryCache()
+        first = await self.make_generator(run, cache=cache).generate_comprehensive_wiki(Path("."))
+        call_count = len(calls)
+        second = await self.make_generator(run, cache=cache).generate_comprehensive_wiki(Path("."))
+
+        self.assertEqual(len(calls), call_count)
+        self.assertEqual(first, second)
+
+    async def test_rate_limited_prompt_is_retried(self):
+        attempts = []
+
+        async def run(prompt):
+            attempts.append(prompt)
+            if len(attempts) == 1:
+                raise ModelHTTPError(429, "test-model")
+            return MagicMock(output="content")
+
+        content = await self.make_generator(run)._run_prompt("prompt")
+
+        self.assertEqual(content, "content")
+        self.assertEqual(len(attempts), 2)
+
+    async def test_client_error_is_not_retried(self):
+        attempts = []
+
+        async def run(prompt):
+            attempts.append(prompt)
+            raise ModelHTTPError(400, "test-model")
+
+        with self.assertRaises(ModelHTTPError):
+            await self.make_generator(run)._run_prompt("prompt")
+        self.assertEqual(len(attempts), 1)
+
+    async def test_identical_prompts_share_one_request(self):
+        calls = []
+
+        async def run(prompt):
+            calls.append(prompt)
+            await asyncio.sleep(0.01)
+            return MagicMock(output="content")
+
+        generator = self.make_generator(run)
+        results = await asyncio.gather(
+            generator._run_prompt("same"), generator._run_prompt("same")
+        )
+
+        self.assertEqual(results, ["content", "content"])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(generator._inflight, {})
+        self.assertEqual(generator._inflight_waiters, {})
+
+    async def test_cancelled_caller_cancels_its_request(self):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def run(prompt):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        generator = self.make_generator(run)
+        caller = asyncio.ensure_future(generator._run_prompt("prompt"))
+        await started.wait()
+        caller.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+        self.assertEqual(generator._inflight, {})
+
+    async def test_request_survives_while_another_caller_waits(self):
+        release = asyncio.Event()
+
+        async def run(prompt):
+            await release.wait()
+            return MagicMock(output="content")
+
+        generator = self.make_generator(run)
+        first = asyncio.ensure_future(generator._run_prompt("same"))
+        second = asyncio.ensure_future(generator._run_prompt("same"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await second, "content")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from doctr.doctr.core.analyzer import CodebaseAnalyzer, ProjectType, _analyze_python_file_worker
+
+
+class TestCodebaseAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.write("README.md", "# Project\n")
+        self.write("pyproject.toml", "[project]\nname = 'pkg'\ndependencies = ['toml']\n")
+        self.write("pkg/__init__.py", "__all__ = ['run']\n")
+        self.write("pkg/core.py", '"""Core."""\nimport os\n\ndef run():\n    pass\n\nclass Engine:\n    pass\n')
+        self.write("pkg/sub/__init__.py", "")
+        self.write("pkg/sub/util.py", "def helper():\n    pass\n")
+        self.write("pkg/__main__.py", 'if __name__ == "__main__":\n    pass\n')
+        self.write("tests/test_core.py", "def test_run():\n    pass\n")
+        self.write("pkg/tool.py", "# " + "x" * 300 + "\nif __name__ == '__main__':\n    pass\n")
+        self.write("docs/guide.txt", "Guide\n")
+        # Dependency trees that must never be scanned
+        self.write(".venv/lib/dep/__init__.py", "")
+        self.write("node_modules/lib/index.js", "")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, content):
+        path = self.root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    def test_analyze_project(self):
+        structure = CodebaseAnalyzer(self.root).analyze_project()
+
+        self.assertEqual(structure.project_type, ProjectType.PYTHON)
+        self.assertEqual(structure.main_language, "python")
+
+        modules = {module.name: module for module in structure.modules}
+        self.assertEqual(set(modules), {"pkg", "sub"})
+        self.assertEqual(len(modules["pkg"].files), 6)
+        self.assertEqual(modules["pkg"].public_api, ["run"])
+        self.assertEqual(modules["sub"].public_api, [])
+        self.assertEqual(modules["pkg"].dependencies, [])
+
+        core = next(f for f in modules["pkg"].files if f.path.name == "core.py")
+        self.assertEqual(core.functions, ["run"])
+        self.assertEqual(core.classes, ["Engine"])
+        self.assertEqual(core.imports, ["os"])
+        self.assertEqual(core.docstring, "Core.")
+
+        self.assertEqual(structure.entry_points, sorted(structure.entry_points))
+        self.assertIn(self.root / "pkg/__main__.py", structure.entry_points)
+        self.assertIn(self.root / "pkg/tool.py", structure.entry_points)
+        self.assertNotIn(self.root / "pkg/core.py", structure.entry_points)
+        self.assertEqual(structure.config_files, [self.root / "pyproject.toml"])
+        self.assertEqual(structure.test_directories, [self.root / "tests"])
+        self.assertEqual(
+            sorted(structure.documentation_files),
+            [self.root / "README.md", self.root / "docs/guide.txt"],
+        )
+        self.assertEqual(structure.dependencies, {"python": ["toml"]})
+
+    def test_python_file_summary_skips_function_bodies(self):
+        self.write("pkg/service.py", (
+            "try:\n"
+            "    import ujson as json\n"
+            "except ImportError:\n"
+            "    import json\n"
+            "\n"
+            "class Service:\n"
+            "    def start(self):\n"
+            "        import logging\n"
+            "        def callback():\n"
+            "            pass\n"
+            "\n"
+            "async def main():\n"
+            "    pass\n"
+        ))
+        info = _analyze_python_file_worker(self.root / "pkg/service.py")
+
+        self.assertEqual(info.classes, ["Service"])
+        self.assertEqual(info.functions, ["main", "start"])
+        self.assertEqual(info.imports, ["ujson", "json"])
+        self.assertEqual(CodebaseAnalyzer(self.root)._extract_dependencies([info]), ["ujson"])
+        self.assertIsNone(info.docstring)
+
+    def test_go_file_functions_and_imports(self):
+        self.write("server/main.go", (
+            'package main\n\n'
+            'import "fmt"\n'
+            'import (\n    "os"\n    str "strings"\n)\n\n'
+            'func main() {}\n\n'
+            'func (s *Server) Start() error { return nil }\n\n'
+            'func Map[T any](xs []T) {}\n'
+        ))
+        info = CodebaseAnalyzer(self.root)._analyze_go_file(self.root / "server/main.go")
+
+        self.assertEqual(info.functions, ["main", "Map"])
+        self.assertEqual(info.imports, ["fmt", "os", "strings"])
+
+    @patch("doctr.doctr.core.analyzer._MAX_PARSE_BYTES", 10)
+    def test_oversized_python_file_is_not_parsed(self):
+        info = _analyze_python_file_worker(self.root / "pkg/core.py")
+
+        self.assertEqual(info.functions, [])
+        self.assertEqual(info.size, (self.root / "pkg/core.py").stat().st_size)
+
+    def test_requirements_comments_are_skipped(self):
+        (self.root / "pyproject.toml").unlink()
+        self.write("requirements.txt", "requests\n  # pinned below\n\nrich==13.0\n")
+        dependencies = CodebaseAnalyzer(self.root)._analyze_dependencies()
+
+        self.assertEqual(dependencies, {"python": ["requests", "rich==13.0"]})
+
+    def test_public_api_follows_dunder_all_idioms(self):
+        self.write("pkg/__init__.py", (
+            "__all__ = ('run',)\n"
+            "__all__ += ['Engine']\n"
+            "__all__.extend(['helper'])\n"
+            "def hidden():\n"
+            "    __all__ = ['nope']\n"
+        ))
+        public_api = CodebaseAnalyzer(self.root)._extract_public_api(self.root / "pkg/__init__.py")
+
+        self.assertEqual(public_api, ["run", "Engine", "helper"])
+
+    def test_init_file_is_parsed_once(self):
+        with patch("doctr.doctr.core.analyzer.CodebaseAnalyzer._extract_public_api") as extract:
+            modules = CodebaseAnalyzer(self.root).analyze_project().modules
+
+        extract.assert_not_called()
+        self.assertEqual({module.name: module.public_api for module in modules}, {"pkg": ["run"], "sub": []})
+
+    def test_go_mod_dependencies(self):
+        self.write("go.mod", (
+            "module example.com/app\n\n"
+            "go 1.21\n\n"
+            "// direct dependencies\n"
+            "require (\r\n"
+            "\tgithub.com/spf13/cobra v1.8.0  \n"
+            ")\n"
+        ))
+        dependencies = CodebaseAnalyzer(self.root)._analyze_dependencies()
+
+        self.assertEqual(dependencies["go"], ["require (", "github.com/spf13/cobra v1.8.0", ")"])
+
+    def test_skip_names_match_whole_path_components(self):
+        self.write("envoy/__init__.py", "")
+        self.write("envoy/builder.py", "def build():\n    pass\n")
+        modules = {module.name for module in CodebaseAnalyzer(self.root).analyze_project().modules}
+
+        self.assertIn("envoy", modules)
+
+    def test_skipped_directories_are_not_descended(self):
+        analyzer = CodebaseAnalyzer(self.root)
+        visited = [Path(entry.path) for entry, _ in analyzer._walk()]
+
+        self.assertNotIn(self.root / ".venv", visited)
+        self.assertFalse(any("node_modules" in path.parts for path in visited))
+
+
+if __name__ == '__main__':
+    unittest.main()
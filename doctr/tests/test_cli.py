@@ -0,0 +1,238 @@
+import asyncio
+import os
+import re
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from typer.testing import CliRunner
+from doctr.doctr.cli.main import _draft_vector, app
+from doctr.doctr.core.ai_wiki_generator import WikiPage
+from doctr.doctr.core.doc_model import ChangeType, CodeChange, GeneratedDoc
+from doctr.doctr.core.generator import DocumentationGenerator
+from doctr.doctr.utils.config import DoctrConfig
+
+
+class TestInitCommand(unittest.TestCase):
+
+    def setUp(self):
+        self.runner = CliRunner()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo_path = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_init_creates_config(self):
+        result = self.runner.invoke(app, ["init", str(self.repo_path)])
+        self.assertEqual(result.exit_code, 0)
+        self.assertTrue((self.repo_path / ".doctr.toml").exists())
+
+    def test_init_existing_config_non_interactive(self):
+        config_file = self.repo_path / ".doctr.toml"
+        config_file.write_text("output_dir = 'custom'\n")
+
+        result = self.runner.invoke(app, ["init", str(self.repo_path)])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("--force", result.output)
+        self.assertEqual(config_file.read_text(), "output_dir = 'custom'\n")
+
+    def test_init_force_overwrites(self):
+        config_file = self.repo_path / ".doctr.toml"
+        config_file.write_text("output_dir = 'custom'\n")
+
+        result = self.runner.invoke(app, ["init", str(self.repo_path), "--force"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("default_model", config_file.read_text())
+
+
+class TestSetupCommand(unittest.TestCase):
+
+    def setUp(self):
+        self.runner = CliRunner()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo_path = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_setup_without_api_key_exits_cleanly(self):
+        result = self.runner.invoke(app, ["setup", str(self.repo_path)])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("No API key found", result.output)
+        self.assertNotIn("Error:", result.output)
+
+    @patch.dict(os.environ, {"DOCTR_LLM_CONCURRENCY": "auto"}, clear=True)
+    def test_invalid_config_is_reported_cleanly(self):
+        result = self.runner.invoke(app, ["setup", str(self.repo_path)])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Error: DOCTR_LLM_CONCURRENCY must be a positive integer", result.output)
+        self.assertNotIsInstance(result.exception, ValueError)
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_missing_key_hint_names_the_provider_get_api_key_uses(self):
+        for model, env_var in [("gpt-4o", "OPENAI_API_KEY"), ("mistral-large", "ANTHROPIC_API_KEY")]:
+            result = self.runner.invoke(app, ["setup", str(self.repo_path), "--model", model])
+            self.assertIn(f"Set {env_var}", result.output)
+
+    def test_pages_are_written_while_later_pages_generate(self):
+        wiki_dir = self.repo_path / "wiki"
+        first = WikiPage("Home", "Home.md", "# Home", "overview")
+        second = WikiPage("Guide", "Guide.md", "# Guide", "guide")
+        seen_before_last = []
+
+        class FakeWikiGenerator:
+            def __init__(self, **kwargs):
+                self.failed_pages = []
+
+            async def iter_pages(self, repo_path):
+                yield 0, first
+                for _ in range(100):
+                    if (wiki_dir / first.filename).exists():
+                        break
+                    await asyncio.sleep(0.01)
+                seen_before_last.append((wiki_dir / first.filename).exists())
+                yield 1, second
+
+        env = {"HOME": str(self.repo_path), "ANTHROPIC_API_KEY": "test-key"}
+        with patch.dict(os.environ, env, clear=True), \
+                patch("doctr.doctr.core.ai_wiki_generator.AIWikiGenerator", FakeWikiGenerator):
+            result = self.runner.invoke(app, ["setup", str(self.repo_path)])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(seen_before_last, [True])
+        self.assertEqual((wiki_dir / second.filename).read_text(), "# Guide")
+
+    def test_failed_page_is_not_cached_or_fingerprinted(self):
+        runs = []
+
+        class FakeWikiGenerator:
+            def __init__(self, **kwargs):
+                self.failed_pages = []
+
+            async def iter_pages(self, repo_path):
+                runs.append(repo_path)
+                yield 0, WikiPage("Home", "Home.md", "# Home", "overview")
+                if len(runs) == 1:
+                    self.failed_pages.append(RuntimeError("rate limited"))
+
+        env = {"HOME": str(self.repo_path), "ANTHROPIC_API_KEY": "test-key"}
+        with patch.dict(os.environ, env, clear=True), \
+                patch("doctr.doctr.core.ai_wiki_generator.AIWikiGenerator", FakeWikiGenerator):
+            failed = self.runner.invoke(app, ["setup", str(self.repo_path)])
+            retried = self.runner.invoke(app, ["setup", str(self.repo_path)])
+
+        self.assertEqual(failed.exit_code, 1)
+        self.assertIn("1 page(s) failed to generate", failed.output)
+        self.assertTrue((self.repo_path / "wiki" / "Home.md").exists())
+        self.assertEqual(retried.exit_code, 0, retried.output)
+        self.assertEqual(len(runs), 2)
+        self.assertNotIn("reusing cached", retried.output)
+        self.assertTrue((self.repo_path / "wiki" / ".doctr-fingerprint").exists())
+
+
+def make_change(old, new, path="calc.py", function_name=None):
+    return CodeChange(
+        file_path=path, change_type=ChangeType.MODIFIED, line_start=1, line_end=1,
+        old_content=old, new_content=new, function_name=function_name,
+    )
+
+
+def similarity(first, second):
+    vectors = [_draft_vector(DocumentationGenerator().generate_draft(changes)) for changes in (first, second)]
+    return sum(a * b for a, b in zip(*vectors))
+
+
+class TestGenerateCommand(unittest.TestCase):
+
+    def setUp(self):
+        self.runner = CliRunner()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo_path = Path(self.tmp.name)
+        env = patch.dict(os.environ, {"HOME": self.tmp.name, "ANTHROPIC_API_KEY": "test-key"}, clear=True)
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.llm = MagicMock()
+        self.llm.enhance_draft = AsyncMock(return_value=GeneratedDoc(title="New", content="new", metadata={}))
+        self.llm.patch_documentation = AsyncMock(return_value=GeneratedDoc(title="Patched", content="patched", metadata={}))
+        llm_patch = patch("doctr.doctr.integrations.llm.LLMDocumentationGenerator", return_value=self.llm)
+        llm_patch.start()
+        self.addCleanup(llm_patch.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def generate(self, changes):
+        with patch("doctr.doctr.cli.main._parse_diff", return_value=changes):
+            return self.runner.invoke(app, ["generate", str(self.repo_path)])
+
+    def test_revert_does_not_match_the_original_change(self):
+        forward = [make_change("return 30", "return 5")]
+        revert = [make_change("return 5", "return 30")]
+
+        self.assertLess(similarity(forward, revert), DoctrConfig().semantic_patch_threshold)
+        self.assertLess(
+            similarity(forward, [make_change("return 30", "return 5", path="other.py")]),
+            DoctrConfig().semantic_patch_threshold,
+        )
+
+        self.generate(forward)
+        self.generate(revert)
+
+        self.assertEqual(self.llm.enhance_draft.await_count, 2)
+        self.llm.patch_documentation.assert_not_awaited()
+
+    def test_similar_draft_is_patched_not_reused(self):
+        self.generate([make_change("return 30", "return 5")])
+        result = self.generate([make_change("return 30", "return 5", function_name="total")])
+
+        self.assertEqual(result.exit_code, 0)
+        self.llm.patch_documentation.assert_awaited_once()
+        self.assertNotIn("Reusing", result.output)
+
+    def test_configured_target_skips_default_target_errors(self):
+        def git(*args):
+            subprocess.run(["git", "-C", str(self.repo_path), *args], check=True, capture_output=True)
+
+        # A single commit, so the default HEAD~1 target does not exist
+        git("init", "-q")
+        git("config", "user.email", "dev@example.com")
+        git("config", "user.name", "Dev")
+        (self.repo_path / "app.py").write_text("x = 1\n")
+        git("add", "app.py")
+        git("commit", "-qm", "first")
+        (self.repo_path / "app.py").write_text("x = 2\n")
+        (self.repo_path / ".doctr.toml").write_text("default_diff_target = 'HEAD'\nuse_ai = false\n")
+
+        result = self.runner.invoke(app, ["generate", str(self.repo_path)])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertNotIn("Error parsing diff", result.output)
+        self.assertIn("Found 1 code changes", result.output)
+
+    def test_non_repository_exits_with_error(self):
+        result = self.runner.invoke(app, ["generate", str(self.repo_path), "--no-ai"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Error: Not a Git repository", result.output)
+        self.assertNotIn("No changes detected", result.output)
+
+
+class TestFileWritePolicy(unittest.TestCase):
+
+    def test_no_aiofiles_imports(self):
+        package_dir = Path(__file__).resolve().parent.parent / "doctr"
+        offenders = [
+            str(path.relative_to(package_dir))
+            for path in package_dir.rglob("*.py")
+            if re.search(r"^\s*(import|from)\s+aiofiles\b", path.read_text(), re.M)
+        ]
+        self.assertEqual(offenders, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
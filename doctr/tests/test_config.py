@@ -0,0 +1,181 @@
+import fnmatch
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from doctr.doctr.utils import config as config_module
+from doctr.doctr.utils.config import DoctrConfig, create_default_config, get_api_key, load_config
+
+
+class TestLoadConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.home = Path(self.tmp.name) / "home"
+        self.repo_path = Path(self.tmp.name) / "repo"
+        self.home.mkdir()
+        self.repo_path.mkdir()
+
+        env = patch.dict(os.environ, {"HOME": str(self.home)}, clear=True)
+        env.start()
+        self.addCleanup(env.stop)
+        config_module._load_config_cached.cache_clear()
+        self.addCleanup(config_module._load_config_cached.cache_clear)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_project_config(self, content, mtime_ns=None):
+        path = self.repo_path / ".doctr.toml"
+        path.write_text(content)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_defaults_without_config_files(self):
+        config = load_config(self.repo_path)
+
+        self.assertEqual(config.output_dir, "docs")
+        self.assertIsNone(config.anthropic_api_key)
+
+    def test_project_config_overrides_global_and_env(self):
+        (self.home / ".doctr").mkdir()
+        (self.home / ".doctr" / "config.toml").write_text(
+            "output_dir = 'global'\nuse_ai = false\n"
+        )
+        self.write_project_config("output_dir = 'project'\n")
+        os.environ["ANTHROPIC_API_KEY"] = "env-key"
+
+        config = load_config(self.repo_path)
+
+        self.assertEqual(config.output_dir, "project")
+        self.assertFalse(config.use_ai)
+        self.assertEqual(config.anthropic_api_key, "env-key")
+
+    def test_values_are_normalized_and_unknown_keys_ignored(self):
+        self.write_project_config("ignore_patterns = ['*.bak']\nlegacy_option = 1\n")
+        os.environ["DOCTR_LLM_CONCURRENCY"] = "4"
+
+        config = load_config(self.repo_path)
+
+        self.assertEqual(config.ignore_patterns, ("*.bak",))
+        self.assertEqual(config.llm_concurrency, 4)
+        with self.assertRaises(AttributeError):
+            config.output_dir = "elsewhere"
+
+    def test_invalid_concurrency_is_rejected(self):
+        for value in ["auto", "0", "-2"]:
+            os.environ["DOCTR_LLM_CONCURRENCY"] = value
+            with self.assertRaisesRegex(ValueError, "DOCTR_LLM_CONCURRENCY must be a positive integer"):
+                load_config(self.repo_path)
+
+        os.environ["DOCTR_LLM_CONCURRENCY"] = ""
+        self.assertEqual(load_config(self.repo_path).llm_concurrency, 8)
+
+        self.write_project_config("llm_concurrency = 0\n")
+        with self.assertRaisesRegex(ValueError, "llm_concurrency must be a positive integer"):
+            load_config(self.repo_path)
+
+    def test_default_config_file_round_trips(self):
+        create_default_config(self.repo_path)
+
+        self.assertEqual(load_config(self.repo_path), DoctrConfig())
+
+    def test_default_config_file_leaves_tuning_to_the_environment(self):
+        create_default_config(self.repo_path)
+        os.environ["DOCTR_LLM_CONCURRENCY"] = "2"
+
+        self.assertNotIn("llm_concurrency", (self.repo_path / ".doctr.toml").read_text())
+        self.assertEqual(load_config(self.repo_path).llm_concurrency, 2)
+
+    def test_unchanged_config_is_served_from_cache(self):
+        self.write_project_config("output_dir = 'project'\n")
+
+        first = load_config(self.repo_path)
+        second = load_config(self.repo_path)
+
+        self.assertIs(first, second)
+
+    def test_config_removed_after_stat_reads_as_empty(self):
+        self.write_project_config("output_dir = 'project'\n")
+        stat = Path.stat
+
+        def stat_then_remove(path, *args, **kwargs):
+            result = stat(path, *args, **kwargs)
+            if path.name == ".doctr.toml":
+                os.remove(path)
+            return result
+
+        with patch.object(Path, "stat", autospec=True, side_effect=stat_then_remove):
+            config = load_config(self.repo_path)
+
+        self.assertEqual(config.output_dir, "docs")
+
+    def test_cache_hit_reads_no_files(self):
+        self.write_project_config("output_dir = 'project'\n")
+        load_config(self.repo_path)
+
+        with patch("builtins.open", wraps=open) as opened, \
+                patch.object(Path, "resolve", autospec=True, wraps=Path.resolve) as resolve:
+            config = load_config(self.repo_path)
+
+        self.assertEqual(config.output_dir, "project")
+        opened.assert_not_called()
+        resolve.assert_not_called()
+
+    def test_rewrite_with_same_mtime_is_reloaded(self):
+        self.write_project_config("output_dir = 'a'\n", mtime_ns=1_000_000_000)
+        self.assertEqual(load_config(self.repo_path).output_dir, "a")
+
+        self.write_project_config("output_dir = 'abc'\n", mtime_ns=1_000_000_000)
+        self.assertEqual(load_config(self.repo_path).output_dir, "abc")
+
+
+class TestGetApiKey(unittest.TestCase):
+
+    def test_key_follows_model_provider(self):
+        config = DoctrConfig(openai_api_key="openai", anthropic_api_key="anthropic")
+
+        self.assertEqual(get_api_key(config, "gpt-4o"), "openai")
+        self.assertEqual(get_api_key(config, "o1-mini"), "openai")
+        self.assertEqual(get_api_key(config, "claude-3-5-haiku-20241022"), "anthropic")
+        self.assertEqual(get_api_key(config, "mistral-large"), "anthropic")
+
+
+class TestIgnorePatterns(unittest.TestCase):
+
+    def test_matches_like_fnmatchcase(self):
+        config = DoctrConfig(ignore_patterns=["*.pyc", "__pycache__/*", "build/[!_]*"])
+        paths = ["a.pyc", "pkg/mod.pyc", "__pycache__/x", "build/out", "build/_keep", "app.py", "A.PYC"]
+
+        self.assertEqual(
+            [path for path in paths if config.is_ignored(path)],
+            [path for path in paths if any(fnmatch.fnmatchcase(path, p) for p in config.ignore_patterns)],
+        )
+
+    def test_default_patterns_are_shared(self):
+        self.assertIs(DoctrConfig().ignore_patterns, DoctrConfig().ignore_patterns)
+
+    def test_no_patterns_ignore_nothing(self):
+        self.assertFalse(DoctrConfig(ignore_patterns=()).is_ignored("app.py"))
+
+
+class TestImportCost(unittest.TestCase):
+
+    def test_import_skips_toml_writer_and_pydantic(self):
+        root = Path(__file__).resolve().parents[2]
+        result = subprocess.run(
+            [sys.executable, "-c", (
+                "import sys, doctr.doctr.utils.config; "
+                "print(sorted({'toml', 'pydantic'} & set(sys.modules)))"
+            )],
+            cwd=root, capture_output=True, text=True, check=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
+if __name__ == '__main__':
+    unittest.main()
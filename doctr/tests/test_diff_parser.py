@@ -0,0 +1,138 @@
+import tempfile
+import unittest
+from pathlib import Path
+import subprocess
+from doctr.doctr.core.diff_parser import DiffParser, _DIFF_FORMAT_ARGS
+from doctr.doctr.core.doc_model import ChangeType
+
+
+DIFFS = {
+    "app.py": (
+        "diff --git a/app.py b/app.py\n"
+        "--- a/app.py\n"
+        "+++ b/app.py\n"
+        "@@ -1,2 +1,3 @@\n"
+        " import os\n"
+        "-x = 1\n"
+        "+x = 2\n"
+        "+y = 3\n"
+    ),
+    "new.py": (
+        "diff --git a/new.py b/new.py\n"
+        "new file mode 100644\n"
+        "--- /dev/null\n"
+        "+++ b/new.py\n"
+        "@@ -0,0 +1 @@\n"
+        "+print('hi')\n"
+    ),
+}
+
+
+class FakeGit:
+
+    def __init__(self, diffs):
+        self.diffs = diffs
+        self.calls = []
+
+    def __call__(self, *args):
+        self.calls.append(args)
+        return "".join(self.diffs.values())
+
+
+def make_parser(git_client):
+    parser = DiffParser(Path("."))
+    parser._git = git_client
+    return parser
+
+
+class TestDiffParser(unittest.TestCase):
+
+    def test_parse_diff(self):
+        changes = make_parser(FakeGit(DIFFS)).parse_diff("HEAD~1")
+
+        self.assertEqual([change.file_path for change in changes], ["app.py", "new.py"])
+
+        modified, added = changes
+        self.assertEqual(modified.change_type, ChangeType.MODIFIED)
+        self.assertEqual(modified.old_content, "x = 1")
+        self.assertEqual(modified.new_content, "x = 2\ny = 3")
+        self.assertEqual((modified.line_start, modified.line_end), (2, 3))
+
+        self.assertEqual(added.change_type, ChangeType.ADDED)
+        self.assertEqual(added.new_content, "print('hi')")
+        self.assertIsNone(added.old_content)
+
+    def test_single_git_call_splits_files(self):
+        git_client = FakeGit(dict(DIFFS, **{"my b/file.py": (
+            "diff --git a/my b/file.py b/my b/file.py\n"
+            "--- a/my b/file.py\n"
+            "+++ b/my b/file.py\n"
+            "@@ -1 +1 @@\n"
+            "-a\n"
+            "+b\n"
+        )}))
+        changes = make_parser(git_client).parse_diff("main")
+
+        self.assertEqual(
+            [change.file_path for change in changes], ["app.py", "new.py", "my b/file.py"]
+        )
+        self.assertEqual(changes[0].new_content, "x = 2\ny = 3")
+        self.assertEqual(git_client.calls, [("diff", *_DIFF_FORMAT_ARGS, "main")])
+
+    def test_hunk_line_numbers(self):
+        diff = (
+            "diff --git a/lib.lua b/lib.lua\n"
+            "--- a/lib.lua\n"
+            "+++ b/lib.lua\n"
+            "@@ -10,4 +10,4 @@ function f()\n"
+            " a\n"
+            "--- old comment\n"
+            "+-- new comment\n"
+            " b\n"
+            "@@ -40,2 +40,3 @@\n"
+            " c\n"
+            "+d\n"
+        )
+        change = make_parser(FakeGit({}))._parse_file_diff("lib.lua", diff)
+
+        self.assertEqual(change.old_content, "-- old comment")
+        self.assertEqual(change.new_content, "-- new comment\nd")
+        self.assertEqual((change.line_start, change.line_end), (11, 41))
+
+    def test_git_failure_returns_no_changes(self):
+        self.assertEqual(DiffParser(Path(".")).parse_diff("no-such-revision"), [])
+
+    def test_non_repository_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaisesRegex(ValueError, "Not a Git repository"):
+                DiffParser(Path(tmp))
+
+    def test_diff_ignores_user_prefix_config(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+
+            def git(*args):
+                subprocess.run(["git", "-C", tmp, *args], check=True, capture_output=True)
+
+            git("init", "-q")
+            git("config", "user.email", "dev@example.com")
+            git("config", "user.name", "Dev")
+            (repo / "app.py").write_text("x = 1\n")
+            git("add", "app.py")
+            git("commit", "-qm", "first")
+            (repo / "app.py").write_text("x = 2\n")
+            git("commit", "-qam", "second")
+            git("config", "diff.noprefix", "true")
+            git("config", "diff.mnemonicPrefix", "true")
+
+            changes = DiffParser(repo).parse_diff("HEAD~1")
+
+        self.assertEqual([change.file_path for change in changes], ["app.py"])
+        self.assertEqual(changes[0].new_content, "x = 2")
+
+    def test_empty_diff(self):
+        self.assertEqual(make_parser(FakeGit({})).parse_diff(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
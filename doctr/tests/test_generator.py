@@ -6,8 +6,10 @@ from doctr.doctr.core.generator import DocumentationGenerator
 
 class TestDocumentationGenerator(unittest.TestCase):
     
-    def setUp(self):
-        self.generator = DocumentationGenerator()
+    @classmethod
+    def setUpClass(cls):
+        # generate_draft keeps no state, so every test can share one generator
+        cls.generator = DocumentationGenerator()
     
     def test_generate_draft_empty_changes(self):
         draft = self.generator.generate_draft([])
@@ -51,6 +53,29 @@ class TestDocumentationGenerator(unittest.TestCase):
         self.assertEqual(draft.title, "Changes across 2 files")
         self.assertIn("1 added change", draft.summary)
         self.assertIn("1 modified change", draft.summary)
+    
+    def test_generate_draft_counts_and_sections(self):
+        changes = [
+            CodeChange(file_path="a.py", change_type=ChangeType.DELETED, line_start=1, line_end=2),
+            CodeChange(file_path="b.py", change_type=ChangeType.DELETED, line_start=3, line_end=4),
+        ]
+        
+        draft = self.generator.generate_draft(changes)
+        self.assertEqual(draft.summary, "This update includes 2 deleted changes.")
+        self.assertNotIn("New Features", draft.suggested_sections)
+        
+        changes.append(CodeChange(
+            file_path="c.py",
+            change_type=ChangeType.MODIFIED,
+            line_start=1,
+            line_end=1,
+            function_name="run"
+        ))
+        draft = self.generator.generate_draft(changes)
+        self.assertEqual(
+            draft.suggested_sections,
+            ["Overview", "New Features", "API Changes", "Usage Examples", "Migration Guide"]
+        )
 
 
 if __name__ == '__main__':
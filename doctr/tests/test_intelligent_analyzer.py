@@ -0,0 +1,234 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from doctr.doctr.core.intelligent_analyzer import (
+    ExplorationPlan,
+    IntelligentCodebaseAnalyzer,
+    ProjectInsight,
+)
+from doctr.doctr.core.llm_cache import MemoryCache
+from doctr.doctr.integrations.llm import LLMDocumentationGenerator
+
+
+def make_plan():
+    return ExplorationPlan(
+        project_overview="overview",
+        key_entry_points=[],
+        core_modules=[],
+        documentation_structure=[],
+        exploration_priorities=[],
+    )
+
+
+class TestIntelligentCodebaseAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        agent_cache = patch.dict(IntelligentCodebaseAnalyzer._agent_cache, clear=True)
+        agent_cache.start()
+        self.addCleanup(agent_cache.stop)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.write("README.md", "# Project\n")
+        self.write("pyproject.toml", "[project]\nname = 'app'\n")
+        self.write("app/__init__.py", "")
+        self.write("app/cli.py", "def main():\n    pass\n")
+        self.write("app/tool.py", 'if __name__ == "__main__":\n    pass\n')
+        self.write("a/b/c/d/e/deep.py", "")
+        # Dependency trees that must never be scanned
+        self.write(".venv/bin/script.py", 'if __name__ == "__main__":\n    pass\n')
+        self.write("node_modules/lib/main.py", "")
+        self.analyzer = IntelligentCodebaseAnalyzer(self.root, api_key="test-key")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, content):
+        path = self.root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    def test_llm_objects_are_built_lazily(self):
+        with patch(
+            "doctr.doctr.core.intelligent_analyzer.LLMDocumentationGenerator",
+            wraps=LLMDocumentationGenerator,
+        ) as generator_cls:
+            analyzer = IntelligentCodebaseAnalyzer(self.root, api_key="test-key")
+            analyzer._analyze_directory_structure()
+            generator_cls.assert_not_called()
+
+            analyzer.exploration_agent
+            analyzer.insight_agent
+            generator_cls.assert_not_called()
+
+            analyzer.llm_generator
+            generator_cls.assert_called_once()
+
+    def test_agents_are_shared_by_matching_analyzers(self):
+        first = IntelligentCodebaseAnalyzer(self.root, api_key="test-key")
+        second = IntelligentCodebaseAnalyzer(self.root / "app", api_key="test-key")
+        other = IntelligentCodebaseAnalyzer(self.root, model_name="gpt-4o", api_key="test-key")
+
+        self.assertIs(first.exploration_agent, second.exploration_agent)
+        self.assertIs(first.insight_agent, second.insight_agent)
+        self.assertIsNot(first.exploration_agent, other.exploration_agent)
+        self.assertNotIn("llm_generator", vars(second))
+
+    def test_agent_cache_ignores_http_client(self):
+        clients = [MagicMock(), MagicMock()]
+        analyzers = [
+            IntelligentCodebaseAnalyzer(self.root, api_key="test-key", http_client=client)
+            for client in clients
+        ]
+
+        self.assertIs(analyzers[0].exploration_agent, analyzers[1].exploration_agent)
+        self.assertEqual(list(IntelligentCodebaseAnalyzer._agent_cache), [("claude-3-5-haiku-20241022", "test-key")])
+
+    def test_agent_runs_on_the_analyzers_own_model(self):
+        analyzer = IntelligentCodebaseAnalyzer(self.root, api_key="test-key")
+        analyzer.exploration_agent = MagicMock(run=AsyncMock(return_value=MagicMock(output=make_plan())))
+
+        asyncio.run(analyzer.create_exploration_plan())
+
+        self.assertIs(
+            analyzer.exploration_agent.run.await_args.kwargs["model"], analyzer.llm_generator.model
+        )
+
+    def test_walk_prunes_skipped_and_deep_directories(self):
+        tree = self.analyzer._walk_project()
+
+        self.assertNotIn(self.root / ".venv", tree)
+        self.assertNotIn(self.root / "node_modules", tree)
+        self.assertIn(self.root / "a/b/c/d", tree)
+        self.assertNotIn(self.root / "a/b/c/d/e", tree)
+        self.assertIs(self.analyzer._walk_project(), tree)
+
+    def test_find_entry_points(self):
+        self.assertEqual(
+            sorted(self.analyzer._find_entry_points()),
+            [self.root / "app/cli.py", self.root / "app/tool.py"],
+        )
+
+    def test_directory_structure(self):
+        structure = self.analyzer._analyze_directory_structure().splitlines()
+
+        self.assertEqual(structure[0], f"{self.root.name}/")
+        self.assertIn("  app/", structure)
+        self.assertIn("    cli.py", structure)
+        self.assertFalse(any(".venv" in line for line in structure))
+
+    def test_important_file_names(self):
+        important = [
+            name for name in ["Pipfile", "Cargo.toml", "README.md", "LICENSE-MIT", "notes.txt", "main.py.orig"]
+            if self.analyzer._is_important_file(self.root / name)
+        ]
+
+        self.assertEqual(important, ["Pipfile", "Cargo.toml", "README.md", "LICENSE-MIT"])
+
+    def test_read_readme_replaces_undecodable_bytes(self):
+        (self.root / "README.md").write_bytes(b"# Caf\xe9\n")
+
+        self.assertEqual(self.analyzer._read_readme(), "# Caf\ufffd\n")
+
+    def test_read_existing_docs(self):
+        self.write("docs/guide/intro.md", "Intro")
+        self.write("docs/notes.txt", "ignored")
+        self.write("CHANGES.md", "Changes")
+
+        self.assertEqual(
+            self.analyzer._read_existing_docs(), "intro.md: Intro\nCHANGES.md: Changes"
+        )
+
+    def test_read_existing_docs_stops_when_context_is_full(self):
+        for index in range(5):
+            self.write(f"docs/page{index}.md", "x" * 600)
+
+        with patch("builtins.open", wraps=open) as opened:
+            docs = self.analyzer._read_existing_docs()
+
+        self.assertEqual(opened.call_count, 2)
+        self.assertGreaterEqual(len(docs), 1000)
+
+    def test_project_files_skip_dependencies(self):
+        paths = {project_file.path for project_file in self.analyzer._collect_project_files()}
+
+        self.assertIn(self.root / "app/cli.py", paths)
+        self.assertNotIn(self.root / ".venv/bin/script.py", paths)
+        self.assertNotIn(self.root / "node_modules/lib/main.py", paths)
+
+    def test_gather_project_context(self):
+        context = asyncio.run(self.analyzer._gather_project_context())
+
+        self.assertTrue(context.startswith("README Content:\n# Project"))
+        self.assertIn("Directory Structure:\n", context)
+        self.assertIn(
+            f"Entry Points:\n{os.path.join('app', 'cli.py')}\n{os.path.join('app', 'tool.py')}",
+            context,
+        )
+        self.assertIn("pyproject.toml:\n[project]", context)
+
+    def test_project_context_is_read_once(self):
+        async def gather_twice():
+            first = await asyncio.gather(
+                self.analyzer._gather_project_context(),
+                self.analyzer._gather_project_context(),
+            )
+            return first + [await self.analyzer._gather_project_context()]
+
+        with patch.object(
+            self.analyzer, "_read_readme", wraps=self.analyzer._read_readme
+        ) as read_readme:
+            contexts = asyncio.run(gather_twice())
+
+        self.assertEqual(len(set(contexts)), 1)
+        read_readme.assert_called_once()
+
+    def test_run_full_analysis_runs_agents_concurrently(self):
+        plan = make_plan()
+        insight = ProjectInsight(
+            project_purpose="purpose",
+            main_functionality="functionality",
+            target_audience="developers",
+            key_features=[],
+            architecture_style="modular",
+        )
+        both_started = asyncio.Event()
+        started = []
+
+        def fake_agent(output):
+            async def run(prompt, model=None):
+                started.append(prompt)
+                if len(started) == 2:
+                    both_started.set()
+                await asyncio.wait_for(both_started.wait(), 1)
+                return MagicMock(output=output)
+            return MagicMock(run=run)
+
+        self.analyzer.exploration_agent = fake_agent(plan)
+        self.analyzer.insight_agent = fake_agent(insight)
+
+        self.assertEqual(asyncio.run(self.analyzer.run_full_analysis()), (plan, insight))
+
+    def test_agent_output_is_cached(self):
+        cache = MemoryCache()
+        agent_run = AsyncMock(return_value=MagicMock(output=make_plan()))
+
+        plans = []
+        for _ in range(2):
+            analyzer = IntelligentCodebaseAnalyzer(self.root, api_key="test-key", cache=cache)
+            analyzer.exploration_agent = MagicMock(run=agent_run)
+            plans.append(asyncio.run(analyzer.create_exploration_plan()))
+
+        agent_run.assert_awaited_once()
+        self.assertEqual(plans[0], plans[1])
+        self.assertIsInstance(plans[1], ExplorationPlan)
+
+
+if __name__ == '__main__':
+    unittest.main()
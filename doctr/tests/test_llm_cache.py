@@ -0,0 +1,68 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from doctr.doctr.core.llm_cache import (
+    CACHE_DIR_NAME,
+    DiskCache,
+    MemoryCache,
+    SemanticIndex,
+    embed_text,
+    get_or_compute,
+    make_key,
+)
+
+
+class TestLLMCache(unittest.IsolatedAsyncioTestCase):
+
+    def test_make_key_is_order_independent(self):
+        self.assertEqual(make_key({"a": 1, "b": 2}), make_key({"b": 2, "a": 1}))
+        self.assertNotEqual(make_key({"a": 1}), make_key({"a": 2}))
+
+    async def test_get_or_compute_memory(self):
+        cache = MemoryCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return "result"
+
+        value, hit = await get_or_compute(cache, "key", compute)
+        self.assertEqual(value, "result")
+        self.assertFalse(hit)
+
+        value, hit = await get_or_compute(cache, "key", compute)
+        self.assertEqual(value, "result")
+        self.assertTrue(hit)
+        self.assertEqual(len(calls), 1)
+
+    def test_disk_cache_persists(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            DiskCache(Path(tmp)).set("key", {"title": "Doc"})
+            self.assertEqual(DiskCache(Path(tmp)).get("key"), {"title": "Doc"})
+            self.assertIsNone(DiskCache(Path(tmp)).get("missing"))
+
+    def test_disk_cache_is_ignored_by_git(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+            subprocess.run(["git", "-C", tmp, "init", "-q"], check=True)
+            DiskCache(repo / CACHE_DIR_NAME).set("key", "value")
+
+            status = subprocess.run(
+                ["git", "-C", tmp, "status", "--porcelain", "--untracked-files=all"],
+                capture_output=True, text=True, check=True,
+            )
+            self.assertEqual(status.stdout, "")
+
+    def test_semantic_index_finds_near_duplicate(self):
+        index = SemanticIndex(MemoryCache(), "test")
+        index.add("first", embed_text("def hello(): return 'world'"))
+        index.add("second", embed_text("class Parser: pass"))
+
+        key, score = index.lookup(embed_text("def hello(): return 'world!'"))
+        self.assertEqual(key, "first")
+        self.assertGreater(score, 0.95)
+
+
+if __name__ == '__main__':
+    unittest.main()
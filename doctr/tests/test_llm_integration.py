@@ -1,19 +1,26 @@
+import contextlib
+import os
 import unittest
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch, MagicMock
-from doctr.doctr.integrations.llm import LLMDocumentationGenerator, DocumentationAnalysis
+import asyncio
+import httpx
+from pydantic_ai.exceptions import ModelHTTPError
+from doctr.doctr.integrations.llm import (
+    DocumentationAnalysis,
+    LLMDocumentationGenerator,
+    RateLimiter,
+    retry_delay,
+)
 from doctr.doctr.core.doc_model import CodeChange, ChangeType, DocumentationDraft
 
 
-class TestLLMIntegration(unittest.TestCase):
+class TestLLMIntegration(unittest.IsolatedAsyncioTestCase):
     
-    @patch('doctr.doctr.integrations.llm.AnthropicModel')
-    @patch('doctr.doctr.integrations.llm.Agent')
-    async def test_analyze_changes(self, mock_agent_class, mock_anthropic_model):
-        """Test that LLM integration correctly processes code changes."""
-        
-        # Mock the agent and its result
-        mock_result = MagicMock()
-        mock_result.output = DocumentationAnalysis(
+    @classmethod
+    def setUpClass(cls):
+        # Read-only fixtures shared by every test
+        cls.analysis = DocumentationAnalysis(
             summary="Test summary",
             impact_level="moderate",
             affected_components=["test_component"],
@@ -24,13 +31,7 @@ class TestLLMIntegration(unittest.TestCase):
             usage_examples_needed=True,
             migration_guide_needed=False
         )
-        
-        mock_agent_instance = AsyncMock()
-        mock_agent_instance.run.return_value = mock_result
-        mock_agent_class.return_value = mock_agent_instance
-        
-        # Create test data
-        changes = [
+        cls.changes = [
             CodeChange(
                 file_path="test.py",
                 change_type=ChangeType.MODIFIED,
@@ -39,10 +40,21 @@ class TestLLMIntegration(unittest.TestCase):
                 new_content="def test_function():\n    return 'hello'"
             )
         ]
+    
+    @patch.dict(os.environ)
+    @patch('doctr.doctr.integrations.llm.AnthropicModel')
+    @patch('doctr.doctr.integrations.llm.Agent')
+    async def test_analyze_changes(self, mock_agent_class, mock_anthropic_model):
+        """Test that LLM integration correctly processes code changes."""
+        
+        # Mock the agent and its result
+        mock_agent_instance = AsyncMock()
+        mock_agent_instance.run.return_value = SimpleNamespace(output=self.analysis)
+        mock_agent_class.return_value = mock_agent_instance
         
         # Test the LLM generator
         generator = LLMDocumentationGenerator(api_key="test-key")
-        result = await generator.analyze_changes(changes)
+        result = await generator.analyze_changes(self.changes)
         
         # Verify the result
         self.assertIsInstance(result, DocumentationAnalysis)
@@ -50,13 +62,118 @@ class TestLLMIntegration(unittest.TestCase):
         self.assertEqual(result.impact_level, "moderate")
         self.assertTrue(result.usage_examples_needed)
 
+    @patch.dict(os.environ)
+    def test_prompt_cache_key_is_stable_per_template(self):
+        openai = LLMDocumentationGenerator(model_name="gpt-4o", api_key="test-key")
+
+        self.assertEqual(
+            openai._model_settings("analyze-changes"),
+            {"extra_body": {"prompt_cache_key": "doctr:gpt-4o:analyze-changes"}},
+        )
+        self.assertIsNone(LLMDocumentationGenerator(api_key="test-key")._model_settings("analyze-changes"))
+
+    @patch.dict(os.environ)
+    def test_prepare_changes_context(self):
+        generator = LLMDocumentationGenerator(api_key="test-key")
+        changes = [
+            CodeChange(
+                file_path="a.py", change_type=ChangeType.MODIFIED, line_start=1, line_end=2,
+                old_content="x = 1", new_content="x = 2", function_name="f",
+            ),
+            CodeChange(file_path="b.py", change_type=ChangeType.DELETED, line_start=0, line_end=0),
+        ]
+
+        self.assertEqual(
+            generator._prepare_changes_context(changes),
+            "## Change 1: a.py\nType: modified\nLines: 1-2\nFunction: f\n"
+            "### Old Content:\n```\nx = 1\n```\n### New Content:\n```\nx = 2\n```\n\n"
+            "## Change 2: b.py\nType: deleted\nLines: 0-0\n",
+        )
+        self.assertEqual(generator._prepare_changes_context([]), "")
+
+
+class TestBatchGeneration(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+
+    async def test_anthropic_batch_results_in_prompt_order(self):
+        generator = LLMDocumentationGenerator(api_key="test-key")
+
+        async def results(batch_id):
+            for custom_id in ["1", "0"]:
+                yield SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(
+                    type="succeeded",
+                    message=SimpleNamespace(content=[SimpleNamespace(type="text", text=f"out {custom_id}")]),
+                ))
+            yield SimpleNamespace(custom_id="2", result=SimpleNamespace(type="errored"))
+
+        batches = MagicMock()
+        batches.create = AsyncMock(return_value=SimpleNamespace(id="b1", processing_status="in_progress"))
+        batches.retrieve = AsyncMock(return_value=SimpleNamespace(id="b1", processing_status="ended"))
+        batches.results = AsyncMock(side_effect=results)
+        generator.model.client = MagicMock()
+        generator.model.client.messages.batches = batches
+
+        outputs = await generator.generate_many(["a", "b", "c"], poll_interval=0)
+
+        self.assertEqual(outputs, ["out 0", "out 1", None])
+        requests = batches.create.await_args.kwargs["requests"]
+        self.assertEqual([request["custom_id"] for request in requests], ["0", "1", "2"])
+        batches.retrieve.assert_awaited_once_with("b1")
+
+    async def test_generate_documentation_joins_stream(self):
+        generator = LLMDocumentationGenerator(api_key="test-key")
+
+        @contextlib.asynccontextmanager
+        async def run_stream(prompt, model_settings=None):
+            async def stream_text(delta=False):
+                for chunk in ["# Docs", "\n", "Body"]:
+                    yield chunk
+
+            yield SimpleNamespace(stream_text=stream_text)
+
+        generator.content_agent = MagicMock(run_stream=run_stream)
+        analysis = DocumentationAnalysis(
+            summary="s", impact_level="minor", affected_components=[], breaking_changes=[],
+            new_features=[], bug_fixes=[], documentation_sections=[],
+            usage_examples_needed=False, migration_guide_needed=False,
+        )
+
+        chunks = [chunk async for chunk in generator.stream_documentation(analysis, [])]
+        content = await generator.generate_documentation(analysis, [])
+
+        self.assertEqual(chunks, ["# Docs", "\n", "Body"])
+        self.assertEqual(content, "# Docs\nBody")
+
+
+class TestRequestPacing(unittest.IsolatedAsyncioTestCase):
+
+    async def test_rate_limiter_spaces_requests(self):
+        limiter = RateLimiter(rate_per_minute=3000)  # one per 20 ms
+        loop = asyncio.get_running_loop()
+        started = []
+
+        async def request():
+            async with limiter:
+                started.append(loop.time())
+
+        await asyncio.gather(*(request() for _ in range(3)))
+
+        self.assertGreaterEqual(started[2] - started[0], 0.039)
+
+    def test_retry_delay_uses_retry_after(self):
+        request = httpx.Request("POST", "https://api.example.com")
+        # Provider SDK errors carry the HTTP response that was rejected
+        cause = Exception("rate limited")
+        cause.response = httpx.Response(429, headers={"Retry-After": "7"}, request=request)
+        error = ModelHTTPError(429, "test-model")
+        error.__cause__ = cause
+
+        self.assertEqual(retry_delay(error, attempt=0, base_delay=1.0), 7.0)
+        self.assertEqual(retry_delay(ModelHTTPError(429, "test-model"), attempt=2, base_delay=0), 0)
 
 if __name__ == '__main__':
-    import asyncio
-    
-    async def run_test():
-        test = TestLLMIntegration()
-        await test.test_analyze_changes()
-        print("✅ LLM integration test passed!")
-    
-    asyncio.run(run_test())
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,210 @@
+import asyncio
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+import httpx
+from pydantic_ai.exceptions import ModelHTTPError
+from doctr.doctr.core.analyzer import FileInfo, ModuleInfo, ProjectStructure, ProjectType
+from doctr.doctr.core.llm_cache import MemoryCache
+from doctr.doctr.core.wiki_generator import WikiDocumentationGenerator
+
+
+def make_structure(module_names):
+    return ProjectStructure(
+        root_path=Path("project"),
+        project_type=ProjectType.PYTHON,
+        main_language="python",
+        modules=[
+            ModuleInfo(
+                name=name,
+                path=Path(name),
+                files=[FileInfo(
+                    path=Path(name, "main.py"), language="python", size=0,
+                    functions=["run"], classes=[], imports=[], docstring=None,
+                )],
+                public_api=[],
+                dependencies=[],
+            )
+            for name in module_names
+        ],
+        entry_points=[],
+        config_files=[Path("pyproject.toml")],
+        test_directories=[Path("tests")],
+        documentation_files=[],
+        dependencies={},
+    )
+
+
+class TestWikiDocumentationGenerator(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+
+    def make_generator(self, run, max_concurrency=8, cache=None):
+        generator = WikiDocumentationGenerator(
+            api_key="test-key", max_concurrency=max_concurrency, cache=cache, retry_base_delay=0
+        )
+        generator.llm_generator.content_agent = MagicMock(run=run)
+        return generator
+
+    async def test_pages_generated_concurrently_in_order(self):
+        active = 0
+        peak = 0
+
+        async def run(prompt):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return MagicMock(output="content")
+
+        generator = self.make_generator(run, max_concurrency=3)
+        pages = await generator.generate_wiki(make_structure(["core", "cli"]))
+
+        self.assertEqual(
+            [page.title for page in pages],
+            [
+                "Home", "Installation Guide", "Quick Start", "core API", "cli API",
+                "Architecture", "Development Guide", "Configuration", "Testing Guide",
+            ],
+        )
+        self.assertEqual(peak, 3)
+
+    async def test_prompts_share_project_context_prefix(self):
+        prompts = []
+
+        async def run(prompt):
+            prompts.append(prompt)
+            return MagicMock(output="content")
+
+        await self.make_generator(run).generate_wiki(make_structure(["core", "cli"]))
+
+        prefix = prompts[0].split("Project Structure:")[0]
+        self.assertIn("Project Analysis:", prefix)
+        self.assertTrue(all(prompt.startswith(prefix) for prompt in prompts))
+
+    def test_project_context_built_once_per_structure(self):
+        generator = WikiDocumentationGenerator(use_ai=False)
+        structure = make_structure(["core"])
+        context = generator._project_context(structure)
+
+        self.assertIs(generator._project_context(structure), context)
+        self.assertIn("- Module: core", context)
+        self.assertIn("- Module: cli", generator._project_context(make_structure(["cli"])))
+
+    def test_module_file_names_listed_once(self):
+        generator = WikiDocumentationGenerator(use_ai=False)
+        structure = make_structure(["core"])
+        module = structure.modules[0]
+        names = generator._file_names(module, structure)
+
+        self.assertEqual(names, ["main.py"])
+        self.assertIs(generator._file_names(module, structure), names)
+
+    async def test_cached_pages_skip_llm(self):
+        calls = []
+
+        async def run(prompt):
+            calls.append(prompt)
+            return MagicMock(output="content")
+
+        cache = MemoryCache()
+        first = await self.make_generator(run, cache=cache).generate_wiki(make_structure(["core"]))
+        call_count = len(calls)
+        second = await self.make_generator(run, cache=cache).generate_wiki(make_structure(["core"]))
+
+        self.assertEqual(call_count, 6)
+        self.assertEqual(len(calls), call_count)
+        self.assertEqual(first, second)
+
+    async def test_edited_module_regenerates_its_page(self):
+        calls = []
+
+        async def run(prompt):
+            calls.append(prompt)
+            return MagicMock(output=f"page {len(calls)}")
+
+        generator = self.make_generator(run, cache=MemoryCache())
+        structure = make_structure(["core"])
+        first = await generator._generate_api_reference(structure.modules[0], structure)
+
+        # One new function barely changes the prompt, but the page must show it
+        structure = make_structure(["core"])
+        structure.modules[0].files[0].functions.append("stop")
+        edited = await generator._generate_api_reference(structure.modules[0], structure)
+
+        self.assertEqual(len(calls), 2)
+        self.assertIn("'stop'", calls[1])
+        self.assertNotEqual(edited.content, first.content)
+
+    async def test_batch_api_sends_one_batch(self):
+        generator = WikiDocumentationGenerator(api_key="test-key", use_batch_api=True)
+        generator.llm_generator.generate_many = AsyncMock(
+            side_effect=lambda prompts, poll_interval: [f"page {i}" for i in range(len(prompts) - 1)] + [None]
+        )
+        pages = await generator.generate_wiki(make_structure(["core"]))
+
+        generator.llm_generator.generate_many.assert_awaited_once()
+        prompts = generator.llm_generator.generate_many.await_args.args[0]
+        self.assertEqual(len(prompts), 6)
+        self.assertEqual(pages[0].content, "page 0")
+        # A prompt without a batch result falls back to the placeholder page
+        self.assertIn("Content generation failed", pages[5].content)
+
+    async def test_trivial_pages_skip_llm(self):
+        calls = []
+
+        async def run(prompt):
+            calls.append(prompt)
+            return MagicMock(output="content")
+
+        generator = self.make_generator(run)
+        structure = make_structure(["core", "empty"])
+        structure.modules[1].files = []
+        pages = await generator.generate_wiki(structure)
+
+        self.assertEqual(len(calls), 6)
+        self.assertTrue(pages[4].content.startswith("# empty API Reference"))
+
+        calls.clear()
+        await generator.generate_wiki(make_structure([]))
+        self.assertEqual(calls, [])
+
+    async def test_rate_limited_prompt_is_retried(self):
+        attempts = []
+
+        async def run(prompt):
+            attempts.append(prompt)
+            if len(attempts) == 1:
+                raise ModelHTTPError(429, "test-model")
+            return MagicMock(output="content")
+
+        content = await self.make_generator(run)._run_content_prompt("prompt")
+
+        self.assertEqual(content, "content")
+        self.assertEqual(len(attempts), 2)
+
+    async def test_owned_http_client_is_closed(self):
+        async with WikiDocumentationGenerator(api_key="test-key") as generator:
+            client = generator._owned_http_client
+            self.assertFalse(client.is_closed)
+        self.assertTrue(client.is_closed)
+
+        shared = httpx.AsyncClient()
+        async with WikiDocumentationGenerator(api_key="test-key", http_client=shared) as generator:
+            self.assertIsNone(generator._owned_http_client)
+        self.assertFalse(shared.is_closed)
+        await shared.aclose()
+
+    async def test_basic_pages_without_ai(self):
+        pages = await WikiDocumentationGenerator(use_ai=False).generate_wiki(make_structure(["core"]))
+
+        self.assertTrue(pages[0].content.startswith("# project"))
+
+
+if __name__ == '__main__':
+    unittest.main()
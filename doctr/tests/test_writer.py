@@ -0,0 +1,86 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from doctr.doctr.core.doc_model import GeneratedDoc
+from doctr.doctr.core.writer import DocumentationWriter
+
+
+class TestDocumentationWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.writer = DocumentationWriter(Path(self.tmp.name))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_doc(self):
+        doc = GeneratedDoc(title="API Changes!", content="Body", metadata={"enhanced": True})
+        path = self.writer.write_doc(doc)
+
+        self.assertEqual(path.name, "api_changes.md")
+        self.assertEqual(
+            path.read_text(encoding="utf-8"),
+            "# API Changes!\n\nBody\n\n<!-- Metadata:\nenhanced: True\n-->\n",
+        )
+
+    def test_default_filename_keeps_unicode_letters(self):
+        self.assertEqual(DocumentationWriter._default_filename("Café: über_v2 -- notes!  "), "café_über_v2_--_notes.md")
+
+    def test_write_doc_resumes_short_writes(self):
+        doc = GeneratedDoc(title="Short", content="Body", metadata={})
+        # Write at most 3 bytes per call, as a slow or full device might
+        with patch(
+            "doctr.doctr.core.writer.os.writev",
+            side_effect=lambda fd, buffers: os.write(fd, bytes(buffers[0][:3])),
+        ):
+            path = self.writer.write_doc(doc)
+
+        self.assertEqual(path.read_text(encoding="utf-8"), "# Short\n\nBody")
+
+    def test_write_docs(self):
+        paths = self.writer.write_docs([
+            GeneratedDoc(title="One", content="1", metadata={}),
+            GeneratedDoc(title="Two", content="2", metadata={}),
+        ])
+
+        self.assertEqual([path.name for path in paths], ["one.md", "two.md"])
+        self.assertEqual(paths[1].read_text(encoding="utf-8"), "# Two\n\n2")
+
+    def test_write_stream_matches_write_doc(self):
+        written = []
+
+        async def chunks():
+            for chunk in ["Bo", "dy"]:
+                # Earlier pieces are already on disk while later ones generate
+                written.append((self.writer.output_dir / "streamed.md").exists())
+                yield chunk
+
+        path = asyncio.run(self.writer.write_stream("Streamed", chunks(), metadata={"enhanced": True}))
+        doc = GeneratedDoc(title="Streamed", content="Body", metadata={"enhanced": True})
+        expected = self.writer.write_doc(doc, filename="expected.md").read_text(encoding="utf-8")
+
+        self.assertEqual(path.name, "streamed.md")
+        self.assertEqual(path.read_text(encoding="utf-8"), expected)
+        self.assertEqual(written, [True, True])
+
+    def test_write_changelog_prepends_entries(self):
+        self.writer.write_changelog("## 1.0\n")
+        path = self.writer.write_changelog("## 1.1 ✨\n")
+
+        self.assertEqual(path.read_text(encoding="utf-8"), "## 1.1 ✨\n\n\n## 1.0\n")
+        self.assertEqual([p.name for p in path.parent.iterdir()], ["CHANGELOG.md"])
+
+    def test_write_changelog_without_sendfile(self):
+        self.writer.write_changelog("old")
+        with patch("doctr.doctr.core.writer.os.sendfile", side_effect=OSError):
+            path = self.writer.write_changelog("new")
+
+        self.assertEqual(path.read_text(encoding="utf-8"), "new\n\nold")
+
+
+if __name__ == '__main__':
+    unittest.main()